@@ -1,45 +1,338 @@
 # -*- coding:utf-8 -*-
 
+from django.db.models.base import ModelState
 from django.db.models.fields import NOT_PROVIDED
 
 from django.db.models.fields.related import *
 from django.contrib.contenttypes.generic import GenericRelation
 
 from .utils import *
+from .network import raw_email, raw_url
+from .parallel import parallel_prepare, chunk_seeds, PARALLEL_CHUNK_SIZE
+from .pool import map_threads
+from .cache import FixtureCache
+from .graph import levels, referenced, wire, can_bulk_insert, can_reserve_pks
+from .graph import returns_bulk_pks, reserve_pks, reserve_graph, mark_saved, is_unsaved
+from .keys import get_allocator
+from .pools import existing_pks, drawn_rows
+from .distributions import Uniform, BATCH_SIZE
+from .links import link_rows, fan_out, sample_distinct
+from .raw import raw_fields, insert_rows
+from .columns import Columns
+from .pipeline import pipelined, DEFAULT_DEPTH
+from .lazy import make_lazy
+from .unique import UniqueValues
 from .constants import *
 
 import datetime
-from random import random
+import random
+from itertools import islice
+from weakref import WeakKeyDictionary
 
 
 if not hasattr(__builtins__, 'long'):
     long = int  # python < 3.0
 
+# generation plan rules
+SKIP, RELATED, GENERATE = range(3)
+
+_observed_plans = WeakKeyDictionary()  # observer -> generation plans
+
 
 class Mommy(object):
-    def __init__(self, model, fill_null=None):
+    _plans = {}  # compiled generation plans, see Mommy.__plan
+    observer = None  # see model_mommy.profiling
+    distributions = {}  # field name -> Distribution, see model_mommy.distributions
+    key_allocator = None  # primary key allocator, see model_mommy.keys
+    minimal = False  # generate only the values the database requires
+    preload_unique = False  # load the unique values in the database first, see model_mommy.unique
+
+    def __init__(self, model, fill_null=None, seed=None, minimal=None, preload_unique=None):
         """
         Keyword arguments:
         model -- base model instance
         fill_null -- force null or non null value for nullable fields. If None, leave up to chance.
+        seed -- seed for a random generator owned by this instance. The same
+        seed always generates the same values. If None, the global random
+        generator is used.
+        minimal -- if True, only generate values for fields the database
+        requires: not null fields without default (or blank string value),
+        required foreign keys included. Other fields get their default.
+        If None, use the class minimal attribute.
+        preload_unique -- if True, generated values of unique fields don't
+        collide with the rows already in the database either, at the cost
+        of a query per model. If None, use the class preload_unique attribute.
 
         """
         self.model = model
         self.fill_null = fill_null
+        if minimal is not None:
+            self.minimal = minimal
+        if preload_unique is not None:
+            self.preload_unique = preload_unique
+        self.unique_values = {}  # model -> UniqueValues, shared with child mommies
+        self.seed = seed
+        self.rng = seed is None and random or random.Random(seed)
 
     def make(self, **attrs):
         """
         Makes one instance of the registered model. (commits instance)
 
         """
-        return self.__make(True, **attrs)
+        return self.__make(True, **self.__drawn(attrs))
 
-    def prepare(self, **attrs):
+    def prepare(self, lazy=False, **attrs):
         """
         Prepares one instance of the registered model. (does not commit instance)
 
+        Keyword arguments:
+        lazy -- if True, fields not set in attrs are generated the first
+        time they are read, and all of them before the instance is saved.
+        See model_mommy.lazy.
+
+        """
+        if lazy:
+            return self.__lazy(**self.__drawn(attrs))
+        return self.__make(False, **self.__drawn(attrs))
+
+    def make_many(self, qty=5, bulk=False, batch_size=None, workers=None, cache=None,
+            parents=None, reuse_existing=False, distributions=None, m2m=None,
+            pipeline=None, progress=None, threads=None, **attrs):
+        """
+        Makes a list of instances of the registered model. (commits instances)
+
+        Keyword arguments:
+        qty -- how many instances you want
+        bulk -- prepare every instance in memory and write them with batched
+        multi-row inserts instead of one INSERT per instance. Required related
+        instances are written the same way, one INSERT per model and level.
+        Instances get their primary keys, reserved up front where bulk
+        inserts don't return them.
+        batch_size -- max number of rows per INSERT when bulk is True.
+        If None, let the backend decide.
+        workers -- if provided, instances are generated by this many worker
+        processes (see prepare_many) and written by the current process.
+        cache -- True or a directory to keep the written rows on disk and
+        load them back next time instead of generating them. Only for seeded
+        mommies, see model_mommy.cache. progress is only called when rows
+        are generated.
+        parents -- dict of related field name -> number of parents. That many
+        parents are made and every instance gets one of them at random.
+        reuse_existing -- assign required foreign keys from the rows already
+        in the database instead of making a parent per instance.
+        distributions -- dict of field name -> Distribution, added to the
+        class distributions. Related fields pick their parents from the pool
+        with it. See model_mommy.distributions.
+        m2m -- dict of m2m field name -> fan out: a number of links, a
+        (min, max) tuple or a Distribution. Each instance is linked to that
+        many distinct related rows, made if the table doesn't have enough.
+        Links are bulk inserted into the through table, without signals.
+        pipeline -- if provided, bulk write batch_size (or 1000) instances at
+        a time while the next batches are generated in a thread. True, or how
+        many generated batches may wait to be written. See model_mommy.pipeline.
+        progress -- called with the pipeline Throughput after each batch.
+        threads -- if provided, instances are made and written in chunks of
+        batch_size (or 1000) by this many threads, each with its own database connection and its own
+        random generator, seeded from this Mommy: a seeded Mommy makes the
+        same instances whatever the number of threads. Parent pools are
+        written beforehand by the current thread.
+
+        """
+        if cache:
+            cache = FixtureCache(cache is not True and cache or None)
+            return cache.make_many(self, qty, bulk=bulk, batch_size=batch_size,
+                workers=workers, parents=parents, reuse_existing=reuse_existing,
+                distributions=distributions, m2m=m2m, pipeline=pipeline,
+                progress=progress, threads=threads, **attrs)
+
+        # parents of instances saved one by one (or shared between threads)
+        # must be saved beforehand
+        commit = threads or not (bulk or workers)
+        pools = self.__pools(commit, parents, reuse_existing, **attrs)
+        streams = self.__streams(qty, pools, distributions, **attrs)
+        need_pks = True  # instances are returned saved, with their keys
+
+        if workers:
+            instances = self.__parallel_prepare(qty, workers, streams, **attrs)
+            self.__write(instances, bulk, batch_size, need_pks, **attrs)
+        else:
+            rows = drawn_rows(qty, streams, attrs)
+            if threads:
+                instances = self.__threaded_make(qty, rows, threads, bulk,
+                    batch_size or PARALLEL_CHUNK_SIZE, batch_size, need_pks, **attrs)
+            elif pipeline:
+                instances = []
+                for chunk in self.__pipelined(qty, rows, batch_size or 1000, batch_size,
+                        need_pks, pipeline, progress, **attrs):
+                    instances.extend(chunk)
+            elif bulk:
+                instances = self.__bulk_make(rows, batch_size, need_pks, **attrs)
+            else:
+                instances = [self.__make(True, **row) for row in rows]
+
+        if m2m:
+            self.__link(instances, m2m, batch_size, **attrs)
+        return instances
+
+    def prepare_many(self, qty=5, workers=None, parents=None, reuse_existing=False,
+            distributions=None, reserve_pks=False, clone=None, **attrs):
+        """
+        Prepares a list of instances of the registered model.
+        (does not commit instances)
+
+        Keyword arguments:
+        qty -- how many instances you want
+        workers -- if provided, split the work across this many processes.
+        Work is cut in chunks, each generated from a seed drawn from this
+        Mommy, so a seeded Mommy gets the same instances whatever the number
+        of workers. The Mommy class and attrs must be picklable.
+        parents -- dict of related field name -> number of parents. That many
+        parents are prepared and every instance gets one of them at random.
+        reuse_existing -- assign required foreign keys from the rows already
+        in the database instead of preparing a parent per instance.
+        distributions -- dict of field name -> Distribution, added to the
+        class distributions.
+        reserve_pks -- if True (or a key allocator, or a callable(model, count)
+        returning keys), primary keys of instances and their unsaved parents
+        are reserved up front and foreign keys set, so the rows can be
+        written in any order. See model_mommy.keys.
+        clone -- if True (or a list of field names), one prototype instance
+        is prepared and the others are shallow copies of it where only
+        unique fields, fields with drawn values and the named fields are
+        generated again. Copies share the prototype's other values,
+        related instances included.
+
+        """
+        pools = self.__pools(False, parents, reuse_existing, **attrs)
+        streams = self.__streams(qty, pools, distributions, **attrs)
+
+        if workers and clone:
+            raise ValueError('clone and workers can\'t be combined')
+        elif workers:
+            instances = self.__parallel_prepare(qty, workers, streams, **attrs)
+        elif clone:
+            varying = clone is not True and clone or ()
+            instances = self.__clones(drawn_rows(qty, streams, attrs), varying, streams)
+        else:
+            instances = [self.__make(False, **row) for row in drawn_rows(qty, streams, attrs)]
+
+        if reserve_pks:
+            allocator = reserve_pks is True and self.key_allocator or reserve_pks
+            reserve_graph(instances, allocator)
+        return instances
+
+    def make_raw(self, qty=5, batch_size=BATCH_SIZE, parents=None, reuse_existing=True,
+            distributions=None, **attrs):
+        """
+        Writes rows of the registered model without building instances:
+        values are generated as usual, then written as column tuples with
+        one executemany() per batch. save() and signals are skipped and
+        primary keys are left to the database. Returns the number of rows.
+
+        Required foreign keys must be set in attrs or picked from a pool:
+        the parents made for `parents`, or the existing rows of the related
+        table, unless reuse_existing is False.
+
+        Keyword arguments:
+        qty -- how many rows you want
+        batch_size -- how many rows are generated and written at once
+        parents -- dict of related field name -> number of parents to make
+        reuse_existing -- pool the keys of existing rows for required
+        foreign keys without parents
+        distributions -- dict of field name -> Distribution, added to the
+        class distributions
+
+        """
+        fields = raw_fields(self.model)
+        for values in self.__raw_batches(qty, fields, batch_size, parents,
+                reuse_existing, distributions, **attrs):
+            insert_rows(self.model, fields, values, self.observer)
+        return qty
+
+    def prepare_columns(self, qty=5, batch_size=BATCH_SIZE, parents=None, reuse_existing=True,
+            distributions=None, **attrs):
+        """
+        Generates rows of the registered model as columns, one compact list
+        (or array, for numbers) per field, without building instances.
+        Returns a model_mommy.columns.Columns, which can be written as CSV
+        for bulk loaders. (does not commit rows)
+
+        Foreign keys are filled like make_raw does: parents given in
+        `parents` are made in the database.
+
+        Keyword arguments:
+        qty -- how many rows you want
+        batch_size -- how many rows are generated at once
+        parents -- dict of related field name -> number of parents to make
+        reuse_existing -- pool the keys of existing rows for required
+        foreign keys without parents
+        distributions -- dict of field name -> Distribution, added to the
+        class distributions
+
+        """
+        columns = Columns(raw_fields(self.model))
+        for values in self.__raw_batches(qty, columns.fields, batch_size, parents,
+                reuse_existing, distributions, **attrs):
+            columns.extend(values)
+        return columns
+
+    def iter_make(self, qty=5, chunk_size=1000, callback=None, pipeline=None,
+            progress=None, **attrs):
+        """
+        Makes instances of the registered model lazily. Instances are
+        written with one bulk insert per chunk, and only the current chunk
+        is held in memory. Instances get their primary keys, reserved once
+        per chunk where bulk inserts don't return them.
+
+        Keyword arguments:
+        qty -- how many instances you want
+        chunk_size -- how many instances are generated and written at once
+        callback -- if provided, called with the list of instances of each
+        chunk right after it is written
+        pipeline -- if provided, the next chunks are generated in a thread
+        while the current one is written. True, or how many generated chunks
+        may wait to be written.
+        progress -- called with the pipeline Throughput after each chunk.
+
         """
-        return self.__make(False, **attrs)
+        rows = drawn_rows(qty, self.__streams(qty, {}, None, **attrs), attrs)
+
+        if pipeline:
+            written = self.__pipelined(qty, rows, chunk_size, None, True, pipeline,
+                progress, **attrs)
+        else:
+            written = (self.__bulk_make(islice(rows, chunk_qty), None, True, **attrs)
+                for chunk_qty in chunks(qty, chunk_size))
+
+        for chunk in written:
+
+            if callback is not None:
+                callback(chunk)
+
+            for instance in chunk:
+                yield instance
+
+    def iter_prepare(self, qty=5, chunk_size=1000, callback=None, **attrs):
+        """
+        Prepares instances of the registered model lazily, a chunk at a time.
+        (does not commit instances)
+
+        Keyword arguments:
+        qty -- how many instances you want
+        chunk_size -- how many instances are generated at once
+        callback -- if provided, called with the list of instances of each chunk
+
+        """
+        rows = drawn_rows(qty, self.__streams(qty, {}, None, **attrs), attrs)
+
+        for chunk_qty in chunks(qty, chunk_size):
+            chunk = [self.__make(False, **row) for row in islice(rows, chunk_qty)]
+
+            if callback is not None:
+                callback(chunk)
+
+            for instance in chunk:
+                yield instance
 
     def attrs(self, flat, **attrs):
         """
@@ -49,7 +342,7 @@ class Mommy(object):
         flat -- should related fields be ignored?
 
         """
-        return self.__attrs(False, flat, self.get_fields(), **attrs)
+        return self.__attrs(False, flat, **attrs)
 
     def get_fields(self):
         """
@@ -72,7 +365,7 @@ class Mommy(object):
         """
         return self.get_fields() + self.get_m2m_fields()
 
-    def __attrs(self, commit, flat, fields, **attrs):
+    def __attrs(self, commit, flat, **attrs):
         """
         Returns all fields, but m2m fields, used to populate a model. You can
         use this method directly to create fake form data.
@@ -80,46 +373,219 @@ class Mommy(object):
         Arguments:
         commit -- should related fields be commited?
         flat -- should related fields be ignored?
-        fields -- which fields should be created?
         **attrs -- optional defined values for fields
 
+        """
+        return self.__plan_attrs(self.__plan(), commit, flat, attrs)
+
+    def __plan_attrs(self, plan, commit, flat, attrs, pending=None):
+        """
+        Same as __attrs, for the fields of the given plan entries only.
+        If `pending` is a list, fields are not generated: their (field,
+        generate) pairs are appended to it instead, but for unique ones.
+
         """
         rt = {}  # return value / values for fields
+        unique = self.__unique()
+        generated = {}  # unique field name -> generate, for values that may change
 
-        for field in fields:
+        for field, name, rule, null_chance, blank, blank_value, generate in plan:
             # field value was provided. Ignoring...
-            if field.name in attrs:
-                rt[field.name] = attrs[field.name]
+            if name in attrs:
+                rt[name] = attrs[name]
 
-            elif isinstance(field, RelatedField) and flat:
-                continue  # ignore non-provided related fields
+            # related key was provided
+            elif rule is RELATED and field.attname in attrs:
+                rt[field.attname] = attrs[field.attname]
 
-            elif isinstance(field, RelatedField) and field.null:
-                continue  # ignore nullable related fields
-
-            elif type(field) in (AutoField, GenericRelation):
+            elif rule is SKIP or (flat and rule is RELATED):
                 continue
 
-            elif field.null and (self.fill_null is False):
+            elif null_chance and self.rng.choice(LEAVE_TO_CHANCE):
                 continue
 
-            elif field.null and (self.fill_null is None) and choice(LEAVE_TO_CHANCE):
-                continue
+            elif blank and self.rng.choice(LEAVE_TO_CHANCE):
+                rt[name] = blank_value
+                if unique is not None and name in unique.names:
+                    generated[name] = generate
 
-            elif field.blank and choice(LEAVE_TO_CHANCE):
-                if field.default == NOT_PROVIDED:
-                    rt[field.name] = ''
-                else:
-                    rt[field.name] = field.default
+            elif pending is not None and (unique is None or name not in unique.names):
+                pending.append((field, generate))
 
             else:
-                rt[field.name] = self.__get_value_for_field(field)
+                value = rt[name] = generate(self, field)
 
-                if hasattr(rt[field.name], 'save') and commit:
-                    rt[field.name].save()
+                if commit and hasattr(value, 'save'):
+                    self.__save(value)
+                elif unique is not None and name in unique.names:
+                    generated[name] = generate
 
+        if unique is not None:
+            unique.check(self, rt, generated)
         return rt
 
+    def __unique(self):
+        """
+        Returns the UniqueValues of the model, or None if it has no unique
+        constraint. See model_mommy.unique.
+
+        """
+        unique = self.unique_values.get(self.model)
+        if unique is None:
+            unique = self.unique_values.setdefault(self.model, UniqueValues(self.model))
+
+        if not unique:
+            return None
+        elif self.preload_unique and not unique.loaded:
+            unique.load()
+        return unique
+
+    def __load_unique(self, seen=None):
+        """
+        Loads the unique values of the model and of the required parents
+        it makes, in the current thread.
+
+        """
+        if seen is None:
+            seen = set()
+        seen.add(self.model)
+
+        self.__unique()
+        for field in self.get_fields():
+            if isinstance(field, RelatedField) and not field.null:
+                model = field.related.parent_model
+                if model not in seen:
+                    self.__child(model).__load_unique(seen)
+
+    def __unique_instances(self, instances, fixed):
+        """
+        Makes instances prepared elsewhere unique, generating again their
+        colliding fields but the ones named in `fixed`.
+
+        """
+        unique = self.__unique()
+        if unique is None:
+            return
+
+        generators = dict((entry[1], entry[-1]) for entry in self.__plan()
+            if entry[2] is GENERATE and entry[1] in unique.names and entry[1] not in fixed)
+        fields = [field for field in self.get_fields() if field.name in unique.names]
+
+        for instance in instances:
+            values = dict((field.name, getattr(instance, field.attname)) for field in fields)
+            unique.check(self, values, generators)
+            for name in generators:
+                setattr(instance, name, values[name])
+
+    def __plan(self):
+        """
+        Returns the generation plan for the model fields, compiling it on
+        first use. Plans are cached per (Mommy class, model, fill_null,
+        minimal), and per observer if one is set. A cached plan is only
+        reused while the class generator methods it was compiled from are
+        the same, so methods replaced or patched afterwards are picked up.
+
+        Each plan entry is a tuple:
+            (field, name, rule, null_chance, blank, blank_value, generate)
+
+        Generator methods overriden in the instance itself are not cached.
+
+        """
+        if any(k.startswith('value_for_') for k in self.__dict__):
+            return self.__observe(self.__compile_plan())
+
+        if self.observer is None:
+            plans = self._plans
+        else:
+            plans = _observed_plans.setdefault(self.observer, {})
+
+        key = (self.__class__, self.model, self.fill_null, self.minimal)
+        cached = plans.get(key)
+        if cached is not None:
+            generators, plan = cached
+            if all(getattr(self.__class__, name, None) == generate
+                    for name, generate in generators):
+                return plan
+
+        generators = self.__class_generators()
+        plan = self.__observe(self.__compile_plan())
+        plans[key] = (generators, plan)
+        return plan
+
+    def __class_generators(self):
+        """
+        Returns the (method name, class attribute or None) pairs the plan
+        generators are looked up from.
+
+        """
+        names = []
+        for field in self.get_fields():
+            if not field.choices:
+                for name in self.__generator_names(field):
+                    if name not in names:
+                        names.append(name)
+        return [(name, getattr(self.__class__, name, None)) for name in names]
+
+    def __observe(self, plan):
+        """
+        Makes plan generators report to the observer, if there's one.
+
+        """
+        observer = self.observer
+        if observer is None:
+            return plan
+
+        def observed(generate):
+            def observed_generate(mommy, field):
+                return observer.generate(mommy, field, generate)
+            observed_generate.__name__ = generate.__name__
+            return observed_generate
+
+        return [entry[:-1] + (observed(entry[-1]),) for entry in plan]
+
+    def __compile_plan(self):
+        plan = []
+
+        for field in self.get_fields():
+            if isinstance(field, RelatedField):
+                rule = field.null and SKIP or RELATED  # nullable related fields are ignored
+
+            elif type(field) in (AutoField, GenericRelation):
+                rule = SKIP
+
+            elif field.null and (self.fill_null is False):
+                rule = SKIP
+
+            # the database takes the default (or null, or a blank string)
+            elif self.minimal and (field.null or field.has_default() or
+                    (field.blank and field.empty_strings_allowed)):
+                rule = SKIP
+
+            else:
+                rule = GENERATE
+
+            null_chance = field.null and (self.fill_null is None) and not self.minimal
+
+            if field.default == NOT_PROVIDED:
+                blank_value = ''
+            else:
+                blank_value = field.default
+
+            plan.append((field, field.name, rule, null_chance, field.blank and not self.minimal,
+                blank_value, self.__generator_for(field)))
+        return plan
+
+    @classmethod
+    def invalidate_plans(cls):
+        """
+        Drops every compiled generation plan, observed ones included. Plans
+        follow replaced generator methods by themselves, call it if you
+        change anything else they are compiled from, like get_fields.
+
+        """
+        cls._plans.clear()
+        _observed_plans.clear()
+
     def __m2m_attrs(self, fields, **attrs):
         rt = {}
 
@@ -144,47 +610,531 @@ class Mommy(object):
         """
 
         m2m_attrs = self.__m2m_attrs(self.get_m2m_fields(), **attrs)
-        attrs = self.__attrs(commit, False, self.get_fields(), **attrs)
+        attrs = self.__attrs(commit, False, **attrs)
 
         instance = self.model(**attrs)
 
         if commit:
-            instance.save()
+            self.__save(instance)
 
             # m2m instance are only persisted if commit is True
             for key, m2m_values in m2m_attrs.items():
-                m2m_relation = getattr(instance, key)
-
-                for value in m2m_values:
-                    m2m_relation.add(value)
+                if m2m_values:
+                    self.__m2m_add(instance, key, m2m_values)
 
         return instance
 
+    def __lazy(self, **attrs):
+        """
+        Prepares an instance whose generated fields are filled on first
+        access. See model_mommy.lazy.
+
+        """
+        pending = []
+        instance = self.model(**self.__plan_attrs(self.__plan(), False, False, attrs, pending))
+        return make_lazy(instance, self, pending)
+
+    def __bulk_make(self, rows, batch_size, need_pks, **attrs):
+        """
+        Builds one instance per attrs dict in `rows` in memory, following
+        the same field filling rules used by __make, and writes them with
+        bulk inserts, along with the required related instances they hold.
+
+        """
+        instances = self.__build(rows)
+        self.__write(instances, True, batch_size, need_pks, **attrs)
+        return instances
+
+    def __threaded_make(self, qty, rows, threads, bulk, chunk_size, batch_size, need_pks,
+            **attrs):
+        """
+        Makes instances from `rows` in `threads` threads, a chunk of rows
+        per task. Each chunk is made by its own Mommy, with a random
+        generator seeded from this one. See model_mommy.pool.map_threads.
+
+        """
+        sizes = list(chunks(qty, chunk_size))
+        tasks = [(seed, list(islice(rows, size)))
+            for seed, size in zip(chunk_seeds(self.rng, len(sizes)), sizes)]
+
+        def make_chunk(task):
+            seed, chunk = task
+            mommy = self.__class__(self.model, fill_null=self.fill_null, minimal=self.minimal,
+                preload_unique=self.preload_unique)
+            mommy.seed, mommy.rng = self.seed, random.Random(seed)
+            mommy.observer = self.observer
+            mommy.unique_values = self.unique_values
+
+            if bulk:
+                return mommy.__bulk_make(chunk, batch_size, need_pks, **attrs)
+            return [mommy.__make(True, **row) for row in chunk]
+
+        return [instance for chunk in map_threads(make_chunk, tasks, threads)
+            for instance in chunk]
+
+    def __clones(self, rows, varying, streams):
+        """
+        Prepares an instance from the first of `rows` and shallow copies of
+        it for the others, generating again the varying fields: unique
+        ones, unique together ones, drawn ones and the ones named in `varying`.
+
+        """
+        names = set(varying) | set(streams)
+        together = set(name for names in self.model._meta.unique_together for name in names)
+        fields = [field for field in self.get_fields() if field.name in names or
+            field.attname in names or field.name in together or
+            (field.unique and not field.primary_key)]
+
+        unknown = names - set(f.name for f in fields) - set(f.attname for f in fields)
+        if unknown:
+            raise ValueError('%s has no field named %s' % (self.model.__name__,
+                ', '.join(sorted(unknown))))
+
+        fields = set(fields)
+        plan = [entry for entry in self.__plan() if entry[0] in fields]
+        defaults = [(field.attname, field.get_default(),
+            isinstance(field, RelatedField) and field.get_cache_name() or None)
+            for field in fields]
+
+        instances = []
+        for row in rows:
+            if not instances:
+                prototype = self.__make(False, **row)
+                state = prototype.__dict__
+                instances.append(prototype)
+                continue
+
+            instance = self.model.__new__(self.model)
+            values = instance.__dict__
+            values.update(state)
+            values['_state'] = ModelState()
+
+            for attname, default, cache_name in defaults:
+                values[attname] = default
+                if cache_name is not None:
+                    values.pop(cache_name, None)
+            for name, value in self.__plan_attrs(plan, False, False, row).items():
+                setattr(instance, name, value)
+            instances.append(instance)
+        return instances
+
+    def __build(self, rows):
+        return [self.model(**self.__attrs(False, False, **row)) for row in rows]
+
+    def __pipelined(self, qty, rows, chunk_size, batch_size, need_pks, depth, progress,
+            **attrs):
+        """
+        Returns an iterator of chunks of instances built from `rows` in a
+        thread and bulk written by the current one. See model_mommy.pipeline.
+
+        """
+        if self.preload_unique:
+            # the generator thread has no connection to load them with
+            self.__load_unique()
+        built = (self.__build(islice(rows, chunk_qty)) for chunk_qty in chunks(qty, chunk_size))
+
+        def write(instances):
+            self.__write(instances, True, batch_size, need_pks, **attrs)
+
+        return pipelined(built, write, depth is True and DEFAULT_DEPTH or depth, progress)
+
+    def __pools(self, commit, parents=None, reuse_existing=False, **attrs):
+        """
+        Returns the pools of parents instances are assigned from, as a dict
+        of attribute name -> values. Fields set in attrs are not pooled.
+
+        Keyword arguments:
+        commit -- should new parents be commited?
+        parents -- dict of related field name -> number of parents to make.
+        Unique relations (like one to one fields) can't be shared.
+        reuse_existing -- pool the keys of existing rows for every required
+        foreign key without a pool. Unique ones can't be shared.
+
+        """
+        parents = dict(parents or {})
+        pools = {}
+
+        for field in self.get_fields():
+            if not isinstance(field, RelatedField):
+                continue
+
+            qty = parents.pop(field.name, None)
+            if field.name in attrs or field.attname in attrs:
+                continue
+
+            model = field.related.parent_model
+            if qty is not None:
+                if qty < 1:
+                    raise ValueError('parents of %s must be at least 1' % field.name)
+                if field.unique:
+                    raise ValueError('%s is unique, its parents can\'t be shared' % field.name)
+
+                mommy = self.__child(model)
+                if commit:
+                    pools[field.name] = mommy.make_many(qty)
+                else:
+                    pools[field.name] = mommy.prepare_many(qty)
+
+            elif reuse_existing and not (field.null or field.unique):
+                pks = existing_pks(model)
+                if pks:
+                    pools[field.attname] = pks
+
+        if parents:
+            raise ValueError('%s has no related field named %s' % (
+                self.model.__name__, ', '.join(sorted(parents))))
+        return pools
+
+    def __streams(self, qty, pools, distributions, **attrs):
+        """
+        Returns the values drawn for each instance, as a dict of attribute
+        name -> iterator: parents picked from the pools and values of fields
+        with a distribution. Values are drawn in batches.
+
+        Keyword arguments:
+        qty -- how many instances values are drawn for
+        pools -- parent pools, see __pools
+        distributions -- dict of field name -> Distribution, added to the
+        class distributions
+
+        """
+        distributions = dict(self.distributions, **(distributions or {}))
+        if not (pools or distributions):
+            return {}
+
+        batch_size = max(1, min(qty, BATCH_SIZE))
+        streams = {}
+
+        for field in self.get_fields():
+            distribution = distributions.pop(field.name, None)
+            if field.name in attrs or field.attname in attrs:
+                continue
+
+            for key in (field.name, field.attname):
+                if key in pools:
+                    streams[key] = (distribution or Uniform()).stream(self.rng,
+                        pools[key], batch_size)
+                    break
+            else:
+                # related fields without a pool have nothing to pick from
+                if distribution is not None and not isinstance(field, RelatedField):
+                    choices = [c[0] for c in field.choices] or None
+                    streams[field.name] = distribution.stream(self.rng, choices, batch_size)
+
+        if distributions:
+            raise ValueError('%s has no field named %s' % (
+                self.model.__name__, ', '.join(sorted(distributions))))
+        return streams
+
+    def __drawn(self, attrs):
+        """
+        Returns attrs with values drawn from the class distributions.
+
+        """
+        if not self.distributions:
+            return attrs
+        return drawn_rows(1, self.__streams(1, {}, None, **attrs), attrs).next()
+
+    def __raw_batches(self, qty, fields, batch_size, parents, reuse_existing,
+            distributions, **attrs):
+        """
+        Yields the attrs dicts of `qty` rows, `batch_size` at a time. Rows
+        are not instantiated, so required foreign keys must be set in attrs
+        or picked from a pool.
+
+        """
+        pools = self.__pools(True, parents, reuse_existing, **attrs)
+
+        for field in fields:
+            if isinstance(field, RelatedField) and not field.null and not \
+                    set([field.name, field.attname]) & (set(attrs) | set(pools)):
+                raise ValueError('%s has no parent for %s rows: set it in attrs, '
+                    'or make parents first' % (field.name, self.model.__name__))
+
+        rows = drawn_rows(qty, self.__streams(qty, pools, distributions, **attrs), attrs)
+
+        for chunk_qty in chunks(qty, batch_size):
+            yield [self.__attrs(False, False, **row) for row in islice(rows, chunk_qty)]
+
+    def __parallel_prepare(self, qty, workers, streams, **attrs):
+        """
+        Prepares instances in worker processes, then assigns them the values
+        drawn from streams. Workers don't generate drawn fields. Unique
+        values are only tracked per worker chunk, so they are checked again
+        here.
+
+        """
+        if self.preload_unique:
+            # workers don't query the database, they get the loaded values
+            self.__load_unique()
+
+        if not streams:
+            instances = parallel_prepare(self, qty, workers, **attrs)
+            self.__unique_instances(instances, attrs)
+            return instances
+
+        skip = dict(attrs)
+        for field in self.get_fields():
+            if field.name in streams or field.attname in streams:
+                skip[field.attname] = None
+
+        instances = parallel_prepare(self, qty, workers, **skip)
+        for instance, row in zip(instances, drawn_rows(qty, streams, {})):
+            for name, value in row.items():
+                setattr(instance, name, value)
+        self.__unique_instances(instances, set(attrs) | set(streams))
+        return instances
+
+    def __write(self, instances, bulk, batch_size, need_pks=False, **attrs):
+        """
+        Commits prepared instances and the related instances they hold,
+        then sets their m2m values.
+
+        Keyword arguments:
+        bulk -- write instances with bulk inserts instead of save(). m2m
+        values are bulk inserted into the through tables too.
+        batch_size -- max number of rows per INSERT in bulk mode
+        need_pks -- should instances get primary keys in bulk mode?
+
+        """
+        m2m_attrs = [self.__m2m_attrs(self.get_m2m_fields(), **attrs) for instance in instances]
+        need_pks = need_pks or any(any(m2m.values()) for m2m in m2m_attrs)
+
+        if bulk:
+            self.__bulk_write(instances, batch_size, need_pks)
+        else:
+            for instance in instances:
+                self.__commit_related(instance)
+                self.__save(instance)
+
+        if not need_pks:
+            return
+
+        links = {}  # field name -> (instance pk, value pk) pairs
+        for instance, m2m in zip(instances, m2m_attrs):
+            for key, values in m2m.items():
+                if not values:
+                    continue
+                if instance.pk is None:
+                    raise ValueError('%s can\'t be set: %s has no primary key after '
+                        'the bulk insert.' % (key, self.model.__name__))
+
+                if bulk:
+                    links.setdefault(key, []).extend(
+                        (instance.pk, getattr(value, 'pk', value)) for value in values)
+                else:
+                    self.__m2m_add(instance, key, values)
+
+        for key, pairs in links.items():
+            self.__insert_links(self.model._meta.get_field(key), pairs, batch_size)
+
+    def __link(self, instances, m2m, batch_size, **attrs):
+        """
+        Links every instance to distinct rows of each m2m field, with one
+        bulk insert per field into its through table. Rows are made if the
+        related table holds less rows than an instance needs.
+
+        Keyword arguments:
+        m2m -- dict of m2m field name -> fan out, see model_mommy.links.fan_out
+        attrs -- fields set in attrs are not linked
+
+        """
+        fields = dict((field.name, field) for field in self.get_m2m_fields())
+
+        for name, spec in sorted(m2m.items()):
+            field = fields.get(name)
+            if field is None:
+                raise ValueError('%s has no m2m field named %s' % (self.model.__name__, name))
+            if name in attrs:
+                continue
+
+            counts = fan_out(self.rng, spec, len(instances))
+            model = field.rel.to
+            population = existing_pks(model)
+
+            missing = max(counts or [0]) - len(population)
+            if missing > 0:
+                mommy = self.__child(model)
+                rows = mommy.prepare_many(missing)
+                mommy.__write(rows, True, batch_size, True)
+                population += [row.pk for row in rows]
+
+            # self referencing instances are not linked to themselves
+            extra = model == self.model and 1 or 0
+
+            pairs = []
+            for instance, count in zip(instances, counts):
+                pks = sample_distinct(population, count + extra, self.rng)
+                pks = [pk for pk in pks if pk != instance.pk or not extra][:count]
+                pairs.extend((instance.pk, pk) for pk in pks)
+            self.__insert_links(field, pairs, batch_size)
+
+    def __insert_links(self, field, pairs, batch_size):
+        rows = link_rows(field, pairs)
+        if rows:
+            self.__bulk_create(field.rel.through, rows, batch_size)
+
+    def __bulk_write(self, instances, batch_size, need_pks):
+        """
+        Writes instances and the unsaved related instances they hold level
+        by level, parents first, with one bulk insert per model and level.
+        See model_mommy.graph.
+
+        Keyword arguments:
+        need_pks -- should instances get primary keys, for m2m values?
+
+        """
+        wanted = referenced(instances)  # parents need keys to be pointed at
+        if need_pks:
+            wanted.update(id(instance) for instance in instances)
+        allocator = get_allocator(self.key_allocator)
+        reserved = set()  # models written with reserved keys
+
+        for level in levels(instances):
+            for model, group in level:
+                wire(group)
+
+                # rows with no column but an auto primary key can't be bulk
+                # inserted without a key either
+                needs_pks = len(model._meta.local_fields) == 1 or \
+                    any(id(instance) in wanted for instance in group)
+                if needs_pks and not returns_bulk_pks():
+                    if can_reserve_pks(model) and can_bulk_insert(model):
+                        reserve_pks(model, [i for i in group if i.pk is None], allocator)
+                    else:
+                        for instance in group:
+                            self.__save(instance)
+                        continue
+
+                if can_bulk_insert(model):
+                    if any(getattr(instance._state, 'reserved_pk', False) for instance in group):
+                        reserved.add(model)
+                    self.__bulk_create(model, group, batch_size)
+                    mark_saved(model, group)
+                else:
+                    for instance in group:
+                        self.__save(instance)
+
+        if reserved:
+            allocator.written(reserved)
+
+    def __commit_related(self, instance):
+        """
+        Saves the uncommited related instances held by a prepared instance,
+        deepest first.
+
+        """
+        for field in self.get_fields():
+            if not isinstance(field, RelatedField):
+                continue
+
+            related = getattr(instance, field.get_cache_name(), None)
+            if related is None:
+                continue
+
+            if is_unsaved(related):
+                self.__child(related.__class__).__commit_related(related)
+                self.__save(related)
+
+            # refresh the foreign key value, parents may be shared
+            if getattr(instance, field.attname) != related.pk:
+                setattr(instance, field.name, related)
+
+    def __save(self, instance):
+        # a reserved key must not turn the save into an update
+        reserved = getattr(instance._state, 'reserved_pk', False)
+        if self.observer is None:
+            instance.save(force_insert=reserved)
+        else:
+            self.observer.write(instance.__class__, 'save', instance.save,
+                force_insert=reserved)
+        instance._state.reserved_pk = False
+
+    def __bulk_create(self, model, instances, batch_size):
+        manager = model._default_manager
+        if self.observer is None:
+            manager.bulk_create(instances, batch_size=batch_size)
+        else:
+            self.observer.write(model, 'bulk insert', manager.bulk_create,
+                instances, batch_size=batch_size)
+
+    def __m2m_add(self, instance, key, values):
+        """
+        Adds all values to a m2m relation with a single call.
+
+        """
+        add = getattr(instance, key).add
+        if self.observer is None:
+            add(*values)
+        else:
+            self.observer.write(self.model, 'm2m add %s' % key, add, *values)
+
+    def __child(self, model):
+        """
+        Returns a Mommy for a related model, drawing from the same
+        random generator.
+
+        """
+        mommy = self.__class__(model, minimal=self.minimal, preload_unique=self.preload_unique)
+        mommy.seed, mommy.rng = self.seed, self.rng
+        mommy.observer = self.observer
+        mommy.unique_values = self.unique_values
+        return mommy
+
+    def now(self):
+        """
+        Returns the current datetime, used by date and time generators.
+        Seeded instances always return SEEDED_NOW, so their datasets
+        are reproducible.
+
+        """
+        if self.seed is None:
+            return datetime.datetime.now()
+        return SEEDED_NOW
+
     def __get_value_for_field(self, field):
+        return self.__generator_for(field)(self, field)
+
+    def __generator_for(self, field):
         """
-        Decides which method should create the value for field.
+        Decides which method should create the value for field. Returns a
+        callable with the signature generate(mommy, field).
 
         Evaluation order:
             choices -> value_for_<fieldname>field -> value_for_<fieldtype>
 
         """
-        field_cls = field.__class__
-        field_cls_name = field_cls.__name__.lower()
-
-        field_name_method = 'value_for_' + field.name + "field"
-        field_type_method = 'value_for_' + field_cls_name
+        field_cls_name = field.__class__.__name__.lower()
 
         if field.choices:  # get from avaiable choices
-            return choice(map(lambda c: c[0], field.choices))
+            values = [c[0] for c in field.choices]
+
+            def choices(mommy, field):
+                return mommy.rng.choice(values)
+            return choices
 
-        elif hasattr(self, field_name_method):
-            return getattr(self, field_name_method)(field)
+        for method in self.__generator_names(field):
+            if method in self.__dict__:
+                def instance_method(mommy, field, method=method):
+                    return getattr(mommy, method)(field)
+                instance_method.__name__ = method
+                return instance_method
 
-        elif hasattr(self, field_type_method):
-            return getattr(self, field_type_method)(field)
+            elif hasattr(self.__class__, method):
+                return getattr(self.__class__, method)
 
-        else:  # unsupported field type
+        def unsupported(mommy, field):  # unsupported field type
             raise TypeError('%s is not supported by mommy.' % field_cls_name)
+        return unsupported
+
+    def __generator_names(self, field):
+        """
+        Returns the names of the methods that may generate values for
+        field, in lookup order.
+
+        """
+        return ('value_for_' + field.name + "field",
+            'value_for_' + field.__class__.__name__.lower())
 
     def value_for_booleanfield(self, field):
         """
@@ -196,7 +1146,7 @@ class Mommy(object):
         >>> assert value in (True, False), 'returned value is invalid'
 
         """
-        return choice((False, True))
+        return self.rng.choice((False, True))
 
     def value_for_nullbooleanfield(self, field):
         """
@@ -208,7 +1158,7 @@ class Mommy(object):
         >>> assert value in (None, True, False), 'returned value is invalid'
 
         """
-        return choice((False, True))  # nullbooleanfield ahs null=True by default
+        return self.rng.choice((False, True))  # nullbooleanfield ahs null=True by default
 
     def value_for_smallintegerfield(self, field):
         """
@@ -220,42 +1170,42 @@ class Mommy(object):
         >>> assert isinstance(value, int), 'value is not integer'
 
         """
-        return randint(MIN_SMALL_INT, MAX_SMALL_INT)
+        return self.rng.randint(MIN_SMALL_INT, MAX_SMALL_INT)
 
     def value_for_positivesmallintegerfield(self, field):
         """
         Returns a positive 16bits integer.
 
         """
-        return randint(0, MAX_SMALL_INT)
+        return self.rng.randint(0, MAX_SMALL_INT)
 
     def value_for_integerfield(self, field):
         """
         Returns a 32bits integer.
 
         """
-        return randint(MIN_INT, MAX_INT)
+        return self.rng.randint(MIN_INT, MAX_INT)
 
     def value_for_positiveintegerfield(self, field):
         """
         Returns a positive 32bits integer.
 
         """
-        return randint(0, MAX_INT)
+        return self.rng.randint(0, MAX_INT)
 
     def value_for_bigintegerfield(self, field):
         """
         Returns a 64bits integer.
 
         """
-        return randint(MIN_BIG_INT, MAX_BIG_INT)
+        return self.rng.randint(MIN_BIG_INT, MAX_BIG_INT)
 
     def value_for_floatfield(self, field):
         """
         Returns a random float value
 
         """
-        return random() * randint(MIN_INT, MAX_INT)
+        return self.rng.random() * self.rng.randint(MIN_INT, MAX_INT)
 
     def value_for_decimalfield(self, field):
         """
@@ -264,8 +1214,8 @@ class Mommy(object):
         """
         md, dp = field.max_digits, field.decimal_places
 
-        md_number = ''.join([str(randint(0, 9)) for i in range(md - dp)])
-        dp_number = ''.join([str(randint(0, 9)) for i in range(dp)])
+        md_number = ''.join([str(self.rng.randint(0, 9)) for i in range(md - dp)])
+        dp_number = ''.join([str(self.rng.randint(0, 9)) for i in range(dp)])
 
         return "%s.%s" % (md_number, dp_number)
 
@@ -277,14 +1227,14 @@ class Mommy(object):
         """
         max_length = field.max_length
 
-        number = randint(MIN_INT, MAX_INT)
+        number = self.rng.randint(MIN_INT, MAX_INT)
         str_number = str(number)
 
         cut_off = len(str_number) - min(len(str_number), max_length)
         rt = str(int(str_number[cut_off:]))
 
-        while (len(rt) < max_length - 1) and not choice(LEAVE_TO_CHANCE):
-            number = randint(MIN_INT, MAX_INT)
+        while (len(rt) < max_length - 1) and not self.rng.choice(LEAVE_TO_CHANCE):
+            number = self.rng.randint(MIN_INT, MAX_INT)
             str_number = str(number)
 
             rt += ","
@@ -298,21 +1248,21 @@ class Mommy(object):
         Returns a datetime.date object for the current time
 
         """
-        return datetime.date.today()
+        return self.now().date()
 
     def value_for_timefield(self, field):
         """
         Returns a datetime.datetime object for the current time
 
         """
-        return datetime.datetime.now()
+        return self.now()
 
     def value_for_datetimefield(self, field):
         """
         Returns a datetime.datetime object for the current time
 
         """
-        return datetime.datetime.now()
+        return self.now()
 
     def value_for_ipaddressfield(self, field):
         """
@@ -334,8 +1284,8 @@ class Mommy(object):
 
         while True:
             ip_address = (
-                randint(1, 254), randint(0, 254),
-                randint(0, 254), randint(1, 254))
+                self.rng.randint(1, 254), self.rng.randint(0, 254),
+                self.rng.randint(0, 254), self.rng.randint(1, 254))
 
             if (ip_address[0] == 10) or\
                (ip_address[0] == 192 and ip_address[1] == 168) or\
@@ -350,24 +1300,24 @@ class Mommy(object):
         Returns a random word with provided max_length.
 
         """
-        length = randint(1, field.max_length)
-        return raw_string(length, LATIN1_TABLE)
+        length = self.rng.randint(1, field.max_length)
+        return raw_string(length, LATIN1_TABLE, rng=self.rng)
 
     def value_for_slugfield(self, field):
         """
         Returns a random slug with provided max_length.
 
         """
-        length = randint(1, field.max_length)
-        return raw_string(length, SLUG_TABLE)
+        length = self.rng.randint(1, field.max_length)
+        return raw_string(length, SLUG_TABLE, rng=self.rng)
 
     def value_for_textfield(self, field):
         """
         Returns a random text with default max_length
 
         """
-        length = randint(1, TEXT_MAX_LENGTH)
-        return raw_string(length, LATIN1_TABLE + '\n')
+        length = self.rng.randint(1, TEXT_MAX_LENGTH)
+        return raw_string(length, LATIN1_TABLE, rng=self.rng)  # newlines included
 
     def value_for_xmlfield(self, field):
         """
@@ -381,34 +1331,31 @@ class Mommy(object):
         Returns a random file path
 
         """
-        length = randint(1, field.max_length)
-        return raw_filename(length, FILE_EXT_LIST)
+        length = self.rng.randint(1, field.max_length)
+        return raw_filename(length, FILE_EXT_LIST, rng=self.rng)
 
     def value_for_filepathfield(self, field):
         """
         Returns a random file path
 
         """
-        length = randint(1, field.max_length)
-        return raw_filename(length, FILE_EXT_LIST)
+        length = self.rng.randint(1, field.max_length)
+        return raw_filename(length, FILE_EXT_LIST, rng=self.rng)
 
     def value_for_imagefield(self, field):
         """
         Returns a random image file path
 
         """
-        length = randint(1, field.max_length)
-        return raw_filename(length, IMG_EXT_LIST)
+        length = self.rng.randint(1, field.max_length)
+        return raw_filename(length, IMG_EXT_LIST, rng=self.rng)
 
     def value_for_urlfield(self, field):
         """
         Returns a random url without parameters.
 
         """
-        assert field.max_length > 8, 'informed max_length for url is too small'
-
-        length = randint(1, field.max_length - 7)
-        return "http://%s" % raw_hostname(length)
+        return raw_url(field.max_length, rng=self.rng)
 
     def value_for_emailfield(self, field):
         """
@@ -417,17 +1364,7 @@ class Mommy(object):
         ref: http://en.wikipedia.org/wiki/Email_address
 
         """
-        max_length = field.max_length
-
-        assert max_length >= 3, 'max_length for emailfield is too short'
-
-        max_length -= 1  # @
-        local_part_length = randint(1, max_length - 1)  # make sure local part < max_length
-        domain_part_length = randint(1, max_length - local_part_length)
-
-        local_part = raw_email_localpart(local_part_length)
-        domain_part = raw_hostname(domain_part_length)
-        return u"%s@%s" % (local_part, domain_part)
+        return raw_email(field.max_length, rng=self.rng)
 
     def value_for_foreignkey(self, field):
         """
@@ -436,8 +1373,7 @@ class Mommy(object):
         """
         if not field.null:
             model = field.related.parent_model
-            base = self.__class__(model)
-            return base.__make(False)
+            return self.__child(model).__make(False)
 
     def value_for_onetoonefield(self, field):
         """
@@ -446,8 +1382,7 @@ class Mommy(object):
         """
         if not field.null:
             model = field.related.parent_model
-            base = self.__class__(model)
-            return base.__make(False)
+            return self.__child(model).__make(False)
 
     def value_for_manytomanyfield(self, field):
         """
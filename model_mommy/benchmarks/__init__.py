@@ -0,0 +1,200 @@
+# -*- coding:utf-8 -*-
+
+__doc__ = '''
+Benchmark suite for mommy generators and make/prepare paths.
+
+Every benchmark runs in a forked process, against a copy of the test
+database, and reports its throughput, queries per instance and peak
+memory. Results can be saved as json and compared against a baseline.
+See runbenchmarks.py for the command line.
+'''.strip()
+
+import os
+import sys
+import json
+import time
+import resource
+import cPickle as pickle
+
+import django
+from django.db import connection
+
+REGRESSION_THRESHOLD = 0.2  # 20% slower than the baseline
+
+
+class Benchmark(object):
+    """
+    A named callable to be timed. `func` is called `number` times and
+    each call produces `per_call` values (rows, strings...).
+
+    """
+    def __init__(self, name, func, number=1, per_call=1, unit='values'):
+        self.name = name
+        self.func = func
+        self.number = number
+        self.per_call = per_call
+        self.unit = unit
+
+    def run(self):
+        """
+        Runs the benchmark in the current process and returns its results.
+
+        """
+        use_debug_cursor = connection.use_debug_cursor
+        connection.use_debug_cursor = True
+        connection.queries = []
+        start_memory = resident_memory()
+
+        try:
+            start = time.time()
+            for i in xrange(self.number):
+                self.func()
+            seconds = time.time() - start
+        finally:
+            connection.use_debug_cursor = use_debug_cursor
+
+        values = self.number * self.per_call
+        return {
+            'unit': self.unit,
+            'values': values,
+            'seconds': seconds,
+            'per_second': values / max(seconds, 1e-9),
+            'queries_per_value': len(connection.queries) / float(values),
+            'peak_memory_kb': max(peak_memory() - start_memory, 0),
+        }
+
+
+def resident_memory():
+    """
+    Current resident memory of this process in KB.
+
+    """
+    with open('/proc/self/statm') as statm:
+        pages = int(statm.read().split()[1])
+    return pages * resource.getpagesize() // 1024
+
+
+def peak_memory():
+    """
+    Peak resident memory of this process in KB.
+
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_isolated(benchmark):
+    """
+    Runs a benchmark in a forked process, so its database writes and peak
+    memory don't leak into other benchmarks.
+
+    """
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+
+    if pid == 0:  # child
+        os.close(read_end)
+        try:
+            result = benchmark.run()
+        except Exception, e:
+            result = {'error': '%s: %s' % (e.__class__.__name__, e)}
+        with os.fdopen(write_end, 'wb') as out:
+            pickle.dump(result, out, 2)
+        os._exit(0)
+
+    os.close(write_end)
+    with os.fdopen(read_end, 'rb') as source:
+        result = pickle.load(source)
+    os.waitpid(pid, 0)
+    return result
+
+
+def all_benchmarks():
+    from .generators import generator_benchmarks, helper_benchmarks
+    from .makers import maker_benchmarks
+
+    return generator_benchmarks() + helper_benchmarks() + maker_benchmarks()
+
+
+def run(names=None, out=sys.stdout):
+    """
+    Runs every benchmark whose name contains one of `names` (all of them
+    if not provided) and returns a results dict, ready to be dumped as json.
+
+    """
+    results = {}
+
+    for benchmark in all_benchmarks():
+        if names and not any(name in benchmark.name for name in names):
+            continue
+
+        result = results[benchmark.name] = run_isolated(benchmark)
+        out.write(format_result(benchmark.name, result) + '\n')
+        out.flush()
+
+    return {
+        'python': sys.version.split()[0],
+        'django': django.get_version(),
+        'results': results,
+    }
+
+
+def format_result(name, result):
+    if 'error' in result:
+        return '%-60s %s' % (name, result['error'])
+
+    return '%-60s %12.1f %s/s %8.2f queries %8d KB' % (name,
+        result['per_second'], result['unit'], result['queries_per_value'],
+        result['peak_memory_kb'])
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD, out=sys.stdout):
+    """
+    Compares results with a baseline produced by run(). Returns the names
+    of benchmarks slower than the baseline by more than `threshold`.
+
+    """
+    regressions = []
+    base_results = baseline['results']
+
+    for name in sorted(results['results']):
+        result, base = results['results'][name], base_results.get(name)
+        if base is None or 'error' in result or 'error' in base:
+            continue
+
+        ratio = result['per_second'] / max(base['per_second'], 1e-9)
+        regressed = ratio < 1 - threshold
+        if regressed:
+            regressions.append(name)
+
+        out.write('%-60s %6.2fx %s\n' % (name, ratio, regressed and 'REGRESSION' or ''))
+    return regressions
+
+
+def main(argv):
+    from optparse import OptionParser
+
+    parser = OptionParser(usage='%prog [options] [name ...]')
+    parser.add_option('--json', dest='json', help='save results to this file')
+    parser.add_option('--compare', dest='baseline',
+        help='compare results with a json file saved with --json')
+    parser.add_option('--threshold', dest='threshold', type='float',
+        default=REGRESSION_THRESHOLD,
+        help='max slowdown allowed when comparing (default: %default)')
+    options, names = parser.parse_args(argv)
+
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+
+    results = run(names)
+
+    if options.json:
+        with open(options.json, 'w') as out:
+            json.dump(results, out, indent=2, sort_keys=True)
+
+    if options.baseline:
+        with open(options.baseline) as source:
+            baseline = json.load(source)
+        if compare(results, baseline, options.threshold):
+            return 1
+    return 0
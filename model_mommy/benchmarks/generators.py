@@ -0,0 +1,78 @@
+# -*- coding:utf-8 -*-
+
+__doc__ = '''
+Benchmarks for every Mommy.value_for_* generator and utils.raw_* helper.
+'''.strip()
+
+import random
+
+from django.db.models import get_models, get_app
+
+from model_mommy.base import Mommy
+from model_mommy.constants import ASCII_TABLE, LATIN1_TABLE, SLUG_TABLE
+from model_mommy.constants import LATIN1_RANGE, FILE_EXT_LIST
+from model_mommy import utils, network
+from model_mommy.distributions import Zipf, Normal
+
+from . import Benchmark, legacy
+
+GENERATOR_CALLS = 2000
+HELPER_CALLS = 2000
+POPULATION = range(1000)
+
+
+def generator_fields():
+    """
+    Returns a (model, field) pair for each value_for_<fieldtype> generator
+    that has a field of its type in the test models.
+
+    """
+    fields = {}
+
+    for model in get_models(get_app('model_mommy')):
+        for field in model._meta.fields + model._meta.many_to_many:
+            method = 'value_for_' + field.__class__.__name__.lower()
+            if hasattr(Mommy, method) and method not in fields:
+                fields[method] = (model, field)
+    return fields
+
+
+def generator_benchmarks():
+    benchmarks = []
+
+    for method, (model, field) in sorted(generator_fields().items()):
+        generate = getattr(Mommy(model), method)
+        name = 'generator %s' % method[len('value_for_'):]
+        benchmarks.append(Benchmark(name, lambda generate=generate, field=field: generate(field),
+            GENERATOR_CALLS))
+
+    return benchmarks
+
+
+def helper_benchmarks():
+    cases = [
+        ('raw_string ascii 10', lambda: utils.raw_string(10, ASCII_TABLE)),
+        ('raw_string latin1 500', lambda: utils.raw_string(500, LATIN1_TABLE)),
+        ('raw_string slug 50', lambda: utils.raw_string(50, SLUG_TABLE)),
+        ('raw_string latin1 range 500', lambda: utils.raw_string(500, LATIN1_RANGE)),
+        ('raw_filename 100', lambda: utils.raw_filename(100, FILE_EXT_LIST)),
+        ('raw_hostname_label 63', lambda: utils.raw_hostname_label(63)),
+        ('raw_hostname 255', lambda: utils.raw_hostname(255)),
+        ('raw_email_localpart 64', lambda: utils.raw_email_localpart(64)),
+        ('raw_email 254', lambda: network.raw_email(254)),
+        ('legacy email 254', lambda: legacy.legacy_email(254)),
+        ('raw_url 200', lambda: network.raw_url(200)),
+    ]
+
+    benchmarks = [Benchmark('helper ' + name, func, HELPER_CALLS) for name, func in cases]
+    benchmarks += [
+        Benchmark('helper raw_strings latin1 500 x1000',
+            lambda: utils.raw_strings([500] * 1000, LATIN1_TABLE), per_call=1000),
+        Benchmark('helper raw_emails 254 x1000',
+            lambda: network.raw_emails(1000, 254), per_call=1000),
+        Benchmark('helper zipf 1000 x10000',
+            lambda zipf=Zipf(1.1): zipf.draw(random, 10000, POPULATION), 20, per_call=10000),
+        Benchmark('helper normal x10000',
+            lambda normal=Normal(40, 10): normal.draw(random, 10000), 20, per_call=10000),
+    ]
+    return benchmarks
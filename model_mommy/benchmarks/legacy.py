@@ -0,0 +1,53 @@
+# -*- coding:utf-8 -*-
+
+__doc__ = '''
+E-mail generation as it was before model_mommy.network, kept as a
+baseline for the network generators.
+'''.strip()
+
+import string
+from random import randint, choice
+
+
+def legacy_email_localpart(length):
+    char_table = string.ascii_letters + string.digits + "!#$%&'*+-/=?^_`{|}~"
+    char_table_ = char_table + "."
+
+    email = ""
+    while len(email) < length:
+        if len(email) in (0, length - 1) or email[-1] == '.':
+            email += choice(char_table)
+        else:
+            email += choice(char_table_)
+    return email
+
+
+def legacy_hostname_label(length):
+    char_table = string.ascii_letters + string.digits
+    char_table_ = string.ascii_letters + string.digits + '-'
+    hostname = ''
+
+    while len(hostname) < length:
+        if len(hostname) == 0 or len(hostname) == length - 1:
+            hostname += choice(char_table)
+        else:
+            hostname += choice(char_table_)
+    return hostname
+
+
+def legacy_hostname(apr_length):
+    labels = []
+    sum_labels = sum(map(lambda i: len(i), labels))
+    while sum_labels + len(labels) < apr_length:
+        max_length = min(63, apr_length - sum_labels - len(labels))
+        labels.insert(0, legacy_hostname_label(randint(1, max_length)))
+        sum_labels = sum(map(lambda i: len(i), labels))
+    return '.'.join(labels)
+
+
+def legacy_email(max_length):
+    max_length -= 1
+    local_part_length = randint(1, max_length - 1)
+    domain_part_length = randint(1, max_length - local_part_length)
+    return u"%s@%s" % (legacy_email_localpart(local_part_length),
+        legacy_hostname(domain_part_length))
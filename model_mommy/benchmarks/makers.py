@@ -0,0 +1,44 @@
+# -*- coding:utf-8 -*-
+
+__doc__ = '''
+Benchmarks for make_one, prepare_many, make_many and make_raw with the test
+models.
+'''.strip()
+
+from model_mommy import mommy
+from model_mommy.models import Person, Dog, Store, Car, DummyIntModel
+
+from . import Benchmark
+
+MODELS = (Person, Dog, Store, Car, DummyIntModel)
+RAW_MODELS = (Person, DummyIntModel)  # no required parent
+QTY = 500
+
+
+def maker_benchmarks():
+    benchmarks = []
+
+    for model in MODELS:
+        name = model.__name__
+        benchmarks += [
+            Benchmark('make_one %s' % name, lambda model=model: mommy.make_one(model),
+                QTY, unit='rows'),
+            Benchmark('prepare_many %s' % name, lambda model=model: mommy.prepare_many(model, QTY),
+                per_call=QTY, unit='rows'),
+            Benchmark('prepare_many clone %s' % name,
+                lambda model=model: mommy.prepare_many(model, QTY, clone=True),
+                per_call=QTY, unit='rows'),
+            Benchmark('make_many %s' % name, lambda model=model: mommy.make_many(model, QTY),
+                per_call=QTY, unit='rows'),
+            Benchmark('make_many bulk %s' % name,
+                lambda model=model: mommy.make_many(model, QTY, bulk=True),
+                per_call=QTY, unit='rows'),
+            Benchmark('make_many pipeline %s' % name,
+                lambda model=model: mommy.make_many(model, QTY, batch_size=100, pipeline=True),
+                per_call=QTY, unit='rows'),
+        ]
+
+    for model in RAW_MODELS:
+        benchmarks.append(Benchmark('make_raw %s' % model.__name__,
+            lambda model=model: mommy.make_raw(model, QTY), per_call=QTY, unit='rows'))
+    return benchmarks
@@ -0,0 +1,301 @@
+# -*- coding:utf-8 -*-
+
+__doc__ = '''
+On-disk fixture cache for seeded make_many calls.
+
+Entries are keyed on a hash of the model schema (and the schemas of the
+models it relates to), the generation code, the Mommy class generators,
+the seed, the quantity and the attributes. On a miss the rows written by
+make_many are stored as gzipped json. On a hit they are bulk loaded back
+instead of being generated again. Changing a model or a generator changes
+the key, so stale entries are never loaded.
+
+Entries restore rows with their original primary keys, so they are meant
+to be loaded into a fresh database, like the test database.
+'''.strip()
+
+import os
+import gzip
+import json
+import inspect
+import tempfile
+from hashlib import sha1
+
+from django.conf import settings
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Model
+
+from .graph import mark_saved
+from .keys import reset_sequences
+
+DEFAULT_CACHE_DIR = '.mommy_cache'
+CACHE_FORMAT = 1
+
+
+def schema_signature(model, seen=None):
+    """
+    Returns a list describing the fields of model and of every model it
+    relates to, as far as generation is concerned.
+
+    """
+    seen = seen if seen is not None else set()
+    if model in seen:
+        return []
+    seen.add(model)
+
+    opts = model._meta
+    signature = [(opts.app_label, opts.object_name, opts.db_table)]
+    related = []
+
+    for field in opts.fields + opts.many_to_many:
+        rel = getattr(field, 'rel', None)
+        to = rel and rel.to
+        signature.append((field.name, field.attname, field.__class__.__name__,
+            field.max_length, field.null, field.blank, field.unique,
+            [choice[0] for choice in field.choices],
+            field.has_default() and repr(field.default) or None,
+            getattr(field, 'max_digits', None), getattr(field, 'decimal_places', None),
+            to and to._meta.object_name))
+        if to is not None:
+            related.append(to)
+
+    for to in related:
+        signature += schema_signature(to, seen)
+    return signature
+
+
+def generators_signature(mommy_class):
+    """
+    Returns the source of every value_for_* generator of mommy_class.
+
+    """
+    signature = []
+
+    for name in sorted(dir(mommy_class)):
+        if name.startswith('value_for_'):
+            method = getattr(mommy_class, name)
+            try:
+                source = inspect.getsource(method)
+            except (IOError, TypeError):
+                code = method.func_code
+                source = repr((code.co_code, code.co_consts, code.co_names))
+            signature.append((name, source))
+    return signature
+
+
+_library_hash = []
+
+
+def library_sources():
+    """
+    Returns the paths of the model_mommy modules. Any of them (plans,
+    distributions, unique values, graph writes...) may change which rows
+    are written, so they are all hashed.
+
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+        if name.endswith('.py')]
+
+
+def library_hash():
+    """
+    Hash of the model_mommy modules generation depends on.
+
+    """
+    if not _library_hash:
+        digest = sha1()
+        for path in library_sources():
+            with open(path, 'rb') as source:
+                digest.update(source.read())
+        _library_hash.append(digest.hexdigest())
+    return _library_hash[0]
+
+
+def attr_signature(value):
+    if isinstance(value, Model):
+        return (value._meta.app_label, value._meta.object_name, value.pk)
+    elif isinstance(value, (list, tuple)):
+        return [attr_signature(item) for item in value]
+    return repr(value)
+
+
+def cache_key(mommy, qty, options):
+    """
+    Returns the cache key of mommy.make_many(qty, **options).
+
+    """
+    signature = [
+        CACHE_FORMAT,
+        library_hash(),
+        schema_signature(mommy.model),
+        generators_signature(mommy.__class__),
+        sorted((name, repr(value)) for name, value in mommy.distributions.items()),
+        mommy.fill_null,
+        mommy.minimal,
+        mommy.preload_unique,
+        mommy.seed,
+        qty,
+        sorted((key, attr_signature(value)) for key, value in options.items()),
+    ]
+    return sha1(json.dumps(signature, default=repr)).hexdigest()
+
+
+class Recorder(object):
+    """
+    Mommy observer that keeps every instance written, in write order.
+    Reports are passed on to the previous observer, if any.
+
+    """
+    def __init__(self, observer=None):
+        self.observer = observer
+        self.instances = []
+
+    def generate(self, mommy, field, generate):
+        if self.observer is None:
+            return generate(mommy, field)
+        return self.observer.generate(mommy, field, generate)
+
+    def merge(self, other):
+        # workers only generate, rows are written by this process
+        if self.observer is not None:
+            self.observer.merge(other.observer)
+
+    def write(self, model, operation, func, *args, **kwargs):
+        if self.observer is None:
+            rt = func(*args, **kwargs)
+        else:
+            rt = self.observer.write(model, operation, func, *args, **kwargs)
+
+        if operation == 'save':
+            self.instances.append(func.__self__)
+        elif operation == 'bulk insert':
+            self.instances.extend(args[0])
+        return rt
+
+
+def dump(instances, result, out):
+    """
+    Serializes instances, all written rows, and the indexes of the result
+    instances among them.
+
+    """
+    positions = dict((id(instance), i) for i, instance in enumerate(instances))
+    recorded = set(instance.__class__ for instance in instances)
+    objects = []
+
+    for instance in instances:
+        opts = instance._meta
+        fields = [field.name for field in opts.local_fields]
+        # rows bulk inserted without primary key have no m2m values, links
+        # bulk inserted as through rows are restored by those rows alone
+        if instance.pk is not None:
+            fields += [field.name for field in opts.many_to_many
+                if field.rel.through not in recorded]
+        objects += serializers.serialize('python', [instance], fields=fields)
+
+    json.dump({
+        'objects': objects,
+        'result': [positions[id(instance)] for instance in result],
+    }, out, cls=DjangoJSONEncoder, separators=(',', ':'))
+
+
+def load(source):
+    """
+    Writes the rows serialized by dump() and returns the result instances.
+
+    """
+    data = json.load(source)
+    objects = list(serializers.deserialize('python', data['objects']))
+
+    groups = []  # consecutive objects of a model are inserted together
+    for obj in objects:
+        if groups and groups[-1][0] is obj.object.__class__:
+            groups[-1][1].append(obj.object)
+        else:
+            groups.append((obj.object.__class__, [obj.object]))
+
+    for model, instances in groups:
+        if len(model._meta.local_fields) > 1 and not model._meta.parents:
+            model._default_manager.bulk_create(instances)
+            mark_saved(model, instances)
+        else:
+            for instance in instances:
+                instance.save_base(raw=True)
+
+    for obj in objects:
+        for name, values in (obj.m2m_data or {}).items():
+            if values:
+                getattr(obj.object, name).add(*values)
+
+    reset_sequences(set(model for model, instances in groups))
+    return [objects[i].object for i in data['result']]
+
+
+class FixtureCache(object):
+    """
+    Stores the rows written by seeded make_many calls in `directory`
+    (settings.MOMMY_CACHE_DIR or .mommy_cache by default).
+
+    """
+    def __init__(self, directory=None):
+        if directory is None:
+            directory = getattr(settings, 'MOMMY_CACHE_DIR', DEFAULT_CACHE_DIR)
+        self.directory = directory
+
+    def path(self, key):
+        return os.path.join(self.directory, key + '.json.gz')
+
+    def make_many(self, mommy, qty, **options):
+        """
+        Same as mommy.make_many(qty, **options), loading the rows from the
+        cache if possible.
+
+        """
+        if mommy.seed is None:
+            raise ValueError('Only seeded mommies can be cached, the same '
+                'values must be generated for the same key')
+
+        # progress reports don't change the rows
+        progress = options.pop('progress', None)
+
+        path = self.path(cache_key(mommy, qty, options))
+        if os.path.exists(path):
+            with gzip.open(path, 'rb') as source:
+                return load(source)
+
+        recorder = Recorder(mommy.observer)
+        mommy.observer = recorder
+        try:
+            result = mommy.make_many(qty, progress=progress, **options)
+        finally:
+            mommy.observer = recorder.observer
+
+        self.store(path, recorder.instances, result)
+        return result
+
+    def store(self, path, instances, result):
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+        # written aside and renamed, so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                with gzip.GzipFile(fileobj=tmp, mode='wb') as out:
+                    dump(instances, result, out)
+            os.rename(tmp_path, path)
+        except:
+            os.remove(tmp_path)
+            raise
+
+    def clear(self):
+        """
+        Removes every cache entry.
+
+        """
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith('.json.gz'):
+                    os.remove(os.path.join(self.directory, name))
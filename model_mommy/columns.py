@@ -0,0 +1,116 @@
+# -*- coding:utf-8 -*-
+
+__doc__ = '''
+Column oriented rows, for bulk loaders (COPY, LOAD DATA, dataframes).
+
+Rows are held as one list per column, numbers in typed arrays, instead of
+one model instance per row. They are written out as CSV (or TSV) a row
+at a time, without building per-row dicts.
+
+    columns = mommy.prepare_columns(Person, 1000000)
+    columns.to_csv(open('person.csv', 'wb'))
+    ages = columns['age']
+'''.strip()
+
+import csv
+from array import array
+from itertools import izip
+
+from .raw import column_values
+
+__all__ = ['Columns']
+
+# internal type -> array typecode, for not null numeric fields
+TYPECODES = {
+    'AutoField': 'l',
+    'BigIntegerField': 'l',
+    'IntegerField': 'l',
+    'PositiveIntegerField': 'l',
+    'PositiveSmallIntegerField': 'l',
+    'SmallIntegerField': 'l',
+    'FloatField': 'd',
+}
+
+
+def typecode(field):
+    if field.null:
+        return None
+    if field.rel is not None:
+        field = field.rel.get_related_field()
+    return TYPECODES.get(field.get_internal_type())
+
+
+def _encoded(value):
+    if value is None:
+        return ''
+    elif isinstance(value, unicode):
+        return value.encode('utf-8')
+    return value
+
+
+class Columns(object):
+    """
+    Rows of a model as columns, named after the database columns of the
+    fields.
+
+    """
+    def __init__(self, fields):
+        self.fields = fields
+        self.names = [field.column for field in fields]
+        self.data = []
+        for field in fields:
+            code = typecode(field)
+            if code is None:
+                self.data.append([])
+            else:
+                self.data.append(array(code))
+
+    def __len__(self):
+        return self.data and len(self.data[0]) or 0
+
+    def __getitem__(self, name):
+        return self.data[self.names.index(name)]
+
+    def __repr__(self):
+        return '<Columns: %d rows of %s>' % (len(self), ', '.join(self.names))
+
+    def extend(self, values):
+        """
+        Appends rows, given as a list of attrs dicts.
+
+        """
+        for i, field in enumerate(self.fields):
+            column = column_values(field, values)
+            data = self.data[i]
+            if isinstance(data, array):
+                # converted first: a failed extend leaves part of the values in
+                try:
+                    column = array(data.typecode, column)
+                except (TypeError, OverflowError):
+                    # blank values (and numbers too big for C longs) don't
+                    # fit in arrays
+                    data = self.data[i] = list(data)
+            data.extend(column)
+
+    def rows(self):
+        """
+        Returns an iterator of row tuples, in the column order of names.
+
+        """
+        return izip(*self.data)
+
+    def to_csv(self, out, delimiter=',', header=True):
+        """
+        Writes the rows as CSV to the file like object `out`. Text is UTF-8
+        encoded and nulls are written as empty values.
+
+        Keyword arguments:
+        delimiter -- '\\t' for TSV
+        header -- write the column names first
+
+        """
+        writer = csv.writer(out, delimiter=delimiter)
+        if header:
+            writer.writerow(self.names)
+        for row in self.rows():
+            writer.writerow(map(_encoded, row))
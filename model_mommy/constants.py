@@ -1,3 +1,5 @@
+import datetime
+import re
 import string
 
 # ref: http://docs.python.org/howto/unicode.html
@@ -8,9 +10,15 @@ ASCII_RANGE = (0, 127)
 LATIN1_TABLE = u''.join([unichr(i) for i in range(256)])
 ASCII_TABLE = LATIN1_TABLE[:128]
 SLUG_TABLE = string.ascii_lowercase + string.digits + "-_"
+FILENAME_TABLE = re.sub(r'[/\?%*:|"<>]', '', ASCII_TABLE)
+HOSTNAME_TABLE = string.ascii_letters + string.digits
+HOSTNAME_INNER_TABLE = HOSTNAME_TABLE + '-'
+EMAIL_LOCALPART_TABLE = string.ascii_letters + string.digits + "!#$%&'*+-/=?^_`{|}~"
+EMAIL_LOCALPART_INNER_TABLE = EMAIL_LOCALPART_TABLE + '.'
 
 LEAVE_TO_CHANCE = (True, False, False, False)  # +- 25% chance
 TEXT_MAX_LENGTH = 500
+SEEDED_NOW = datetime.datetime(2012, 1, 1, 12, 0, 0)  # "current time" for seeded mommies
 MIN_INT, MAX_INT = -2147483648, 2147483647
 MIN_BIG_INT, MAX_BIG_INT = -9223372036854775808l, 9223372036854775807l
 MIN_SMALL_INT, MAX_SMALL_INT = -32768, 32767
@@ -0,0 +1,294 @@
+# -*- coding:utf-8 -*-
+
+__doc__ = '''
+Distributions for field values and parent fan-out.
+
+Uniform data hides hot keys. Distributions draw skewed values (or pick
+skewed members of a population, like field choices or a pool of parents)
+in batches: entropy is drawn in one block and mapped to values with C
+level loops, instead of one random call per value.
+
+    class HotMommy(Mommy):
+        distributions = {'age': Normal(40, 12, low=0), 'gender': Zipf(1.2)}
+
+    mommy.make_many(Dog, 100000, parents={'owner': 1000},
+        distributions={'owner': Zipf(1.1)})
+'''.strip()
+
+import math
+import random
+from array import array
+from bisect import bisect_right
+from itertools import chain, repeat
+from operator import rshift
+
+from .strings import random_bytes, _random_indexes, _UNIT_TYPECODES
+
+__all__ = ['Distribution', 'Uniform', 'Normal', 'Zipf', 'Weighted']
+
+BATCH_SIZE = 4096
+QUANTILES = 1 << 16  # resolution of Normal
+
+GUIDE_MIN_SIZE = 16  # smaller weight tables are bisected without guide
+
+_UNIT_RANGE = 1 << 32
+_GUIDE_BUCKET = 1 << 16
+
+
+def random_units(count, rng=random, unit=4):
+    """
+    Returns an array of `count` random unsigned integers of `unit` bytes.
+
+    """
+    units = array(_UNIT_TYPECODES[unit])
+    units.fromstring(random_bytes(count * unit, rng))
+    return units
+
+
+def cumulative(weights):
+    """
+    Returns the cumulative table of weights, scaled to 2 ** 32, so that
+    bisect_right(table, unit) for a random 32 bits unit is a weighted index.
+
+    """
+    total = float(sum(weights))
+    if not total > 0 or min(weights) < 0:
+        raise ValueError('weights must be positive')
+
+    table = []
+    acc = 0.0
+    for weight in weights:
+        acc += weight
+        table.append(int(acc / total * _UNIT_RANGE))
+    table[-1] = _UNIT_RANGE  # every unit falls in
+    return table
+
+
+def guide(table):
+    """
+    Returns the (low, high) bisection bounds of every 16 bits bucket of
+    random units in a table built by cumulative(). Most buckets hold a
+    single index, so bisecting within the bucket bounds is much cheaper.
+
+    """
+    size = len(table)
+    starts = range(0, _UNIT_RANGE, _GUIDE_BUCKET)
+    low = map(bisect_right, repeat(table, len(starts)), starts)
+    high = [min(i + 1, size) for i in low[1:]] + [size]
+    return low, high
+
+
+def weighted_indexes(count, table, rng=random, bounds=None):
+    """
+    Returns `count` random indexes for a table built by cumulative().
+    `bounds` is the table guide(), if available.
+
+    """
+    units = random_units(count, rng)
+    if bounds is None:
+        return map(bisect_right, repeat(table, count), units)
+
+    low, high = bounds
+    buckets = map(rshift, units, repeat(16, count))
+    return map(bisect_right, repeat(table, count), units,
+        map(low.__getitem__, buckets), map(high.__getitem__, buckets))
+
+
+class WeightTable(object):
+    """
+    Cumulative table of weights, with a bisection guide for big tables.
+
+    """
+    def __init__(self, weights):
+        self.table = cumulative(weights)
+        self.bounds = len(self.table) > GUIDE_MIN_SIZE and guide(self.table) or None
+
+    def __len__(self):
+        return len(self.table)
+
+    def indexes(self, count, rng=random):
+        return weighted_indexes(count, self.table, rng, self.bounds)
+
+
+def normal_quantile(p):
+    """
+    Inverse of the standard normal cumulative distribution function for
+    0 < p < 1 (P. J. Acklam's approximation, relative error < 1.2e-9).
+
+    """
+    a = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+        1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+    b = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+        6.680131188771972e+01, -1.328068155288572e+01)
+    c = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+        -2.549671010331868e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+    d = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+        3.754408661907416e+00)
+
+    if p < 0.02425:
+        q = math.sqrt(-2 * math.log(p))
+        return (((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5]) / \
+            ((((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1)
+    elif p > 1 - 0.02425:
+        return -normal_quantile(1 - p)
+
+    q = p - 0.5
+    r = q * q
+    return (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * q / \
+        (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1)
+
+
+def _population(distribution, population):
+    if population is None:
+        raise ValueError('%s needs a population (field choices or a pool of '
+            'parents) to pick from' % distribution.__class__.__name__)
+    if not isinstance(population, (list, tuple)):
+        population = list(population)
+    if not population:
+        raise ValueError('can\'t pick from an empty population')
+    return population
+
+
+class Distribution(object):
+    """
+    Base class of distributions. Subclasses implement draw().
+
+    """
+    def draw(self, rng, count, population=None):
+        """
+        Returns a list of `count` values. Distributions that pick from a
+        population take it as argument.
+
+        """
+        raise NotImplementedError
+
+    def __repr__(self):
+        params = sorted((k, v) for k, v in vars(self).items() if not k.startswith('_'))
+        return '%s(%s)' % (self.__class__.__name__, ', '.join('%s=%r' % p for p in params))
+
+    def sample(self, rng, population=None):
+        return self.draw(rng, 1, population)[0]
+
+    def stream(self, rng, population=None, batch_size=BATCH_SIZE):
+        """
+        Returns an endless iterator of values, drawn `batch_size` at a time.
+
+        """
+        batches = iter(lambda: self.draw(rng, batch_size, population), None)
+        return chain.from_iterable(batches)
+
+
+class Uniform(Distribution):
+    """
+    Every member of the population is equally likely. Given bounds, draws
+    numbers in [low, high] instead: integers if both bounds are integers.
+
+    """
+    def __init__(self, low=None, high=None):
+        if (low is None) != (high is None) or (low is not None and low > high):
+            raise ValueError('Uniform needs no bounds or low <= high')
+        self.low = low
+        self.high = high
+
+    def draw(self, rng, count, population=None):
+        low, high = self.low, self.high
+
+        if low is None:
+            population = _population(self, population)
+            return map(population.__getitem__, _random_indexes(count, len(population), rng))
+
+        elif isinstance(low, (int, long)) and isinstance(high, (int, long)):
+            return _random_indexes(count, high - low + 1, rng, low)
+
+        scale = (high - low) / float(_UNIT_RANGE)
+        return [low + unit * scale for unit in random_units(count, rng)]
+
+
+class Normal(Distribution):
+    """
+    Numbers around `mu`, `sigma` being the standard deviation, clipped to
+    [low, high] and rounded to integers if `integer` is True. Values are
+    read from a table of 65536 quantiles.
+
+    """
+    def __init__(self, mu, sigma, low=None, high=None, integer=False):
+        self.mu = mu
+        self.sigma = sigma
+        self.low = low
+        self.high = high
+        self.integer = integer
+        self._table = None
+
+    def table(self):
+        if self._table is None:
+            table = []
+            for i in xrange(QUANTILES):
+                value = self.mu + self.sigma * normal_quantile((i + 0.5) / QUANTILES)
+                if self.low is not None:
+                    value = max(value, self.low)
+                if self.high is not None:
+                    value = min(value, self.high)
+                if self.integer:
+                    value = int(round(value))
+                table.append(value)
+            self._table = table
+        return self._table
+
+    def draw(self, rng, count, population=None):
+        return map(self.table().__getitem__, random_units(count, rng, 2))
+
+
+class Zipf(Distribution):
+    """
+    Picks the k-th member of the population (k from 1) with a probability
+    proportional to 1 / k ** s: the first members are hot, the tail is cold.
+    Without a population, draws ranks in [1, n].
+
+    """
+    def __init__(self, s=1.0, n=None):
+        self.s = s
+        self.n = n
+        self._tables = {}  # population size -> cumulative table
+
+    def table(self, size):
+        table = self._tables.get(size)
+        if table is None:
+            weights = [1.0 / (k ** self.s) for k in xrange(1, size + 1)]
+            table = self._tables[size] = WeightTable(weights)
+        return table
+
+    def draw(self, rng, count, population=None):
+        if population is None and self.n is not None:
+            return map(int(1).__add__, self.table(self.n).indexes(count, rng))
+
+        population = _population(self, population)
+        indexes = self.table(len(population)).indexes(count, rng)
+        return map(population.__getitem__, indexes)
+
+
+class Weighted(Distribution):
+    """
+    Picks values with the given weights. `weights` is either a dict (or a
+    list of pairs) of value -> weight, or a list of weights for the members
+    of the population, in order.
+
+    """
+    def __init__(self, weights):
+        if isinstance(weights, dict):
+            weights = sorted(weights.items())
+
+        weights = list(weights)
+        if weights and isinstance(weights[0], (list, tuple)):
+            self.values = [value for value, weight in weights]
+            self.weights = [weight for value, weight in weights]
+        else:
+            self.values = None
+            self.weights = weights
+        self._table = WeightTable(self.weights)
+
+    def draw(self, rng, count, population=None):
+        population = self.values or _population(self, population)
+        if len(population) != len(self._table):
+            raise ValueError('Weighted got %d weights for %d values' % (
+                len(self._table), len(population)))
+        return map(population.__getitem__, self._table.indexes(count, rng))
@@ -0,0 +1,227 @@
+# -*- coding:utf-8 -*-
+
+__doc__ = '''
+Streaming export of generated rows, to load them elsewhere later.
+
+Instances are prepared a chunk at a time, with their unsaved parents.
+Primary keys are reserved for the whole graph (see model_mommy.keys) and
+every row is written out right away, so memory use depends on the chunk
+size only. Two formats:
+
+ * CSVExporter writes a gzipped CSV file per table, and a tables.txt
+   index listing them parents first. load_csv() restores them with one
+   executemany() per batch.
+ * JSONExporter writes a (gzipped) fixture for manage.py loaddata.
+
+Keys are counted from 1 by default, so exports are meant to be loaded
+into empty tables. m2m values are not exported, and NUL characters are
+dropped from CSV values.
+'''.strip()
+
+import csv
+import gzip
+import json
+import os
+from itertools import islice
+
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import get_model
+
+from .graph import levels, reserve_graph
+from .keys import CounterAllocator, reset_sequences
+from .raw import insert_sql
+from .distributions import BATCH_SIZE
+
+INDEX_NAME = 'tables.txt'
+
+
+def model_label(model):
+    return '%s.%s' % (model._meta.app_label, model._meta.object_name.lower())
+
+
+def csv_value(field, instance):
+    """
+    Returns the CSV value of a field: UTF-8 text, without NUL characters
+    (CSV readers and most loaders don't take them), empty for nulls.
+
+    """
+    if getattr(instance, field.attname) is None:
+        return ''
+    return field.value_to_string(instance).encode('utf-8').replace('\0', '')
+
+
+def python_value(field, value):
+    """
+    Reverses csv_value: empty values are nulls for nullable fields.
+
+    """
+    if value == '':
+        if field.null:
+            return None
+        return ''
+    return field.to_python(value.decode('utf-8'))
+
+
+class Exporter(object):
+    """
+    Base class of exporters. Subclasses implement write() and close().
+
+    Keyword arguments:
+    allocator -- key allocator, a CounterAllocator from 1 by default
+
+    """
+    def __init__(self, allocator=None):
+        self.allocator = allocator or CounterAllocator()
+        self.count = 0
+
+    def export(self, mommy, qty, chunk_size=1000, **attrs):
+        """
+        Prepares `qty` instances with mommy, and writes them and their
+        parents. Returns the number of rows written.
+
+        """
+        for instance in mommy.iter_prepare(qty, chunk_size, self.write_chunk, **attrs):
+            pass
+        return self.count
+
+    def write_chunk(self, instances):
+        reserve_graph(instances, self.allocator)
+
+        for level in levels(instances):
+            for model, group in level:
+                # parents shared between chunks are written once
+                group = [i for i in group if not getattr(i._state, 'exported', False)]
+                for instance in group:
+                    instance._state.exported = True
+                if group:
+                    self.write(model, group)
+                    self.count += len(group)
+
+    def write(self, model, instances):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class CSVExporter(Exporter):
+    """
+    Writes a <app_label>.<model>.csv.gz file per table in `directory`,
+    headed by the column names.
+
+    """
+    def __init__(self, directory, allocator=None):
+        super(CSVExporter, self).__init__(allocator)
+        self.directory = directory
+        self.files = {}  # model -> (file, csv writer)
+        self.labels = []  # parents first
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def write(self, model, instances):
+        if model not in self.files:
+            out = gzip.open(os.path.join(self.directory, model_label(model) + '.csv.gz'), 'wb')
+            writer = csv.writer(out)
+            writer.writerow([field.column for field in model._meta.local_fields])
+            self.files[model] = out, writer
+            self.labels.append(model_label(model))
+
+        writer = self.files[model][1]
+        fields = model._meta.local_fields
+        for instance in instances:
+            writer.writerow([csv_value(field, instance) for field in fields])
+
+    def close(self):
+        for out, writer in self.files.values():
+            out.close()
+        with open(os.path.join(self.directory, INDEX_NAME), 'w') as index:
+            index.write(''.join(label + '\n' for label in self.labels))
+
+
+class JSONExporter(Exporter):
+    """
+    Writes a loaddata fixture to `path`, gzipped if it ends with .gz.
+
+    """
+    def __init__(self, path, allocator=None):
+        super(JSONExporter, self).__init__(allocator)
+        if path.endswith('.gz'):
+            self.out = gzip.open(path, 'wb')
+        else:
+            self.out = open(path, 'wb')
+        self.out.write('[')
+        self.separator = ''
+
+    def write(self, model, instances):
+        names = [field.name for field in model._meta.local_fields if not field.primary_key]
+        for obj in serializers.serialize('python', instances, fields=names):
+            self.out.write(self.separator)
+            self.out.write(json.dumps(obj, cls=DjangoJSONEncoder, separators=(',', ':')))
+            self.separator = ',\n'
+
+    def close(self):
+        self.out.write(']\n')
+        self.out.close()
+
+
+def export_csv(mommy, qty, directory, chunk_size=1000, allocator=None, **attrs):
+    """
+    Writes `qty` instances prepared with mommy, and their parents, as gzipped
+    CSV files in directory. Returns the number of rows written.
+
+    """
+    exporter = CSVExporter(directory, allocator)
+    try:
+        return exporter.export(mommy, qty, chunk_size, **attrs)
+    finally:
+        exporter.close()
+
+
+def export_json(mommy, qty, path, chunk_size=1000, allocator=None, **attrs):
+    """
+    Writes `qty` instances prepared with mommy, and their parents, as a
+    loaddata fixture. Returns the number of rows written.
+
+    """
+    exporter = JSONExporter(path, allocator)
+    try:
+        return exporter.export(mommy, qty, chunk_size, **attrs)
+    finally:
+        exporter.close()
+
+
+def load_csv(directory, batch_size=BATCH_SIZE):
+    """
+    Inserts the tables written by CSVExporter, parents first, with one
+    executemany() per batch of rows. Returns the number of rows.
+
+    """
+    with open(os.path.join(directory, INDEX_NAME)) as index:
+        labels = index.read().split()
+
+    count = 0
+    models = []
+    cursor = connection.cursor()
+
+    for label in labels:
+        model = get_model(*label.split('.'))
+        models.append(model)
+        columns = dict((field.column, field) for field in model._meta.local_fields)
+
+        with gzip.open(os.path.join(directory, label + '.csv.gz'), 'rb') as source:
+            reader = csv.reader(source)
+            fields = [columns[name] for name in reader.next()]
+            sql = insert_sql(model, fields)
+
+            for batch in iter(lambda: list(islice(reader, batch_size)), []):
+                rows = [[field.get_db_prep_save(python_value(field, value), connection=connection)
+                    for field, value in zip(fields, row)] for row in batch]
+                cursor.executemany(sql, rows)
+                count += len(rows)
+
+    transaction.commit_unless_managed()
+    reset_sequences(models)
+    return count
@@ -0,0 +1,176 @@
+# -*- coding:utf-8 -*-
+
+__doc__ = '''
+Plans bulk writes of prepared instances and the unsaved related
+instances they hold.
+
+Instances are split in levels: instances with no unsaved parent first,
+then the instances whose parents are all in previous levels, and so on.
+Each level is written with one bulk insert per model, so the number of
+queries grows with the number of model types, not with the number of rows.
+Children are wired to their parents' keys before their level is written.
+
+Bulk inserts don't return primary keys on most backends, so keys of
+instances other rows point to are reserved beforehand with a key
+allocator, see model_mommy.keys. Sequences are reset afterwards.
+'''.strip()
+
+from django.db import connection
+from django.db.models import AutoField
+from django.db.models.fields.related import RelatedField
+
+from .keys import get_allocator
+
+
+def is_unsaved(instance):
+    """
+    Instances with a primary key are not necessarily written: the key may
+    be reserved, or not generated by the database at all. Their state tells.
+
+    """
+    return instance._state.adding
+
+
+def unsaved_parents(instance):
+    """
+    Yields (field, related instance) for every unsaved instance held by
+    the related fields of `instance`.
+
+    """
+    for field in instance._meta.fields:
+        if isinstance(field, RelatedField):
+            related = getattr(instance, field.get_cache_name(), None)
+            if related is not None and is_unsaved(related):
+                yield field, related
+
+
+def levels(instances):
+    """
+    Returns a list of levels for instances and their unsaved parents.
+    Each level is a list of (model, instances) pairs, in first seen order,
+    and depends only on the levels before it.
+
+    """
+    depths = {}  # id(instance) -> level
+    grouped = []  # level -> {model: instances}
+    models = []  # level -> models in first seen order
+
+    def depth(instance):
+        key = id(instance)
+        if key not in depths:
+            parents = [depth(related) for field, related in unsaved_parents(instance)]
+            level = depths[key] = parents and max(parents) + 1 or 0
+
+            while len(grouped) <= level:
+                grouped.append({})
+                models.append([])
+
+            model = instance.__class__
+            if model not in grouped[level]:
+                grouped[level][model] = []
+                models[level].append(model)
+            grouped[level][model].append(instance)
+        return depths[key]
+
+    for instance in instances:
+        depth(instance)
+
+    return [[(model, grouped[level][model]) for model in models[level]]
+        for level in range(len(grouped))]
+
+
+def referenced(instances):
+    """
+    Returns the ids of the unsaved instances that instances (and their
+    unsaved parents) point to.
+
+    """
+    rt = set()
+    pending = list(instances)
+
+    while pending:
+        for field, related in unsaved_parents(pending.pop()):
+            if id(related) not in rt:
+                rt.add(id(related))
+                pending.append(related)
+    return rt
+
+
+def wire(instances):
+    """
+    Copies the keys of saved parents to the foreign keys of instances.
+
+    """
+    for instance in instances:
+        for field in instance._meta.fields:
+            if isinstance(field, RelatedField):
+                related = getattr(instance, field.get_cache_name(), None)
+                if related is not None and getattr(instance, field.attname) != related.pk:
+                    setattr(instance, field.name, related)
+
+
+def can_bulk_insert(model):
+    """
+    Multi-table inherited models can't be written with bulk inserts.
+
+    """
+    return not model._meta.parents
+
+
+def returns_bulk_pks():
+    return getattr(connection.features, 'can_return_ids_from_bulk_insert', False)
+
+
+def can_reserve_pks(model):
+    return isinstance(model._meta.pk, AutoField)
+
+
+def reserve_pks(model, instances, allocator=None):
+    """
+    Sets primary keys reserved by `allocator` (the default allocator of
+    the backend if None) on instances, and flags them as reserved until
+    they are written.
+
+    """
+    if not instances:
+        return
+
+    attname = model._meta.pk.attname
+    keys = get_allocator(allocator).reserve(model, len(instances))
+    for instance, key in zip(instances, keys):
+        setattr(instance, attname, key)
+        instance._state.reserved_pk = True
+
+
+def reserve_graph(instances, allocator=None):
+    """
+    Reserves primary keys for prepared instances and their unsaved parents,
+    and wires the foreign keys to them, so the rows can be written in any
+    order (or outside of this process). Returns the models with reserved
+    keys.
+
+    """
+    models = []
+    for level in levels(instances):
+        for model, group in level:
+            wire(group)
+            if not can_reserve_pks(model):
+                continue
+            pending = [instance for instance in group if instance.pk is None]
+            reserve_pks(model, pending, allocator)
+            if pending and model not in models:
+                models.append(model)
+    return models
+
+
+def mark_saved(model, instances):
+    """
+    Flags bulk inserted instances as saved to the model's database, like
+    save() does. Bulk inserts leave them flagged as new.
+
+    """
+    using = model._default_manager.db
+    for instance in instances:
+        instance._state.db = using
+        instance._state.adding = False
+        instance._state.reserved_pk = False
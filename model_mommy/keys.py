@@ -0,0 +1,167 @@
+# -*- coding:utf-8 -*-
+
+__doc__ = '''
+Primary key allocators.
+
+Bulk inserts don't return primary keys on most backends, so rows other
+rows point to get their keys before they are written. An allocator hands
+out blocks of keys for a model:
+
+ * MaxKeyAllocator reads the max key of the table under a lock, and keeps
+   a high-water mark so keys reserved but not written yet are not handed
+   out twice in this process.
+ * SequenceAllocator draws keys from the PostgreSQL sequence of the table,
+   which is safe with concurrent writers.
+ * CounterAllocator counts from a start value, without any query. For rows
+   written somewhere else, like fixture files.
+ * CallableAllocator wraps a callable(model, count) returning the keys.
+
+Allocators are told when rows with reserved keys were written, so that
+table sequences can be moved past them.
+'''.strip()
+
+import threading
+from itertools import count as counter, islice
+
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+
+
+def reset_sequences(models):
+    """
+    Moves the sequences of models past the max key of their tables.
+
+    """
+    statements = connection.ops.sequence_reset_sql(no_style(), list(models))
+    if statements:
+        cursor = connection.cursor()
+        for sql in statements:
+            cursor.execute(sql)
+        transaction.commit_unless_managed()
+
+
+class KeyAllocator(object):
+    """
+    Base class of allocators. Subclasses implement reserve().
+
+    """
+    def reserve(self, model, count):
+        """
+        Returns a list of `count` unused primary keys for model.
+
+        """
+        raise NotImplementedError
+
+    def written(self, models):
+        """
+        Called once rows of models were written with reserved keys.
+
+        """
+        reset_sequences(models)
+
+
+class MaxKeyAllocator(KeyAllocator):
+    """
+    Reserves the keys that follow the max key of the table, or of the keys
+    reserved before, whatever is bigger. Rows written by other processes
+    between a reservation and the insert will collide.
+
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reserved = {}  # (database, model) -> last reserved key
+
+    def reserve(self, model, count):
+        manager = model._default_manager
+        key = (manager.db, model)
+
+        with self.lock:
+            last = manager.aggregate(last=Max(model._meta.pk.attname))['last'] or 0
+            last = max(last, self.reserved.get(key, 0))
+            self.reserved[key] = last + count
+        # the last reserved key is kept: other reservations may not be
+        # written yet when these are
+        return range(last + 1, last + count + 1)
+
+
+class SequenceAllocator(KeyAllocator):
+    """
+    Draws keys from the sequence of the table with a single query, in
+    PostgreSQL. Sequences are never moved back, so nothing is done once
+    rows are written.
+
+    """
+    def reserve(self, model, count):
+        cursor = connection.cursor()
+        cursor.execute('SELECT nextval(pg_get_serial_sequence(%s, %s)) '
+            'FROM generate_series(1, %s)', [model._meta.db_table, model._meta.pk.column, count])
+        return [row[0] for row in cursor.fetchall()]
+
+    def written(self, models):
+        pass
+
+
+class CounterAllocator(KeyAllocator):
+    """
+    Counts keys from `start` for every model, without touching the database.
+
+    """
+    def __init__(self, start=1):
+        self.start = start
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def reserve(self, model, count):
+        with self.lock:
+            keys = self.counters.setdefault(model, counter(self.start))
+            return list(islice(keys, count))
+
+
+class CallableAllocator(KeyAllocator):
+    """
+    Asks `func(model, count)` for keys.
+
+    """
+    def __init__(self, func):
+        self.func = func
+
+    def reserve(self, model, count):
+        keys = list(self.func(model, count))
+        if len(keys) != count:
+            raise ValueError('%s returned %d keys instead of %d' % (
+                self.func.__name__, len(keys), count))
+        return keys
+
+
+_default_allocators = {}
+
+
+def default_allocator():
+    """
+    Returns the shared allocator for the database backend: the sequence
+    allocator for PostgreSQL, the max key allocator otherwise.
+
+    """
+    vendor = connection.vendor
+    if vendor not in _default_allocators:
+        if vendor == 'postgresql':
+            _default_allocators[vendor] = SequenceAllocator()
+        else:
+            _default_allocators[vendor] = MaxKeyAllocator()
+    return _default_allocators[vendor]
+
+
+def get_allocator(allocator=None):
+    """
+    Returns an allocator for `allocator`: an allocator, a callable or None
+    (or True) for the default one.
+
+    """
+    if allocator is None or allocator is True:
+        return default_allocator()
+    elif isinstance(allocator, KeyAllocator):
+        return allocator
+    elif callable(allocator):
+        return CallableAllocator(allocator)
+    raise TypeError('%r is not a key allocator' % (allocator,))
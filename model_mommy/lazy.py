@@ -0,0 +1,125 @@
+# -*- coding:utf-8 -*-
+
+__doc__ = '''
+Lazy prepared instances: fields are generated the first time they are
+read, so tests pay only for the attributes they touch.
+
+A lazy instance is an instance of a subclass of its model, built without
+the model metaclass (so nothing is registered), whose __getattr__ fills
+pending fields on access. save() and pickling generate every pending
+field first and give the instance back its model class, so signals and
+saved rows are the same as for eager instances. Fields with a descriptor
+on the model class, like file fields, are generated right away. Values
+are generated in access order, so seeded lazy instances don't get the
+same values as eager ones.
+'''.strip()
+
+from django.db.models.fields.related import RelatedField
+
+__all__ = ['make_lazy', 'materialize', 'is_lazy']
+
+_lazy_classes = {}  # model -> lazy subclass
+
+
+def _getattr(self, name):
+    pending = self.__dict__.get('_lazy_fields')
+    if not pending or name not in pending:
+        raise AttributeError('%r object has no attribute %r' % (
+            self.__class__.__name__, name))
+
+    _generate(self, *pending[name])
+    return getattr(self, name)
+
+
+def _generate(instance, field, generate):
+    pending = instance.__dict__['_lazy_fields']
+    pending.pop(field.attname, None)
+    if isinstance(field, RelatedField):
+        pending.pop(field.get_cache_name(), None)
+
+    setattr(instance, field.name, generate(instance.__dict__['_lazy_mommy'], field))
+
+
+def _save(self, *args, **kwargs):
+    materialize(self)
+    return self.save(*args, **kwargs)
+
+
+def _reduce(self):
+    materialize(self)
+    return self.__reduce__()
+
+
+def lazy_class(model):
+    """
+    Returns the lazy subclass of model. It is built with type.__new__, so
+    the model metaclass doesn't register it as a new model.
+
+    """
+    if model not in _lazy_classes:
+        _lazy_classes[model] = type.__new__(type(model), 'Lazy' + model.__name__, (model,), {
+            '__module__': model.__module__,
+            '__getattr__': _getattr,
+            '__reduce__': _reduce,
+            'save': _save,
+        })
+    return _lazy_classes[model]
+
+
+def has_descriptor(model, field):
+    """
+    Descriptors set on the model class for a field attribute, like the
+    FileDescriptor of file fields, read the instance __dict__ directly:
+    __getattr__ is never called for them, so they can't be lazy.
+
+    """
+    return any(field.attname in cls.__dict__ for cls in model.__mro__)
+
+
+def is_lazy(instance):
+    return '_lazy_fields' in instance.__dict__
+
+
+def make_lazy(instance, mommy, pending):
+    """
+    Turns instance lazy: the fields of `pending`, a list of (field,
+    generate) pairs, are generated with generate(mommy, field) on first
+    access.
+
+    """
+    values = instance.__dict__
+    lazy = {}
+    for field, generate in pending:
+        if has_descriptor(instance.__class__, field):
+            setattr(instance, field.name, generate(mommy, field))
+            continue
+
+        values.pop(field.attname, None)
+        lazy[field.attname] = field, generate
+        if isinstance(field, RelatedField):
+            lazy[field.get_cache_name()] = field, generate
+
+    values['_lazy_mommy'] = mommy
+    values['_lazy_fields'] = lazy
+    instance.__class__ = lazy_class(instance.__class__)
+    return instance
+
+
+def materialize(instance):
+    """
+    Generates every pending field of a lazy instance and gives it back its
+    model class. Does nothing for other instances.
+
+    """
+    if not is_lazy(instance):
+        return instance
+
+    pending = instance.__dict__['_lazy_fields']
+    for field in instance._meta.fields:
+        if field.attname in pending:
+            _generate(instance, *pending[field.attname])
+
+    del instance.__dict__['_lazy_fields']
+    del instance.__dict__['_lazy_mommy']
+    instance.__class__ = instance.__class__.__bases__[0]
+    return instance
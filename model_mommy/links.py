@@ -0,0 +1,84 @@
+# -*- coding:utf-8 -*-
+
+__doc__ = '''
+Many-to-many links written straight into the through table.
+
+Links of a batch of instances are turned into through model rows and
+written with a single bulk insert per field, instead of one add() per
+instance. Symmetrical relations get their mirrored rows too.
+'''.strip()
+
+import random
+
+from .distributions import Distribution, Uniform
+from .strings import _random_indexes
+
+
+def through_fields(field):
+    """
+    Returns (through model, source key attname, target key attname) of a
+    m2m field. Through models declared by hand may hold other required
+    columns, so they are refused.
+
+    """
+    through = field.rel.through
+    if not through._meta.auto_created:
+        raise ValueError('%s links can\'t be bulk inserted: %s is not an auto '
+            'created through model' % (field.name, through.__name__))
+
+    source = through._meta.get_field(field.m2m_field_name()).attname
+    target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+    return through, source, target
+
+
+def link_rows(field, pairs):
+    """
+    Returns the through model rows for (source pk, target pk) pairs,
+    without duplicates.
+
+    """
+    through, source, target = through_fields(field)
+
+    pairs = set(pairs)
+    if field.rel.symmetrical and field.rel.to == field.model:
+        pairs.update([(b, a) for a, b in pairs])
+
+    return [through(**{source: a, target: b}) for a, b in sorted(pairs)]
+
+
+def fan_out(rng, spec, qty):
+    """
+    Returns how many links each of `qty` instances gets.
+
+    Keyword arguments:
+    spec -- a number of links, a (min, max) tuple or a Distribution
+
+    """
+    if isinstance(spec, (int, long)):
+        counts = [spec] * qty
+    elif isinstance(spec, tuple):
+        counts = Uniform(*spec).draw(rng, qty)
+    elif isinstance(spec, Distribution):
+        counts = spec.draw(rng, qty)
+    else:
+        raise TypeError('fan out must be a number, a (min, max) tuple or a '
+            'Distribution, not %r' % (spec,))
+    return [max(0, int(round(count))) for count in counts]
+
+
+def sample_distinct(population, k, rng=random):
+    """
+    Returns `k` distinct members of population (all of them if there are
+    not enough). Small samples are drawn in batches.
+
+    """
+    size = len(population)
+    if k >= size:
+        return list(population)
+    elif k * 4 > size:
+        return rng.sample(population, k)
+
+    chosen = set()
+    while len(chosen) < k:
+        chosen.update(_random_indexes(k - len(chosen), size, rng))
+    return map(population.__getitem__, sorted(chosen))
@@ -1,6 +1,21 @@
 # -*- coding:utf-8 -*-
 
 from .base import Mommy
+from . import export, pool
+
+
+def _mommy(model, attrs):
+    """
+    Pops Mommy options (fill_null, seed, minimal, preload_unique) from
+    attrs and returns a Mommy for model.
+
+    """
+    fill_null = attrs.pop('fill_null', None)
+    seed = attrs.pop('seed', None)
+    minimal = attrs.pop('minimal', None)
+    preload_unique = attrs.pop('preload_unique', None)
+    return Mommy(model, fill_null=fill_null, seed=seed, minimal=minimal,
+        preload_unique=preload_unique)
 
 
 def make_one(model, **attrs):
@@ -13,13 +28,15 @@ def make_one(model, **attrs):
     Keyword arguments:
     fill_null -- set to True and no field shall be null. Set to false for
     otherwise. Do not set and some null fields will be null, some won't.
+    seed -- seed for the random generator. The same seed always generates
+    the same values.
+    minimal -- generate only the fields the database requires, others get
+    their default.
+    preload_unique -- load the unique values already in the database first,
+    so generated ones don't collide with them.
 
     """
-    fill_null = None
-    if 'fill_null' in attrs:
-        fill_null = attrs.pop('fill_null')
-
-    mommy = Mommy(model, fill_null=fill_null)
+    mommy = _mommy(model, attrs)
     return mommy.make(**attrs)
 
 
@@ -34,19 +51,23 @@ def prepare_one(model, **attrs):
     Keyword arguments:
     fill_null -- set to True and no field shall be null. Set to false for
     otherwise. Do not set and some null fields will be null, some won't.
+    seed -- seed for the random generator. The same seed always generates
+    the same values.
+    minimal -- generate only the fields the database requires, others get
+    their default.
+    preload_unique -- load the unique values already in the database first,
+    so generated ones don't collide with them.
+    lazy -- generate fields the first time they are read (and all of them
+    before the instance is saved) instead of right away.
 
     """
-    fill_null = None
-    if 'fill_null' in attrs:
-        fill_null = attrs.pop('fill_null')
-
-    mommy = Mommy(model, fill_null=fill_null)
+    mommy = _mommy(model, attrs)
     return mommy.prepare(**attrs)
 
 
 def make_many(model, qty=5, **attrs):
     """
-    Thin wrapper around make_one. Makes a list of model instances.
+    Makes a list of persisted model instances.
 
     Fields from the model instance are filled with random valid data
     according with each type.
@@ -54,16 +75,55 @@ def make_many(model, qty=5, **attrs):
     Keyword arguments:
     fill_null -- set to True and no field shall be null. Set to false for
     otherwise. Do not set and some null fields will be null, some won't.
+    seed -- seed for the random generator. The same seed always generates
+    the same values.
+    minimal -- generate only the fields the database requires, others get
+    their default.
+    preload_unique -- load the unique values already in the database first,
+    so generated ones don't collide with them.
     qty -- how many instances you want.
+    bulk -- set to True to write all instances with batched multi-row
+    inserts instead of one INSERT per instance.
+    batch_size -- max number of rows per INSERT in bulk mode.
+    workers -- generate instances in this many processes.
+    cache -- True or a directory to cache the rows on disk. Requires seed.
+    parents -- dict of related field name -> number of parents shared by
+    the instances, e.g. parents={'owner': 100}.
+    reuse_existing -- assign required foreign keys from existing rows.
+    distributions -- dict of field name -> Distribution the field values
+    (or parents, for pooled fields) are drawn with.
+    m2m -- dict of m2m field name -> how many rows each instance is linked
+    to: a number, a (min, max) tuple or a Distribution.
+    pipeline -- bulk write batches while the next ones are generated in a
+    thread. True, or how many generated batches may wait to be written.
+    progress -- called with the pipeline Throughput after each batch.
+    threads -- make and write instances in this many threads, each with its
+    own database connection. Results are reproducible for a given seed
+    whatever the number of threads.
 
     """
-    return [make_one(model, **attrs) for i in range(qty)]
+    mommy = _mommy(model, attrs)
+    bulk = attrs.pop('bulk', False)
+    batch_size = attrs.pop('batch_size', None)
+    workers = attrs.pop('workers', None)
+    cache = attrs.pop('cache', None)
+    parents = attrs.pop('parents', None)
+    reuse_existing = attrs.pop('reuse_existing', False)
+    distributions = attrs.pop('distributions', None)
+    m2m = attrs.pop('m2m', None)
+    pipeline = attrs.pop('pipeline', None)
+    progress = attrs.pop('progress', None)
+    threads = attrs.pop('threads', None)
+
+    return mommy.make_many(qty, bulk=bulk, batch_size=batch_size, workers=workers,
+        cache=cache, parents=parents, reuse_existing=reuse_existing,
+        distributions=distributions, m2m=m2m, pipeline=pipeline, progress=progress,
+        threads=threads, **attrs)
 
 
 def prepare_many(model, qty=5, **attrs):
     """
-    Thin wrapper around prepare_one. Makes a list of model instances,
-    but do not persist any.
+    Makes a list of model instances, but do not persist any.
 
     Fields from the model instance are filled with random valid data
     according with each type.
@@ -71,10 +131,213 @@ def prepare_many(model, qty=5, **attrs):
     Keyword arguments:
     fill_null -- set to True and no field shall be null. Set to false for
     otherwise. Do not set and some null fields will be null, some won't.
+    seed -- seed for the random generator. The same seed always generates
+    the same values.
+    minimal -- generate only the fields the database requires, others get
+    their default.
+    preload_unique -- load the unique values already in the database first,
+    so generated ones don't collide with them.
+    qty -- how many instances you want.
+    workers -- split the work across this many processes. Results are
+    reproducible for a given seed whatever the number of workers.
+    parents -- dict of related field name -> number of parents shared by
+    the instances, e.g. parents={'owner': 100}.
+    reuse_existing -- assign required foreign keys from existing rows.
+    distributions -- dict of field name -> Distribution the field values
+    (or parents, for pooled fields) are drawn with.
+    reserve_pks -- reserve primary keys for the instances and their parents
+    up front. True for the default allocator, or a key allocator or a
+    callable(model, count), see model_mommy.keys.
+    clone -- prepare one instance and shallow copies of it, generating
+    again only unique fields, drawn fields and the fields named in clone
+    (a list of names, or True for none).
+
+    """
+    mommy = _mommy(model, attrs)
+    workers = attrs.pop('workers', None)
+    parents = attrs.pop('parents', None)
+    reuse_existing = attrs.pop('reuse_existing', False)
+    distributions = attrs.pop('distributions', None)
+    reserve_pks = attrs.pop('reserve_pks', False)
+    clone = attrs.pop('clone', None)
+    return mommy.prepare_many(qty, workers=workers, parents=parents,
+        reuse_existing=reuse_existing, distributions=distributions,
+        reserve_pks=reserve_pks, clone=clone, **attrs)
+
+
+def make_raw(model, qty=5, **attrs):
+    """
+    Writes rows of model with batched executemany() calls, without building
+    model instances, save() or signals. Returns the number of rows.
+
+    Keyword arguments:
+    fill_null -- set to True and no field shall be null. Set to false for
+    otherwise. Do not set and some null fields will be null, some won't.
+    seed -- seed for the random generator. The same seed always generates
+    the same values.
+    minimal -- generate only the fields the database requires, others get
+    their default.
+    preload_unique -- load the unique values already in the database first,
+    so generated ones don't collide with them.
+    qty -- how many rows you want.
+    batch_size -- how many rows are generated and written at once.
+    parents -- dict of related field name -> number of parents shared by
+    the rows.
+    reuse_existing -- pick required foreign keys from existing rows (the
+    default).
+    distributions -- dict of field name -> Distribution the field values
+    (or parents, for pooled fields) are drawn with.
+
+    """
+    mommy = _mommy(model, attrs)
+    return mommy.make_raw(qty, **attrs)
+
+
+def prepare_columns(model, qty=5, **attrs):
+    """
+    Generates rows of model as columns, without building model instances.
+    Returns a model_mommy.columns.Columns, which can be written as CSV.
+
+    Keyword arguments:
+    fill_null -- set to True and no field shall be null. Set to false for
+    otherwise. Do not set and some null fields will be null, some won't.
+    seed -- seed for the random generator. The same seed always generates
+    the same values.
+    minimal -- generate only the fields the database requires, others get
+    their default.
+    preload_unique -- load the unique values already in the database first,
+    so generated ones don't collide with them.
+    qty -- how many rows you want.
+    batch_size -- how many rows are generated at once.
+    parents -- dict of related field name -> number of parents, made in the
+    database and shared by the rows.
+    reuse_existing -- pick required foreign keys from existing rows (the
+    default).
+    distributions -- dict of field name -> Distribution the field values
+    (or parents, for pooled fields) are drawn with.
+
+    """
+    mommy = _mommy(model, attrs)
+    return mommy.prepare_columns(qty, **attrs)
+
+
+def export_csv(model, qty, directory, **attrs):
+    """
+    Writes generated instances of model, and the related instances they
+    need, as a gzipped CSV file per table in directory, a chunk at a time.
+    Restore them with model_mommy.export.load_csv. Returns the number of rows.
+
+    Keyword arguments:
+    fill_null -- set to True and no field shall be null. Set to false for
+    otherwise. Do not set and some null fields will be null, some won't.
+    seed -- seed for the random generator. The same seed always generates
+    the same values.
+    minimal -- generate only the fields the database requires, others get
+    their default.
+    preload_unique -- load the unique values already in the database first,
+    so generated ones don't collide with them.
     qty -- how many instances you want.
+    chunk_size -- how many instances are held in memory at once.
+    allocator -- primary key allocator, keys count from 1 by default.
+
+    """
+    mommy = _mommy(model, attrs)
+    return export.export_csv(mommy, qty, directory, **attrs)
+
 
+def export_json(model, qty, path, **attrs):
     """
-    return [prepare_one(model, **attrs) for i in range(qty)]
+    Same as export_csv, but writes a loaddata fixture to path (gzipped if
+    it ends with .gz).
+
+    """
+    mommy = _mommy(model, attrs)
+    return export.export_json(mommy, qty, path, **attrs)
+
+
+def amake_one(model, callback=None, **attrs):
+    """
+    Same as make_one, run in the mommy thread pool. Returns an AsyncResult
+    right away, see model_mommy.pool.
+
+    Keyword arguments:
+    callback -- if provided, called with the instance from a pool thread.
+
+    """
+    return pool.submit(make_one, (model,), attrs, callback)
+
+
+def amake_many(model, qty=5, callback=None, **attrs):
+    """
+    Same as make_many, run in the mommy thread pool. Returns an AsyncResult
+    right away, see model_mommy.pool.
+
+    Keyword arguments:
+    callback -- if provided, called with the instances from a pool thread.
+
+    """
+    return pool.submit(make_many, (model, qty), attrs, callback)
+
+
+def aprepare_many(model, qty=5, callback=None, **attrs):
+    """
+    Same as prepare_many, run in the mommy thread pool. Returns an
+    AsyncResult right away, see model_mommy.pool.
+
+    Keyword arguments:
+    callback -- if provided, called with the instances from a pool thread.
+
+    """
+    return pool.submit(prepare_many, (model, qty), attrs, callback)
+
+
+def iter_make(model, qty=5, chunk_size=1000, callback=None, **attrs):
+    """
+    Lazily makes persisted model instances. Instances are written with one
+    bulk insert per chunk, so memory use is bound by chunk_size, not qty.
+    They get their primary keys, like make_many's.
+
+    Keyword arguments:
+    fill_null -- set to True and no field shall be null. Set to false for
+    otherwise. Do not set and some null fields will be null, some won't.
+    seed -- seed for the random generator. The same seed always generates
+    the same values.
+    minimal -- generate only the fields the database requires, others get
+    their default.
+    preload_unique -- load the unique values already in the database first,
+    so generated ones don't collide with them.
+    qty -- how many instances you want.
+    chunk_size -- how many instances are generated and written at once.
+    callback -- called with the list of instances of each written chunk.
+    pipeline -- generate the next chunks in a thread while the current one is
+    written. True, or how many generated chunks may wait to be written.
+    progress -- called with the pipeline Throughput after each chunk.
+
+    """
+    mommy = _mommy(model, attrs)
+    return mommy.iter_make(qty, chunk_size, callback, **attrs)
+
+
+def iter_prepare(model, qty=5, chunk_size=1000, callback=None, **attrs):
+    """
+    Lazily makes model instances, but do not persist any.
+
+    Keyword arguments:
+    fill_null -- set to True and no field shall be null. Set to false for
+    otherwise. Do not set and some null fields will be null, some won't.
+    seed -- seed for the random generator. The same seed always generates
+    the same values.
+    minimal -- generate only the fields the database requires, others get
+    their default.
+    preload_unique -- load the unique values already in the database first,
+    so generated ones don't collide with them.
+    qty -- how many instances you want.
+    chunk_size -- how many instances are generated at once.
+    callback -- called with the list of instances of each chunk.
+
+    """
+    mommy = _mommy(model, attrs)
+    return mommy.iter_prepare(qty, chunk_size, callback, **attrs)
 
 
 def make_attrs(model, **attrs):
@@ -85,11 +348,13 @@ def make_attrs(model, **attrs):
     Keyword arguments:
     fill_null -- set to True and no field shall be null. Set to false for
     otherwise. Do not set and some null fields will be null, some won't.
+    seed -- seed for the random generator. The same seed always generates
+    the same values.
+    minimal -- generate only the fields the database requires, others get
+    their default.
+    preload_unique -- load the unique values already in the database first,
+    so generated ones don't collide with them.
 
     """
-    fill_null = None
-    if 'fill_null' in attrs:
-        fill_null = attrs.pop('fill_null')
-
-    mommy = Mommy(model, fill_null)
+    mommy = _mommy(model, attrs)
     return mommy.attrs(True, **attrs)
\ No newline at end of file
@@ -0,0 +1,187 @@
+# -*- coding:utf-8 -*-
+
+__doc__ = '''
+Hostname, e-mail and url generators. Every function builds its values in
+linear time and has a batch version producing N values at once. All of
+them draw from `rng`, the global random generator by default.
+'''.strip()
+
+import re
+import random
+
+from .constants import HOSTNAME_TABLE, HOSTNAME_INNER_TABLE
+from .constants import EMAIL_LOCALPART_TABLE, EMAIL_LOCALPART_INNER_TABLE
+from .strings import random_text, random_texts
+
+# dots that can't stay in a localpart: leading, trailing or repeated
+_bad_dots = re.compile(r'^\.|\.$|(?<=\.)\.')
+
+
+def raw_hostname_label(length, rng=random):
+    """
+    Creates a hostname label.
+
+    Keyword arguments:
+    length -- length for the new hostname label
+
+    """
+    return raw_hostname_labels([length], rng)[0]
+
+
+def raw_hostname_labels(lengths, rng=random):
+    """
+    Creates one hostname label for each length in `lengths`.
+
+    """
+    for length in lengths:
+        assert length > 0, 'provided length for hostname is too small. min is 1'
+        assert length < 64, 'provided length for hostname is too big. max is 63'
+
+    # labels can't start nor end with an hyphen
+    edges = random_text(2 * len(lengths), HOSTNAME_TABLE, rng)
+    inners = random_texts([max(length - 2, 0) for length in lengths], HOSTNAME_INNER_TABLE, rng)
+
+    labels = []
+    for i, length in enumerate(lengths):
+        if length == 1:
+            labels.append(edges[2 * i])
+        else:
+            labels.append(edges[2 * i] + inners[i] + edges[2 * i + 1])
+    return labels
+
+
+def raw_hostname(apr_length, ext_list=None, rng=random):
+    """
+    Creates a random valid hostname.
+    (a domain name is a hostname with an associated ip address)
+
+    Keyword arguments:
+    apr_length -- approximate length for new hostname (length is never bigger than apr_length)
+    ext_list -- if provided, domain ext will belong to this list.
+
+    ref: http://en.wikipedia.org/wiki/Hostname
+    ref: http://en.wikipedia.org/wiki/Domain_Name
+
+    """
+    return raw_hostnames([apr_length], ext_list, rng)[0]
+
+
+def raw_hostnames(apr_lengths, ext_list=None, rng=random):
+    """
+    Creates one random valid hostname for each approximate length
+    in `apr_lengths`. See raw_hostname.
+
+    """
+    if ext_list is not None:
+        max_ext_length = max(map(len, ext_list))
+
+    exts = []
+    label_lengths = []  # label lengths of each hostname, last label first
+
+    for apr_length in apr_lengths:
+        assert apr_length > 0, 'length is too short'
+        assert apr_length < 256, 'length is too big'
+
+        if ext_list is not None:
+            assert max_ext_length < apr_length,\
+            'length must be bigger than any provided extension'
+
+        ext = ext_list and rng.choice(ext_list) or ''
+        ext = ext.startswith('.') and ext[1:] or ext
+        exts.append(ext)
+
+        lengths = []
+        used = ext and len(ext) + 1 or 0  # labels plus separating dots
+        while used < apr_length:
+            length = rng.randint(1, min(63, apr_length - used))
+            lengths.append(length)
+            used += length + 1
+        label_lengths.append(lengths)
+
+    labels = iter(raw_hostname_labels([l for lengths in label_lengths for l in lengths], rng))
+
+    hostnames = []
+    for ext, lengths in zip(exts, label_lengths):
+        hostname = [labels.next() for length in lengths]
+        hostname.reverse()
+
+        if ext:
+            hostname.append(ext)
+        hostnames.append('.'.join(hostname))
+    return hostnames
+
+
+def raw_email_localpart(length, rng=random):
+    """
+    Creates the localpart for an e-mail.
+
+    ref: http://en.wikipedia.org/wiki/Email_address
+
+    """
+    return raw_email_localparts([length], rng)[0]
+
+
+def raw_email_localparts(lengths, rng=random):
+    """
+    Creates one e-mail localpart for each length in `lengths`.
+
+    """
+    # dots are drawn like any other char, then the ones not allowed
+    # (leading, trailing or repeated) are replaced in a single pass
+    localparts = random_texts(lengths, EMAIL_LOCALPART_INNER_TABLE, rng)
+    replace = lambda match: rng.choice(EMAIL_LOCALPART_TABLE)
+
+    for i, localpart in enumerate(localparts):
+        if '.' in localpart:
+            localparts[i] = _bad_dots.sub(replace, localpart)
+    return localparts
+
+
+def raw_email(max_length, rng=random):
+    """
+    Creates a random e-mail no longer than `max_length`.
+
+    ref: http://en.wikipedia.org/wiki/Email_address
+
+    """
+    return raw_emails(1, max_length, rng)[0]
+
+
+def raw_emails(qty, max_length, rng=random):
+    """
+    Creates `qty` random e-mails no longer than `max_length`.
+
+    """
+    assert max_length >= 3, 'max_length for emailfield is too short'
+
+    max_length -= 1  # @
+    local_part_lengths = []
+    domain_part_lengths = []
+
+    for i in range(qty):
+        local_part_length = rng.randint(1, max_length - 1)  # make sure local part < max_length
+        local_part_lengths.append(local_part_length)
+        domain_part_lengths.append(rng.randint(1, max_length - local_part_length))
+
+    local_parts = raw_email_localparts(local_part_lengths, rng)
+    domain_parts = raw_hostnames(domain_part_lengths, rng=rng)
+    return [u"%s@%s" % parts for parts in zip(local_parts, domain_parts)]
+
+
+def raw_url(max_length, rng=random):
+    """
+    Creates a random url, without parameters, no longer than `max_length`.
+
+    """
+    return raw_urls(1, max_length, rng)[0]
+
+
+def raw_urls(qty, max_length, rng=random):
+    """
+    Creates `qty` random urls no longer than `max_length`.
+
+    """
+    assert max_length > 8, 'informed max_length for url is too small'
+
+    hostnames = raw_hostnames([rng.randint(1, max_length - 7) for i in range(qty)], rng=rng)
+    return ["http://%s" % hostname for hostname in hostnames]
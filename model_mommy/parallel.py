@@ -0,0 +1,88 @@
+# -*- coding:utf-8 -*-
+
+__doc__ = '''
+Splits big prepare_many requests across a pool of worker processes.
+
+Work is cut in chunks of a fixed size and every chunk is generated by its
+own Mommy, seeded from the parent seed and the chunk position. The output
+for a given seed and chunk_size is the same whatever the number of workers.
+'''.strip()
+
+from multiprocessing import Pool
+
+from .utils import chunks
+
+PARALLEL_CHUNK_SIZE = 1000
+
+
+def chunk_seeds(rng, count):
+    """
+    Draws one seed per chunk from `rng`.
+
+    """
+    return [rng.getrandbits(64) for i in xrange(count)]
+
+
+def partition(mommy, qty, chunk_size=PARALLEL_CHUNK_SIZE):
+    """
+    Returns one (seed, qty) pair per chunk of work for `mommy`. Seeds
+    are drawn from mommy's random generator, so seeded mommies always
+    partition the same way.
+
+    """
+    sizes = list(chunks(qty, chunk_size))
+    return zip(chunk_seeds(mommy.rng, len(sizes)), sizes)
+
+
+def prepare_chunk(args):
+    """
+    Prepares a chunk of instances with a fresh Mommy. Runs in a worker
+    process, so it must be a module level function. Returns the instances
+    and the observer copy that saw them generated.
+
+    """
+    mommy_class, model, fill_null, minimal, seeded, seed, qty, unique_values, observer, \
+        attrs = args
+    mommy = mommy_class(model, fill_null=fill_null, seed=seed, minimal=minimal,
+        preload_unique=False)
+    if not seeded:
+        # the chunk seed only drives the random generator, the clock stays real
+        mommy.seed = None
+    mommy.unique_values = unique_values
+    mommy.observer = observer
+    return mommy.prepare_many(qty, **attrs), observer
+
+
+def parallel_prepare(mommy, qty, workers, chunk_size=PARALLEL_CHUNK_SIZE, **attrs):
+    """
+    Prepares `qty` instances with mommy's class and model in `workers`
+    processes, returning them in chunk order. Mommy subclasses and attrs
+    must be picklable.
+
+    Workers start from a copy of mommy's unique values, load them first if
+    mommy.preload_unique, since workers don't query the database. They
+    report to copies of mommy's observer, merged back into it afterwards:
+    observers used with workers need a merge(other) method.
+
+    """
+    observer = mommy.observer
+    if observer is not None and not hasattr(observer, 'merge'):
+        raise ValueError('%s can\'t observe worker processes, it has no merge() '
+            'method' % observer.__class__.__name__)
+
+    seeded = mommy.seed is not None
+    unique_values = mommy.unique_values
+    tasks = [(mommy.__class__, mommy.model, mommy.fill_null, mommy.minimal, seeded, seed,
+        size, unique_values, observer, attrs) for seed, size in partition(mommy, qty, chunk_size)]
+
+    pool = Pool(workers)
+    try:
+        results = pool.map(prepare_chunk, tasks, 1)
+    finally:
+        pool.close()
+        pool.join()
+
+    if observer is not None:
+        for chunk, chunk_observer in results:
+            observer.merge(chunk_observer)
+    return [instance for chunk, chunk_observer in results for instance in chunk]
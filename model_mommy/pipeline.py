@@ -0,0 +1,133 @@
+# -*- coding:utf-8 -*-
+
+__doc__ = '''
+Pipelined bulk writes: batches are generated in a thread while the
+previous ones are written, so generation and the database work at the
+same time instead of taking turns.
+
+The generator thread fills a bounded queue and blocks when it is full,
+so at most `depth` batches wait in memory. The writer runs in the calling
+thread, which owns the database connection. Throughput tells where the
+time went: if the generator mostly waits for room in the queue, the
+database is the bottleneck; if the writer mostly waits for batches,
+generation is.
+'''.strip()
+
+import sys
+import threading
+from Queue import Queue, Full
+from timeit import default_timer as timer
+
+__all__ = ['Throughput', 'pipelined']
+
+DEFAULT_DEPTH = 2
+_POLL_SECONDS = 0.1
+
+_DONE = object()
+
+
+class Throughput(object):
+    """
+    Running statistics of a pipeline.
+
+    """
+    def __init__(self):
+        self.rows = 0
+        self.batches = 0
+        self.generate_seconds = 0.0  # generating batches
+        self.write_seconds = 0.0  # writing batches
+        self.generator_waits = 0.0  # generator blocked on a full queue
+        self.writer_waits = 0.0  # writer waiting for a batch
+        self.started = timer()
+
+    @property
+    def seconds(self):
+        return timer() - self.started
+
+    @property
+    def rows_per_second(self):
+        seconds = self.seconds
+        return seconds and self.rows / seconds or 0.0
+
+    @property
+    def bottleneck(self):
+        if self.generator_waits > self.writer_waits:
+            return 'database'
+        return 'generation'
+
+    def __repr__(self):
+        return ('<Throughput: %d rows in %d batches, %.1f rows/s, generate %.3fs, '
+            'write %.3fs, bottleneck %s>' % (self.rows, self.batches,
+            self.rows_per_second, self.generate_seconds, self.write_seconds,
+            self.bottleneck))
+
+
+def _produce(batches, queue, stats, stop):
+    try:
+        while not stop.is_set():
+            start = timer()
+            batch = next(batches, _DONE)
+            stats.generate_seconds += timer() - start
+            if batch is _DONE:
+                break
+
+            start = timer()
+            while not stop.is_set():
+                try:
+                    queue.put((batch, None), timeout=_POLL_SECONDS)
+                    break
+                except Full:
+                    pass
+            stats.generator_waits += timer() - start
+    except:
+        queue.put((None, sys.exc_info()))
+    else:
+        queue.put((_DONE, None))
+
+
+def pipelined(batches, write, depth=DEFAULT_DEPTH, progress=None):
+    """
+    Pulls batches from the iterator `batches` in a thread, and calls
+    write(batch) for each in the current thread. Yields every batch once
+    it is written. Errors raised while generating are raised here.
+
+    Keyword arguments:
+    depth -- how many generated batches may wait to be written
+    progress -- if provided, called with the Throughput after each batch
+
+    """
+    queue = Queue(maxsize=depth)
+    stats = Throughput()
+    stop = threading.Event()
+
+    producer = threading.Thread(target=_produce, args=(iter(batches), queue, stats, stop))
+    producer.daemon = True
+    producer.start()
+
+    try:
+        while True:
+            start = timer()
+            batch, error = queue.get()
+            stats.writer_waits += timer() - start
+
+            if error is not None:
+                raise error[0], error[1], error[2]
+            elif batch is _DONE:
+                break
+
+            start = timer()
+            write(batch)
+            stats.write_seconds += timer() - start
+            stats.rows += len(batch)
+            stats.batches += 1
+
+            if progress is not None:
+                progress(stats)
+            yield batch
+    finally:
+        # the consumer may stop early: let the generator thread go
+        stop.set()
+        while producer.is_alive():
+            while not queue.empty():
+                queue.get()
+            producer.join(_POLL_SECONDS)
@@ -0,0 +1,144 @@
+# -*- coding:utf-8 -*-
+
+__doc__ = '''
+Non-blocking make/prepare calls, run by a bounded pool of threads.
+
+amake_one, amake_many and aprepare_many (see model_mommy.mommy) return an
+AsyncResult right away: get() waits for the instances, and the optional
+callback is called with them from a pool thread, which is how event loops
+(tornado's add_callback, twisted's callFromThread) get notified without
+blocking. Calls for independent models run concurrently. map_threads()
+runs the chunks of make_many(threads=N) the same way, in its own pool.
+
+Pool threads use their own database connections, except for in-memory
+SQLite databases (like test databases) which only exist in the connection
+that created them: those are shared with the pool threads, the way
+Django's LiveServerTestCase does. SQLite takes one writer at a time, so
+with SQLite calls run one at a time; client/server databases get
+concurrent round trips.
+'''.strip()
+
+import threading
+from multiprocessing.pool import ThreadPool
+
+from django.conf import settings
+from django.db import connections
+
+__all__ = ['get_pool', 'close_pool', 'gather', 'map_threads']
+
+DEFAULT_POOL_SIZE = 4
+
+_pool = None
+_shared = {}  # alias -> connection shared with the pool threads
+_lock = threading.Lock()
+_serial_lock = threading.Lock()  # one call at a time on SQLite
+
+
+def shared_connections():
+    """
+    Returns the connections pool threads must share with the current
+    thread: in-memory SQLite ones.
+
+    """
+    rt = {}
+    for conn in connections.all():
+        if conn.vendor == 'sqlite' and conn.settings_dict['NAME'] in ('', ':memory:'):
+            rt[conn.alias] = conn
+    return rt
+
+
+def serialized():
+    """
+    Should pool calls run one at a time?
+
+    """
+    return any(conn.vendor == 'sqlite' for conn in connections.all())
+
+
+def share_connections():
+    """
+    Allows the connections returned by shared_connections() to be used by
+    other threads, and returns them.
+
+    """
+    shared = shared_connections()
+    for conn in shared.values():
+        conn.allow_thread_sharing = True
+    return shared
+
+
+def _use_connections(shared):
+    for alias, conn in shared.items():
+        connections[alias] = conn
+
+
+def get_pool():
+    """
+    Returns the shared thread pool, of settings.MOMMY_POOL_SIZE threads
+    (4 by default), starting it if needed.
+
+    """
+    global _pool
+    with _lock:
+        if _pool is None:
+            _shared.update(share_connections())
+            size = getattr(settings, 'MOMMY_POOL_SIZE', DEFAULT_POOL_SIZE)
+            _pool = ThreadPool(size, _use_connections, (dict(_shared),))
+        return _pool
+
+
+def close_pool():
+    """
+    Waits for pending calls and stops the pool threads.
+
+    """
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.close()
+            _pool.join()
+            _pool = None
+        for conn in _shared.values():
+            conn.allow_thread_sharing = False
+        _shared.clear()
+
+
+def _run(serial, func, args, kwargs):
+    if not serial:
+        return func(*args, **kwargs)
+    with _serial_lock:
+        return func(*args, **kwargs)
+
+
+def submit(func, args=(), kwargs=None, callback=None):
+    """
+    Calls func(*args, **kwargs) in the pool and returns its AsyncResult.
+
+    """
+    pool = get_pool()
+    return pool.apply_async(_run, (serialized(), func, args, kwargs or {}), {}, callback)
+
+
+def gather(results, timeout=None):
+    """
+    Waits for AsyncResults and returns their values, in order. Errors are
+    raised here.
+
+    """
+    return [result.get(timeout) for result in results]
+
+
+def map_threads(func, tasks, threads):
+    """
+    Returns [func(task) for task in tasks], computed by a new pool of
+    `threads` threads, each with its own database connections.
+
+    """
+    shared = share_connections()
+    pool = ThreadPool(threads, _use_connections, (shared,))
+    try:
+        serial = serialized()
+        return gather([pool.apply_async(_run, (serial, func, (task,), {})) for task in tasks])
+    finally:
+        pool.close()
+        pool.join()
@@ -0,0 +1,37 @@
+# -*- coding:utf-8 -*-
+
+__doc__ = '''
+Parent pools: children made in the same call share a bounded set of
+parents instead of getting a new parent each. Parents are picked from
+the pool with a distribution, see model_mommy.distributions.
+'''.strip()
+
+
+def existing_pks(model):
+    """
+    Returns the primary keys of every row of model, with a single query.
+
+    """
+    return list(model._default_manager.values_list('pk', flat=True))
+
+
+def drawn_rows(qty, streams, attrs):
+    """
+    Yields `qty` attrs dicts, each with the next value of every stream.
+
+    Keyword arguments:
+    streams -- dict of attribute name -> iterator of values
+    attrs -- attributes shared by every row
+
+    """
+    if not streams:
+        for i in xrange(qty):
+            yield attrs
+        return
+
+    streams = sorted(streams.items())
+    for i in xrange(qty):
+        row = dict(attrs)
+        for name, stream in streams:
+            row[name] = stream.next()
+        yield row
@@ -0,0 +1,161 @@
+# -*- coding:utf-8 -*-
+
+__doc__ = '''
+Generation profiling for Mommy.
+
+A Mommy with an observer reports every field value it generates and every
+save(), bulk insert and m2m add() it runs. Profile is an observer that
+aggregates wall time, call count, string bytes and queries, and dumps a
+sorted report. Without an observer nothing is measured.
+
+    with profile() as report:
+        mommy.make_many(Dog, 100)
+    report.dump()
+'''.strip()
+
+import sys
+from contextlib import contextmanager
+from timeit import default_timer as timer
+
+from django.db import connection
+
+
+def value_size(value):
+    """
+    Returns how many bytes a generated value holds. Only strings count.
+
+    """
+    if isinstance(value, unicode):
+        return len(value.encode('utf-8'))
+    elif isinstance(value, str):
+        return len(value)
+    return 0
+
+
+class Profile(object):
+    """
+    Aggregates generation and write statistics reported by mommies.
+
+    generators -- (model, field, method) -> [calls, seconds, bytes]
+    writes -- (model, operation) -> [calls, seconds, queries, query seconds]
+
+    """
+    def __init__(self):
+        self.generators = {}
+        self.writes = {}
+
+    def generate(self, mommy, field, generate):
+        """
+        Calls generate(mommy, field) and records how long it took.
+
+        """
+        start = timer()
+        value = generate(mommy, field)
+        seconds = timer() - start
+
+        key = (field.model.__name__, field.name, generate.__name__)
+        stats = self.generators.setdefault(key, [0, 0.0, 0])
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] += value_size(value)
+        return value
+
+    def write(self, model, operation, func, *args, **kwargs):
+        """
+        Calls func(*args, **kwargs), a database write, and records how long
+        it took and which queries it ran.
+
+        """
+        first_query = len(connection.queries)
+        start = timer()
+        rt = func(*args, **kwargs)
+        seconds = timer() - start
+        queries = connection.queries[first_query:]
+
+        stats = self.writes.setdefault((model.__name__, operation), [0, 0.0, 0, 0.0])
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] += len(queries)
+        stats[3] += sum(float(query['time']) for query in queries)
+        return rt
+
+    def merge(self, other):
+        """
+        Adds the statistics of other, a Profile that observed a worker
+        process.
+
+        """
+        for totals, stats in ((self.generators, other.generators), (self.writes, other.writes)):
+            for key, values in stats.items():
+                if key in totals:
+                    totals[key] = [a + b for a, b in zip(totals[key], values)]
+                else:
+                    totals[key] = list(values)
+
+    def models(self):
+        """
+        Returns model -> [calls, seconds, bytes] totals of field generation.
+
+        """
+        totals = {}
+        for (model, field, method), (calls, seconds, size) in self.generators.items():
+            stats = totals.setdefault(model, [0, 0.0, 0])
+            stats[0] += calls
+            stats[1] += seconds
+            stats[2] += size
+        return totals
+
+    def dump(self, out=sys.stdout):
+        """
+        Writes a report, slowest entries first.
+
+        """
+        def by_seconds(items):
+            return sorted(items, key=lambda item: item[1][1], reverse=True)
+
+        out.write('%-40s %-32s %8s %10s %10s %10s\n' % ('field', 'generator', 'calls',
+            'total ms', 'avg us', 'bytes'))
+        for (model, field, method), (calls, seconds, size) in by_seconds(self.generators.items()):
+            out.write('%-40s %-32s %8d %10.2f %10.2f %10d\n' % ('%s.%s' % (model, field),
+                method, calls, seconds * 1e3, seconds / calls * 1e6, size))
+
+        out.write('\n%-40s %8s %10s %10s\n' % ('model', 'calls', 'total ms', 'bytes'))
+        for model, (calls, seconds, size) in by_seconds(self.models().items()):
+            out.write('%-40s %8d %10.2f %10d\n' % (model, calls, seconds * 1e3, size))
+
+        out.write('\n%-40s %-32s %8s %10s %8s %10s\n' % ('model', 'write', 'calls',
+            'total ms', 'queries', 'query ms'))
+        for (model, operation), (calls, seconds, queries, query_seconds) in by_seconds(self.writes.items()):
+            out.write('%-40s %-32s %8d %10.2f %8d %10.2f\n' % (model, operation, calls,
+                seconds * 1e3, queries, query_seconds * 1e3))
+
+
+@contextmanager
+def profile(mommy_class=None, observer=None):
+    """
+    Installs an observer (a new Profile by default) for every instance of
+    mommy_class (Mommy by default) while the context is active, and logs
+    queries so writes can be measured. Yields the observer.
+
+    """
+    if mommy_class is None:
+        from .base import Mommy as mommy_class
+
+    if observer is None:
+        observer = Profile()
+
+    overriden = 'observer' in mommy_class.__dict__
+    previous = mommy_class.__dict__.get('observer')
+    use_debug_cursor = connection.use_debug_cursor
+
+    mommy_class.observer = observer
+    connection.use_debug_cursor = True
+
+    try:
+        yield observer
+    finally:
+        connection.use_debug_cursor = use_debug_cursor
+        if overriden:
+            mommy_class.observer = previous
+        else:
+            del mommy_class.observer
@@ -0,0 +1,103 @@
+# -*- coding:utf-8 -*-
+
+__doc__ = '''
+Raw inserts: generated values are written as column tuples with a single
+cursor and executemany(), without building model instances. save(),
+signals and model validation are skipped.
+
+Values are converted column by column with the fields' get_db_prep_save,
+auto_now fields get one timestamp per batch, and fields left out of the
+generated values get their default.
+'''.strip()
+
+from functools import partial
+
+from django.db import connection, transaction
+from django.db.models import AutoField
+from django.db.models.fields.related import RelatedField
+
+
+class _Row(object):
+    """
+    Stands for a model instance in field.pre_save().
+
+    """
+
+
+def raw_fields(model):
+    """
+    Returns the fields of the columns written for model: local fields but
+    auto primary keys, left to the database.
+
+    """
+    if model._meta.parents:
+        raise ValueError('%s rows can\'t be raw inserted: it inherits from a '
+            'concrete model' % model.__name__)
+    fields = [field for field in model._meta.local_fields if not isinstance(field, AutoField)]
+    if not fields:
+        raise ValueError('%s rows have no column to raw insert' % model.__name__)
+    return fields
+
+
+def insert_sql(model, fields):
+    qn = connection.ops.quote_name
+    return 'INSERT INTO %s (%s) VALUES (%s)' % (qn(model._meta.db_table),
+        ', '.join(qn(field.column) for field in fields),
+        ', '.join(['%s'] * len(fields)))
+
+
+def column_values(field, values):
+    """
+    Returns the values of a column, given the attrs dicts of the rows:
+    keys for related fields, defaults for fields left out.
+
+    """
+    if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+        return [field.pre_save(_Row(), True)] * len(values)
+
+    names = [field.name]
+    if isinstance(field, RelatedField):
+        names.append(field.attname)
+
+    raw = []
+    for row in values:
+        for name in names:
+            if name in row:
+                raw.append(row[name])
+                break
+        else:
+            raw.append(field.get_default())
+
+    if isinstance(field, RelatedField):
+        raw = [getattr(value, 'pk', value) for value in raw]
+    return raw
+
+
+def column(field, values):
+    """
+    Returns the database values of a column, given the attrs dicts of the
+    rows.
+
+    """
+    return map(partial(field.get_db_prep_save, connection=connection),
+        column_values(field, values))
+
+
+def insert_rows(model, fields, values, observer=None):
+    """
+    Writes rows with a single executemany().
+
+    Keyword arguments:
+    fields -- the fields of the columns, see raw_fields
+    values -- list of attrs dicts, one per row
+    observer -- if provided, the write is reported to it
+
+    """
+    rows = zip(*[column(field, values) for field in fields])
+    cursor = connection.cursor()
+
+    if observer is None:
+        cursor.executemany(insert_sql(model, fields), rows)
+    else:
+        observer.write(model, 'raw insert', cursor.executemany, insert_sql(model, fields), rows)
+    transaction.commit_unless_managed()
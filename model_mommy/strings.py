@@ -0,0 +1,140 @@
+# -*- coding:utf-8 -*-
+
+__doc__ = '''
+Batched random string generation. Entropy is drawn in large blocks and
+mapped to the character table in bulk, instead of one random.choice call
+per character.
+'''.strip()
+
+import random
+from array import array
+from binascii import unhexlify
+
+__all__ = ['random_bytes', 'random_text', 'random_texts']
+
+_UNIT_TYPECODES = dict((array(code).itemsize, code) for code in 'LIH')
+
+_translations = {}  # table -> (byte translation table, deletechars, limit)
+_range_tables = {}  # (first, last) -> unicode table
+
+
+def random_bytes(count, rng=random):
+    """
+    Returns a byte string with `count` random bytes drawn from `rng`
+    with a single call.
+
+    """
+    if count <= 0:
+        return ''
+    return unhexlify('%0*x' % (count * 2, rng.getrandbits(count * 8)))
+
+
+def random_text(length, table, rng=random):
+    """
+    Returns a random unicode string with `length` characters from `table`.
+
+    Keyword arguments:
+    length -- length for the new string
+    table -- string with usable characters or tuple with usable char code range
+
+    """
+    if isinstance(table, tuple):
+        first, last = table
+        if last < 256:
+            return random_text(length, _range_table(first, last), rng)
+        return u''.join(map(unichr, _random_indexes(length, last - first + 1, rng, first)))
+
+    elif isinstance(table, basestring):
+        table = unicode(table)
+        translation = _translation(table)
+        if translation is None:
+            return u''.join(map(table.__getitem__, _random_indexes(length, len(table), rng)))
+        return _translate_bytes(length, translation, rng)
+
+    else:
+        raise TypeError("Unsupported table type provided.")
+
+
+def random_texts(lengths, table, rng=random):
+    """
+    Returns one random string per item in `lengths`, all drawn from
+    `table` with a single entropy draw.
+
+    """
+    text = random_text(sum(lengths), table, rng)
+    rt = []
+    start = 0
+
+    for length in lengths:
+        rt.append(text[start:start + length])
+        start += length
+    return rt
+
+
+def _range_table(first, last):
+    table = _range_tables.get((first, last))
+    if table is None:
+        table = _range_tables[(first, last)] = u''.join(map(unichr, range(first, last + 1)))
+    return table
+
+
+def _translation(table):
+    """
+    Maps every byte to a character of `table`. Bytes beyond the biggest
+    multiple of len(table) are deleted so every character is equally likely.
+    Returns None if table can't be mapped from single bytes.
+
+    """
+    if table in _translations:
+        return _translations[table]
+
+    size = len(table)
+    if not 0 < size <= 256 or max(table) > u'\xff':
+        translation = None
+    else:
+        limit = 256 - 256 % size
+        chars = ''.join(table[i % size].encode('latin-1') for i in range(limit))
+        translation = (chars + '\0' * (256 - limit), ''.join(map(chr, range(limit, 256))), limit)
+
+    _translations[table] = translation
+    return translation
+
+
+def _translate_bytes(length, translation, rng):
+    chars, deletechars, limit = translation
+    chunks = []
+    missing = length
+
+    while missing > 0:
+        chunk = random_bytes(missing * 256 // limit + 16, rng)
+        chunk = chunk.translate(chars, deletechars)[:missing]
+        chunks.append(chunk)
+        missing -= len(chunk)
+    return ''.join(chunks).decode('latin-1')
+
+
+def _random_indexes(length, size, rng, offset=0):
+    """
+    Returns `length` random integers in [offset, offset + size), drawn
+    from 16, 32 or 64 bits blocks. Wider ranges are drawn one by one.
+
+    """
+    if size <= 0x10000:
+        unit = 2
+    elif size <= 0x100000000:
+        unit = 4
+    else:
+        unit = 8
+
+    if size > 1 << 64 or unit not in _UNIT_TYPECODES:
+        return [offset + rng.randint(0, size - 1) for i in xrange(length)]
+
+    limit = (1 << (unit * 8)) - (1 << (unit * 8)) % size
+    rt = []
+
+    while len(rt) < length:
+        missing = length - len(rt)
+        units = array(_UNIT_TYPECODES[unit])
+        units.fromstring(random_bytes(int(missing * (1 << (unit * 8)) // limit + 16) * unit, rng))
+        rt.extend([offset + i % size for i in units if i < limit][:missing])
+    return rt
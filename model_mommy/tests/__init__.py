@@ -3,4 +3,10 @@ from test_utils import *
 from test_mommy import *
 from test_fields import *
 from test_related import *
-from test_extending_mommy import *
\ No newline at end of file
+from test_extending_mommy import *
+from test_benchmarks import *
+from test_profiling import *
+from test_cache import *
+from test_distributions import *
+from test_export import *
+from test_pool import *
\ No newline at end of file
@@ -54,6 +54,14 @@ class Car(models.Model):
     license_plate = CharField(max_length=10)
 
 
+class Code(models.Model):  # primary key not generated by the database
+    code = CharField(max_length=10, primary_key=True)
+
+
+class Item(models.Model):
+    code = ForeignKey(Code)
+
+
 class DummyDateModel(models.Model):
     date_field = DateField()
 
@@ -101,6 +109,17 @@ class DummyPositiveIntModel(models.Model):
     positive_int_field = PositiveIntegerField()
 
 
+class DummyUniqueModel(models.Model):
+    code = CharField(max_length=3, unique=True)
+    letter = CharField(max_length=1, unique=True)
+    email = EmailField(max_length=20, unique=True)
+    slot = PositiveSmallIntegerField(choices=[(i, i) for i in range(3)])
+    rank = IntegerField()
+
+    class Meta:
+        unique_together = ('slot', 'rank')
+
+
 class DummyNumbersModel(models.Model):
     float_field = FloatField()
 
@@ -0,0 +1,34 @@
+# -*- coding:utf-8 -*-
+
+from django.test import TestCase
+
+
+class TestBenchmarkSuite(TestCase):
+    def test_benchmark_reports_rate_and_queries(self):
+        from model_mommy import mommy
+        from model_mommy.benchmarks import Benchmark
+        from model_mommy.models import Dog
+
+        benchmark = Benchmark('make_one Dog', lambda: mommy.make_one(Dog), 3, unit='rows')
+        result = benchmark.run()
+
+        self.assertEqual(result['values'], 3)
+        self.assertEqual(result['queries_per_value'], 2)
+        self.assertTrue(result['per_second'] > 0)
+
+    def test_every_generator_with_a_test_field_has_a_benchmark(self):
+        from model_mommy.benchmarks.generators import generator_benchmarks
+
+        names = [benchmark.name for benchmark in generator_benchmarks()]
+        for generator in ('charfield', 'emailfield', 'foreignkey', 'decimalfield'):
+            self.assertIn('generator ' + generator, names)
+
+    def test_compare_flags_regressions(self):
+        from StringIO import StringIO
+        from model_mommy.benchmarks import compare
+
+        baseline = {'results': {'a': {'per_second': 100.0}, 'b': {'per_second': 100.0}}}
+        results = {'results': {'a': {'per_second': 70.0}, 'b': {'per_second': 95.0},
+            'c': {'per_second': 1.0}}}
+
+        self.assertEqual(compare(results, baseline, 0.2, StringIO()), ['a'])
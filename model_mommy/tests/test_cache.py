@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+
+from django.test import TestCase
+
+
+class TestFixtureCache(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def entries(self):
+        return [name for name in os.listdir(self.directory) if name.endswith('.json.gz')]
+
+    def test_miss_stores_and_hit_loads_rows(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        dogs = mommy.make_many(Dog, 3, seed=5, cache=self.directory)
+        self.assertEqual(len(self.entries()), 1)
+        expected = [(d.pk, d.breed, d.owner.pk, d.owner.name, d.owner.email) for d in dogs]
+
+        Dog.objects.all().delete()
+        Person.objects.all().delete()
+
+        dogs = mommy.make_many(Dog, 3, seed=5, cache=self.directory)
+        self.assertEqual(len(self.entries()), 1)
+        self.assertEqual(Dog.objects.count(), 3)
+        self.assertEqual(Person.objects.count(), 3)
+        self.assertEqual(expected, [(d.pk, d.breed, d.owner.pk, d.owner.name, d.owner.email)
+            for d in dogs])
+        self.assertEqual(expected, [(d.pk, d.breed, d.owner.pk, d.owner.name, d.owner.email)
+            for d in Dog.objects.order_by('pk')])
+
+    def test_threads_pipeline_and_progress_are_forwarded(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        reports = []
+        dogs = mommy.make_many(Dog, 4, seed=5, cache=self.directory, bulk=True, batch_size=2,
+            threads=2)
+        expected = [(d.breed, d.owner.name) for d in dogs]
+        self.assertEqual(expected, [(d.breed, d.owner.name)
+            for d in mommy.make_many(Dog, 4, seed=5, bulk=True, batch_size=2, threads=2)])
+
+        mommy.make_many(Dog, 4, seed=5, cache=self.directory, batch_size=2, pipeline=True,
+            progress=reports.append)
+        self.assertEqual(len(reports), 2)
+        self.assertEqual(len(self.entries()), 2)
+
+        Dog.objects.all().delete()
+        Person.objects.all().delete()
+        mommy.make_many(Dog, 4, seed=5, cache=self.directory, batch_size=2, pipeline=True,
+            progress=reports.append)
+        self.assertEqual(len(self.entries()), 2)
+        self.assertEqual(len(reports), 2)
+        self.assertEqual(Dog.objects.count(), 4)
+
+    def test_hit_loads_m2m_and_bulk_rows(self):
+        from model_mommy import mommy
+        from model_mommy.models import Person, Store
+
+        customers = mommy.make_many(Person, 2)
+        store = mommy.make_many(Store, 1, seed=1, customers=customers, cache=self.directory)[0]
+        mommy.make_many(Person, 4, seed=1, bulk=True, cache=self.directory)
+        self.assertEqual(len(self.entries()), 2)
+
+        Store.objects.all().delete()
+        Person.objects.exclude(pk__in=[c.pk for c in customers]).delete()
+
+        loaded = mommy.make_many(Store, 1, seed=1, customers=customers, cache=self.directory)[0]
+        self.assertEqual(loaded.pk, store.pk)
+        self.assertEqual(set(loaded.customers.all()), set(customers))
+
+        mommy.make_many(Person, 4, seed=1, bulk=True, cache=self.directory)
+        self.assertEqual(Person.objects.count(), 6)
+
+    def test_hit_restores_fanned_out_links_once(self):
+        from model_mommy import mommy
+        from model_mommy.models import Person, Store
+
+        Links = Store.customers.through
+        mommy.make_many(Store, 3, seed=1, m2m={'customers': 2}, cache=self.directory)
+        links = set(Links.objects.values_list('store', 'person'))
+        self.assertEqual(len(links), 6)
+
+        Store.objects.all().delete()
+        Person.objects.all().delete()
+
+        stores = mommy.make_many(Store, 3, seed=1, m2m={'customers': 2}, cache=self.directory)
+        self.assertEqual(Links.objects.count(), 6)
+        self.assertEqual(set(Links.objects.values_list('store', 'person')), links)
+        self.assertTrue(all(store.customers.count() == 2 for store in stores))
+
+    def test_key_changes_with_seed_qty_attrs_and_generators(self):
+        from model_mommy.base import Mommy
+        from model_mommy.cache import cache_key
+        from model_mommy.models import Dog, Person
+
+        key = cache_key(Mommy(Dog, seed=1), 3, {})
+        self.assertEqual(key, cache_key(Mommy(Dog, seed=1), 3, {}))
+        self.assertNotEqual(key, cache_key(Mommy(Dog, seed=2), 3, {}))
+        self.assertNotEqual(key, cache_key(Mommy(Dog, seed=1), 4, {}))
+        self.assertNotEqual(key, cache_key(Mommy(Dog, seed=1), 3, {'breed': 'pug'}))
+        self.assertNotEqual(key, cache_key(Mommy(Dog, seed=1), 3, {'bulk': True}))
+
+        class PugMommy(Mommy):
+            def value_for_charfield(self, field):
+                return 'pug'
+
+        self.assertNotEqual(key, cache_key(PugMommy(Dog, seed=1), 3, {}))
+
+        owner = Person(pk=1)
+        self.assertNotEqual(cache_key(Mommy(Dog, seed=1), 3, {'owner': owner}),
+            cache_key(Mommy(Dog, seed=1), 3, {'owner': Person(pk=2)}))
+
+    def test_key_covers_every_generation_module(self):
+        import os
+        from model_mommy.cache import library_sources
+
+        names = set(os.path.basename(path) for path in library_sources())
+        for name in ('base.py', 'strings.py', 'distributions.py', 'unique.py', 'links.py',
+                'pools.py', 'graph.py'):
+            self.assertTrue(name in names, name)
+
+    def test_key_changes_with_schema(self):
+        from model_mommy.base import Mommy
+        from model_mommy.cache import cache_key
+        from model_mommy.models import Dog, Person
+
+        key = cache_key(Mommy(Dog, seed=1), 3, {})
+        field = Person._meta.get_field('name')  # Dog owners are generated too
+        max_length = field.max_length
+        field.max_length = max_length + 1
+        try:
+            self.assertNotEqual(key, cache_key(Mommy(Dog, seed=1), 3, {}))
+        finally:
+            field.max_length = max_length
+
+    def test_unseeded_mommies_are_not_cached(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog
+
+        self.assertRaises(ValueError, mommy.make_many, Dog, 3, cache=self.directory)
+        self.assertEqual(self.entries(), [])
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+import random
+from collections import defaultdict
+
+from django.test import TestCase
+
+
+def counts(values):
+    rt = defaultdict(int)
+    for value in values:
+        rt[value] += 1
+    return rt
+
+
+class TestDistributions(TestCase):
+    def test_uniform_picks_from_population_or_bounds(self):
+        from model_mommy.distributions import Uniform
+
+        rng = random.Random(1)
+        self.assertEqual(set(Uniform().draw(rng, 1000, 'abc')), set('abc'))
+        self.assertEqual(set(Uniform(3, 5).draw(rng, 1000)), set([3, 4, 5]))
+
+        values = Uniform(0.5, 1.5).draw(rng, 1000)
+        self.assertTrue(all(0.5 <= value < 1.5 for value in values))
+        self.assertRaises(ValueError, Uniform, 2, 1)
+
+    def test_uniform_draws_wide_integer_ranges(self):
+        from model_mommy.constants import MIN_BIG_INT, MAX_BIG_INT
+        from model_mommy.distributions import Uniform
+
+        rng = random.Random(1)
+        values = Uniform(MIN_BIG_INT, MAX_BIG_INT).draw(rng, 1000)
+        self.assertTrue(all(MIN_BIG_INT <= value <= MAX_BIG_INT for value in values))
+        self.assertEqual(len(set(values)), 1000)
+        self.assertTrue(min(values) < 0 < max(values))
+
+        values = Uniform(0, 1 << 70).draw(rng, 100)
+        self.assertTrue(all(0 <= value <= 1 << 70 for value in values))
+        self.assertTrue(max(values) > 1 << 64)
+
+    def test_zipf_makes_the_first_members_hot(self):
+        from model_mommy.distributions import Zipf
+
+        values = counts(Zipf(1.2).draw(random.Random(1), 20000, range(100)))
+        self.assertEqual(max(values, key=values.get), 0)
+        self.assertTrue(values[0] > 5 * values[9])
+        self.assertTrue(values[0] > 20000 * 0.15)
+
+        ranks = Zipf(1.0, n=10).draw(random.Random(1), 1000)
+        self.assertEqual(set(ranks), set(range(1, 11)))
+
+    def test_weighted_follows_weights(self):
+        from model_mommy.distributions import Weighted
+
+        values = counts(Weighted({'a': 3, 'b': 1, 'c': 0}).draw(random.Random(1), 20000))
+        self.assertEqual(values['c'], 0)
+        self.assertAlmostEqual(values['a'] / 20000.0, 0.75, 1)
+
+        values = Weighted([0, 1]).draw(random.Random(1), 100, ['x', 'y'])
+        self.assertEqual(set(values), set(['y']))
+        self.assertRaises(ValueError, Weighted([1, 1]).draw, random.Random(1), 1, 'xyz')
+        self.assertRaises(ValueError, Weighted, [0, 0])
+
+    def test_normal_is_centered_and_clipped(self):
+        from model_mommy.distributions import Normal
+
+        values = Normal(40, 10).draw(random.Random(1), 20000)
+        self.assertAlmostEqual(sum(values) / len(values), 40, 0)
+
+        values = Normal(40, 10, low=35, high=45, integer=True).draw(random.Random(1), 1000)
+        self.assertTrue(all(isinstance(value, int) for value in values))
+        self.assertEqual((min(values), max(values)), (35, 45))
+
+    def test_draws_are_reproducible_and_batched(self):
+        from model_mommy.distributions import Zipf
+
+        zipf = Zipf(1.1)
+        values = zipf.draw(random.Random(7), 10, range(50))
+        self.assertEqual(values, zipf.draw(random.Random(7), 10, range(50)))
+
+        rng = random.Random(7)
+        batches = [zipf.draw(rng, 4, range(50)) for i in range(3)]
+        stream = zipf.stream(random.Random(7), range(50), batch_size=4)
+        self.assertEqual([stream.next() for i in range(12)], sum(batches, []))
+
+    def test_population_is_required_to_pick(self):
+        from model_mommy.distributions import Uniform, Zipf
+
+        self.assertRaises(ValueError, Uniform().draw, random.Random(1), 1)
+        self.assertRaises(ValueError, Zipf().draw, random.Random(1), 1)
+        self.assertRaises(ValueError, Zipf().draw, random.Random(1), 1, [])
+
+
+class TestMommyDistributions(TestCase):
+    def test_parents_are_picked_with_a_distribution(self):
+        from model_mommy import mommy
+        from model_mommy.distributions import Zipf
+        from model_mommy.models import Dog
+
+        dogs = mommy.make_many(Dog, 400, bulk=True, parents={'owner': 20},
+            distributions={'owner': Zipf(1.5)}, seed=1)
+        owners = counts(dog.owner_id for dog in dogs)
+        self.assertTrue(max(owners.values()) > 100)
+
+    def test_field_values_and_choices_are_drawn(self):
+        from model_mommy import mommy
+        from model_mommy.distributions import Normal, Weighted
+        from model_mommy.models import Person
+
+        people = mommy.prepare_many(Person, 50, distributions={
+            'age': Normal(30, 2, low=25, high=35, integer=True),
+            'gender': Weighted([0, 1]),
+        })
+        self.assertTrue(all(25 <= person.age <= 35 for person in people))
+        self.assertEqual(set(person.gender for person in people), set(['F']))
+
+    def test_big_integer_fields_draw_from_their_whole_range(self):
+        from model_mommy import mommy
+        from model_mommy.constants import MIN_BIG_INT, MAX_BIG_INT
+        from model_mommy.distributions import Uniform
+        from model_mommy.models import Person
+
+        people = mommy.prepare_many(Person, 10,
+            distributions={'wanted_games_qtd': Uniform(MIN_BIG_INT, MAX_BIG_INT)})
+        self.assertTrue(all(MIN_BIG_INT <= p.wanted_games_qtd <= MAX_BIG_INT for p in people))
+
+    def test_mommy_subclass_distributions(self):
+        from model_mommy.mommy import Mommy
+        from model_mommy.distributions import Uniform, Weighted
+        from model_mommy.models import Person
+
+        class OldMommy(Mommy):
+            distributions = {'age': Uniform(90, 99), 'name': Weighted({'Ann': 1})}
+
+        mom = OldMommy(Person)
+        self.assertTrue(90 <= mom.make().age <= 99)
+        self.assertEqual(set(p.name for p in mom.prepare_many(5)), set(['Ann']))
+        self.assertEqual(set(p.name for p in mom.iter_prepare(5)), set(['Ann']))
+        self.assertEqual(mom.prepare(name='Bob').name, 'Bob')
+
+    def test_unknown_fields_raise_value_error(self):
+        from model_mommy import mommy
+        from model_mommy.distributions import Uniform
+        from model_mommy.models import Person
+
+        self.assertRaises(ValueError, mommy.prepare_many, Person, 2,
+            distributions={'height': Uniform(1, 2)})
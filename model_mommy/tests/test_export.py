@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+
+from django.test import TestCase
+
+
+class TestExport(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_csv_export_is_restored_by_load_csv(self):
+        from model_mommy import mommy
+        from model_mommy.export import load_csv
+        from model_mommy.models import Dog, Person
+
+        count = mommy.export_csv(Dog, 25, self.directory, chunk_size=10, seed=3)
+        self.assertEqual(count, 50)
+        self.assertEqual(sorted(os.listdir(self.directory)),
+            ['model_mommy.dog.csv.gz', 'model_mommy.person.csv.gz', 'tables.txt'])
+        self.assertEqual(Dog.objects.count(), 0)
+
+        self.assertEqual(load_csv(self.directory, batch_size=7), 50)
+        self.assertEqual(Dog.objects.filter(owner__in=Person.objects.all()).count(), 25)
+
+        def values(dogs):
+            # CSV values lose their NUL characters
+            return [[isinstance(v, unicode) and v.replace(u'\0', u'') or v
+                for v in (d.breed, d.owner.name, d.owner.birthday, d.owner.bio)] for d in dogs]
+
+        self.assertEqual(values(mommy.prepare_many(Dog, 25, seed=3)),
+            values(Dog.objects.select_related('owner').order_by('pk')))
+
+        # sequences move past the loaded keys
+        self.assertEqual(mommy.make_one(Person).pk, 26)
+
+    def test_json_export_is_a_loaddata_fixture(self):
+        from django.core.management import call_command
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        path = os.path.join(self.directory, 'dogs.json.gz')
+        self.assertEqual(mommy.export_json(Dog, 12, path, chunk_size=5), 24)
+
+        call_command('loaddata', path, verbosity=0)
+        self.assertEqual(Person.objects.count(), 12)
+        self.assertEqual(Dog.objects.filter(owner__in=Person.objects.all()).count(), 12)
+
+    def test_shared_parents_are_written_once(self):
+        from model_mommy import mommy
+        from model_mommy.export import load_csv
+        from model_mommy.models import Dog, Person
+
+        owner = mommy.prepare_one(Person)
+        self.assertEqual(mommy.export_csv(Dog, 10, self.directory, chunk_size=3, owner=owner), 11)
+
+        load_csv(self.directory)
+        self.assertEqual(Person.objects.count(), 1)
+        self.assertEqual(Person.objects.get().dog_set.count(), 10)
@@ -30,3 +30,73 @@ class SimpleExtendMommy(TestCase):
 
         # making a young person
         self.assertLessEqual(person.age, max_age)
+
+
+class GenerationPlanCache(TestCase):
+    def test_generator_override_in_subclass_uses_its_own_plan(self):
+        from model_mommy.mommy import Mommy
+        from model_mommy.models import Person
+
+        class AdultMommy(Mommy):
+            def value_for_agefield(self, field):
+                return 42
+
+        Mommy(Person).prepare()  # compiles the plan for Mommy
+        self.assertEqual(AdultMommy(Person).prepare().age, 42)
+
+    def test_generator_override_in_instance(self):
+        from model_mommy.mommy import Mommy
+        from model_mommy.models import Person
+
+        mom = Mommy(Person)
+        mom.prepare()
+        mom.value_for_agefield = lambda field: 7
+        self.assertEqual(mom.prepare().age, 7)
+
+    def test_patched_generators_are_picked_up(self):
+        from model_mommy.mommy import Mommy
+        from model_mommy.models import Person
+        from model_mommy.profiling import Profile
+
+        observed = Mommy(Person)
+        observed.observer = Profile()
+        Mommy(Person).prepare()
+        observed.prepare()
+
+        original = Mommy.__dict__['value_for_charfield']
+        Mommy.value_for_charfield = lambda self, field: 'patched'
+        try:
+            self.assertEqual(Mommy(Person).prepare().name, 'patched')
+            self.assertEqual(observed.prepare().name, 'patched')
+        finally:
+            Mommy.value_for_charfield = original
+        self.assertNotEqual(Mommy(Person).prepare().name, 'patched')
+
+    def test_invalidate_plans_picks_up_replaced_generators(self):
+        from model_mommy.mommy import Mommy
+        from model_mommy.models import Person
+
+        class ChildMommy(Mommy):
+            pass
+
+        ChildMommy(Person).prepare()
+        ChildMommy.value_for_agefield = lambda self, field: 3
+        ChildMommy.invalidate_plans()
+        self.assertEqual(ChildMommy(Person).prepare().age, 3)
+
+    def test_invalidate_plans_drops_observed_plans_too(self):
+        from model_mommy.base import _observed_plans
+        from model_mommy.mommy import Mommy
+        from model_mommy.models import Person
+        from model_mommy.profiling import Profile
+
+        class ChildMommy(Mommy):
+            pass
+
+        mom = ChildMommy(Person)
+        mom.observer = Profile()
+        mom.prepare()
+        self.assertTrue(_observed_plans[mom.observer])
+
+        ChildMommy.invalidate_plans()
+        self.assertFalse(_observed_plans.get(mom.observer))
@@ -241,6 +241,752 @@ class TestMommyAPI(TestCase):
                 self.assertIsNotNone(attrs[field.name])
 
 
+class TestMommyBulkMake(TestCase):
+    def test_bulk_make_many_persists_every_instance(self):
+        from model_mommy import mommy
+        from model_mommy.models import Person
+
+        people = mommy.make_many(Person, 10, bulk=True)
+        self.assertEqual(len(people), 10)
+        self.assertEqual(Person.objects.count(), 10)
+
+    def test_bulk_make_many_respects_batch_size(self):
+        from model_mommy.mommy import Mommy
+        from model_mommy.models import Person
+
+        mom = Mommy(Person, fill_null=True)
+        # key reservation, 4 inserts
+        people = []
+        self.assertNumQueries(5, lambda: people.extend(mom.make_many(10, bulk=True, batch_size=3)))
+        self.assertEqual(Person.objects.count(), 10)
+        self.assertEqual(sorted(p.pk for p in people),
+            sorted(Person.objects.values_list('pk', flat=True)))
+
+    def test_bulk_make_many_with_params(self):
+        from model_mommy import mommy
+        from model_mommy.models import Person
+
+        mommy.make_many(Person, 3, bulk=True, name='Mike')
+        self.assertEqual(Person.objects.filter(name='Mike').count(), 3)
+
+    def test_bulk_make_many_with_model_without_columns(self):
+        from model_mommy import mommy
+        from model_mommy.models import Store
+
+        mommy.make_many(Store, 3, bulk=True)
+        self.assertEqual(Store.objects.count(), 3)
+
+    def test_bulk_make_many_writes_parents_with_generated_keys(self):
+        from model_mommy import mommy
+        from model_mommy.models import Code, Item
+
+        items = mommy.make_many(Item, 3, bulk=True)
+        self.assertEqual(Code.objects.count(), 3)
+        self.assertEqual(Item.objects.filter(code__in=Code.objects.all()).count(), 3)
+        self.assertTrue(all(not item.code._state.adding for item in items))
+
+    def test_bulk_make_many_commits_required_relations(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        mommy.make_many(Dog, 4, bulk=True)
+        self.assertEqual(Dog.objects.count(), 4)
+        self.assertEqual(Person.objects.count(), 4)
+
+    def test_bulk_make_many_writes_each_model_at_once(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        # owners and dogs key reservations and inserts
+        with self.assertNumQueries(4):
+            dogs = mommy.make_many(Dog, 50, bulk=True)
+        self.assertEqual(Person.objects.count(), 50)
+        self.assertEqual(set(Dog.objects.values_list('owner', flat=True)),
+            set(dog.owner.pk for dog in dogs))
+        self.assertEqual(len(set(dog.owner_id for dog in dogs)), 50)
+
+    def test_bulk_make_many_writes_related_chains_level_by_level(self):
+        from model_mommy import mommy
+        from model_mommy.models import Penguin
+
+        grandpa = Penguin()
+        with self.assertNumQueries(6):
+            penguin = mommy.make_many(Penguin, 1, bulk=True, partner=Penguin(partner=grandpa))[0]
+        self.assertEqual(Penguin.objects.count(), 3)
+        self.assertEqual(Penguin.objects.get(partner__partner=grandpa.pk).partner,
+            penguin.partner)
+
+    def test_bulk_make_many_sets_pks_for_m2m(self):
+        from model_mommy import mommy
+        from model_mommy.models import Person, Store
+
+        customers = mommy.make_many(Person, 2)
+        stores = mommy.make_many(Store, 3, bulk=True, customers=customers)
+        self.assertTrue(all(store.pk for store in stores))
+        for store in stores:
+            self.assertEqual(set(store.customers.all()), set(customers))
+
+
+class TestGraphPlanner(TestCase):
+    def test_levels_put_parents_first(self):
+        from model_mommy.graph import levels
+        from model_mommy.models import Dog, Person, Penguin
+
+        owner = Person()
+        dogs = [Dog(owner=owner), Dog(owner=Person()), Dog(owner=owner)]
+        grandpa = Penguin()
+        penguin = Penguin(partner=Penguin(partner=grandpa))
+
+        rt = levels(dogs + [penguin])
+        self.assertEqual([[model for model, group in level] for level in rt],
+            [[Person, Penguin], [Dog, Penguin], [Penguin]])
+        self.assertEqual(rt[0][0][1], [owner, dogs[1].owner])
+        self.assertEqual(rt[0][1][1], [grandpa])
+        self.assertEqual(rt[1][0][1], dogs)
+        self.assertEqual(rt[2][0][1], [penguin])
+
+    def test_reserved_pks_follow_the_max_pk(self):
+        from model_mommy import mommy
+        from model_mommy.graph import reserve_pks
+        from model_mommy.keys import MaxKeyAllocator
+        from model_mommy.models import Person
+
+        # the default allocator keeps the keys reserved by other tests
+        last = mommy.make_one(Person)
+        people = [Person(), Person()]
+        reserve_pks(Person, people, MaxKeyAllocator())
+        self.assertEqual([p.pk for p in people], [last.pk + 1, last.pk + 2])
+
+    def test_max_allocator_hands_out_disjoint_blocks(self):
+        from model_mommy import mommy
+        from model_mommy.keys import MaxKeyAllocator
+        from model_mommy.models import Person
+
+        allocator = MaxKeyAllocator()
+        first = mommy.prepare_many(Person, 3, reserve_pks=allocator)
+        second = mommy.prepare_many(Person, 3, reserve_pks=allocator)
+        keys = [p.pk for p in first + second]
+        self.assertEqual(len(set(keys)), 6)
+        self.assertEqual(keys, range(keys[0], keys[0] + 6))
+
+    def test_max_allocator_keeps_pending_blocks_after_a_write(self):
+        from model_mommy import mommy
+        from model_mommy.keys import MaxKeyAllocator
+        from model_mommy.models import Person
+
+        allocator = MaxKeyAllocator()
+        first = mommy.prepare_many(Person, 3, reserve_pks=allocator)
+        second = mommy.prepare_many(Person, 3, reserve_pks=allocator)
+        for person in first:
+            person.save(force_insert=True)
+        allocator.written([Person])
+
+        third = mommy.prepare_many(Person, 3, reserve_pks=allocator)
+        keys = [p.pk for p in first + second + third]
+        self.assertEqual(keys, range(keys[0], keys[0] + 9))
+
+    def test_reserved_graph_can_be_written_children_first(self):
+        from model_mommy import mommy
+        from model_mommy.keys import MaxKeyAllocator
+        from model_mommy.models import Dog, Person
+
+        dogs = mommy.prepare_many(Dog, 5, reserve_pks=MaxKeyAllocator())
+        self.assertTrue(all(dog.pk and dog.owner_id == dog.owner.pk for dog in dogs))
+
+        Dog.objects.bulk_create(dogs)
+        Person.objects.bulk_create([dog.owner for dog in dogs])
+        self.assertEqual(Dog.objects.filter(owner__in=Person.objects.all()).count(), 5)
+
+    def test_counter_allocator_counts_per_model(self):
+        from model_mommy import mommy
+        from model_mommy.keys import CounterAllocator
+        from model_mommy.models import Dog
+
+        dogs = mommy.prepare_many(Dog, 3, reserve_pks=CounterAllocator(start=100))
+        self.assertEqual([dog.pk for dog in dogs], [100, 101, 102])
+        self.assertEqual([dog.owner.pk for dog in dogs], [100, 101, 102])
+        self.assertEqual(dogs[0]._state.reserved_pk, True)
+
+    def test_callable_allocator(self):
+        from model_mommy import mommy
+        from model_mommy.models import Person
+
+        people = mommy.prepare_many(Person, 2,
+            reserve_pks=lambda model, count: range(500, 500 + count))
+        self.assertEqual([p.pk for p in people], [500, 501])
+
+        from model_mommy.keys import CallableAllocator
+        self.assertRaises(ValueError, CallableAllocator(lambda model, count: []).reserve, Person, 2)
+
+    def test_bulk_write_uses_the_mommy_allocator(self):
+        from model_mommy.base import Mommy
+        from model_mommy.keys import CounterAllocator
+        from model_mommy.models import Dog, Person
+
+        class CountingMommy(Mommy):
+            key_allocator = CounterAllocator(start=1000)
+
+        CountingMommy(Dog).make_many(4, bulk=True)
+        self.assertEqual(sorted(Person.objects.values_list('pk', flat=True)),
+            [1000, 1001, 1002, 1003])
+
+
+class TestParentPools(TestCase):
+    def test_make_many_shares_a_pool_of_parents(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        dogs = mommy.make_many(Dog, 20, parents={'owner': 3})
+        owners = set(Person.objects.values_list('pk', flat=True))
+        self.assertEqual(len(owners), 3)
+        self.assertTrue(set(dog.owner_id for dog in dogs) <= owners)
+        self.assertEqual(set(Dog.objects.values_list('owner', flat=True)),
+            set(dog.owner_id for dog in dogs))
+
+    def test_bulk_make_many_writes_the_pool_once(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        # owners and dogs key reservations and inserts
+        with self.assertNumQueries(4):
+            mommy.make_many(Dog, 20, bulk=True, parents={'owner': 3}, seed=1)
+        self.assertEqual(Person.objects.count(), 3)
+        self.assertEqual(Dog.objects.filter(owner__in=Person.objects.all()).count(), 20)
+
+    def test_prepare_many_shares_prepared_parents(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        dogs = mommy.prepare_many(Dog, 20, parents={'owner': 2}, seed=1)
+        self.assertEqual(len(set(id(dog.owner) for dog in dogs)), 2)
+        self.assertEqual(Person.objects.count(), 0)
+
+    def test_pools_are_reproducible_with_a_seed(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog
+
+        def owners():
+            dogs = mommy.prepare_many(Dog, 10, seed=3, parents={'owner': 4})
+            return [dog.owner.name for dog in dogs]
+        self.assertEqual(owners(), owners())
+
+    def test_reuse_existing_samples_rows_with_one_query(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        people = mommy.make_many(Person, 4)
+
+        # primary keys, then one insert per dog
+        with self.assertNumQueries(11):
+            dogs = mommy.make_many(Dog, 10, reuse_existing=True)
+        self.assertEqual(Person.objects.count(), 4)
+        self.assertTrue(set(dog.owner_id for dog in dogs) <= set(p.pk for p in people))
+
+    def test_reuse_existing_makes_parents_for_empty_tables(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        mommy.make_many(Dog, 3, reuse_existing=True)
+        self.assertEqual(Person.objects.count(), 3)
+
+    def test_given_values_are_not_pooled(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        owner = mommy.make_one(Person)
+        dogs = mommy.make_many(Dog, 3, owner=owner, parents={'owner': 2})
+        self.assertEqual(set(dog.owner for dog in dogs), set([owner]))
+        self.assertEqual(Person.objects.count(), 1)
+
+    def test_unknown_parents_raise_value_error(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog
+
+        self.assertRaises(ValueError, mommy.make_many, Dog, 3, parents={'breed': 2})
+        self.assertRaises(ValueError, mommy.make_many, Dog, 3, parents={'owner': 0})
+
+    def test_unique_relations_cant_share_parents(self):
+        from model_mommy import mommy
+        from model_mommy.models import DummyOneToOneModel, DummyRelationModel
+
+        self.assertRaises(ValueError, mommy.make_many, DummyOneToOneModel, 5,
+            parents={'one_to_one_field': 2})
+        self.assertRaises(ValueError, mommy.prepare_many, DummyOneToOneModel, 5,
+            parents={'one_to_one_field': 5})
+        self.assertEqual(DummyOneToOneModel.objects.count(), 0)
+        self.assertEqual(DummyRelationModel.objects.count(), 0)
+
+
+class TestClonedPrepare(TestCase):
+    def test_clones_share_the_prototype_values(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog
+
+        dogs = mommy.prepare_many(Dog, 10, clone=True)
+        self.assertEqual(len(set(id(dog) for dog in dogs)), 10)
+        self.assertEqual(len(set(id(dog._state) for dog in dogs)), 10)
+        self.assertEqual(set(dog.breed for dog in dogs), set([dogs[0].breed]))
+        self.assertTrue(all(dog.owner is dogs[0].owner for dog in dogs))
+
+    def test_named_and_drawn_fields_vary(self):
+        from model_mommy import mommy
+        from model_mommy.distributions import Weighted
+        from model_mommy.models import Person
+
+        people = mommy.prepare_many(Person, 20, clone=['name'], seed=2,
+            distributions={'age': Weighted({1: 1, 2: 1})})
+        self.assertEqual(len(set(p.name for p in people)), 20)
+        self.assertEqual(set(p.age for p in people), set([1, 2]))
+        self.assertEqual(set(p.email for p in people), set([people[0].email]))
+
+        for person in people:
+            person.save()
+        self.assertEqual(Person.objects.count(), 20)
+
+    def test_unique_fields_vary(self):
+        from model_mommy import mommy
+        from model_mommy.models import DummyOneToOneModel
+
+        instances = mommy.prepare_many(DummyOneToOneModel, 5, clone=True)
+        self.assertEqual(len(set(id(i.one_to_one_field) for i in instances)), 5)
+
+    def test_clone_refuses_unknown_fields(self):
+        from model_mommy import mommy
+        from model_mommy.models import Person
+
+        self.assertRaises(ValueError, mommy.prepare_many, Person, 2, clone=['nope'])
+
+
+class TestLazyPrepare(TestCase):
+    def test_fields_are_generated_on_first_access(self):
+        from model_mommy import mommy
+        from model_mommy.lazy import is_lazy
+        from model_mommy.models import Person
+
+        person = mommy.prepare_one(Person, lazy=True, name='Ann', fill_null=True)
+        self.assertTrue(is_lazy(person))
+        self.assertTrue(isinstance(person, Person))
+        self.assertEqual(person.name, 'Ann')
+        self.assertFalse('bio' in person.__dict__ or 'email' in person.__dict__)
+
+        email = person.email
+        self.assertTrue(email)
+        self.assertEqual(person.email, email)
+        self.assertFalse('bio' in person.__dict__)
+
+    def test_related_instances_are_lazy_too(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        dog = mommy.prepare_one(Dog, lazy=True)
+        self.assertFalse('owner_id' in dog.__dict__)
+        self.assertTrue(isinstance(dog.owner, Person))
+        self.assertTrue(dog.owner is dog.owner)
+
+    def test_file_fields_are_generated_right_away(self):
+        from model_mommy import mommy
+        from model_mommy.models import DummyFileModel, DummyImageModel
+
+        instance = mommy.prepare_one(DummyFileModel, lazy=True)
+        self.assertTrue(instance.file_field.name)
+        instance = mommy.prepare_one(DummyImageModel, lazy=True)
+        self.assertTrue(instance.image_field.name)
+
+    def test_save_materializes_every_field(self):
+        from django.db.models.signals import pre_save
+        from model_mommy import mommy
+        from model_mommy.lazy import is_lazy
+        from model_mommy.models import Dog, Person
+
+        senders = []
+        receiver = lambda sender, **kwargs: senders.append(sender)
+        pre_save.connect(receiver)
+        try:
+            dog = mommy.prepare_one(Dog, lazy=True)
+            dog.owner.save()
+            dog.owner = dog.owner
+            dog.save()
+        finally:
+            pre_save.disconnect(receiver)
+
+        self.assertFalse(is_lazy(dog))
+        self.assertTrue(dog.__class__ is Dog)
+        self.assertEqual(senders, [Person, Dog])
+        self.assertEqual(Dog.objects.get().breed, dog.breed)
+
+    def test_lazy_instances_can_be_pickled(self):
+        import pickle
+        from model_mommy import mommy
+        from model_mommy.models import Person
+
+        person = pickle.loads(pickle.dumps(mommy.prepare_one(Person, lazy=True)))
+        self.assertTrue(person.__class__ is Person)
+        self.assertTrue(person.email)
+
+
+class TestMommyIterMake(TestCase):
+    def test_iter_make_writes_one_chunk_at_a_time(self):
+        from model_mommy import mommy
+        from model_mommy.models import Person
+
+        people = mommy.iter_make(Person, 7, chunk_size=3)
+        self.assertEqual(Person.objects.count(), 0)
+
+        people.next()
+        self.assertEqual(Person.objects.count(), 3)
+
+        self.assertEqual(len(list(people)), 6)
+        self.assertEqual(Person.objects.count(), 7)
+
+    def test_iter_make_calls_back_each_flushed_chunk(self):
+        from model_mommy import mommy
+        from model_mommy.models import Person
+
+        sizes = []
+        people = mommy.iter_make(Person, 7, chunk_size=3, name='Mike',
+            callback=lambda chunk: sizes.append(len(chunk)))
+
+        for person in people:
+            self.assertEqual(person.name, 'Mike')
+        self.assertEqual(sizes, [3, 3, 1])
+
+    def test_iter_make_yields_instances_with_primary_keys(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        dogs = list(mommy.iter_make(Dog, 5, chunk_size=2))
+        self.assertEqual(sorted(dog.pk for dog in dogs), sorted(Dog.objects.values_list('pk', flat=True)))
+        self.assertEqual(Person.objects.filter(dog__in=[dog.pk for dog in dogs]).count(), 5)
+
+        people = list(mommy.iter_make(Person, 3, pipeline=True))
+        self.assertTrue(all(person.pk for person in people))
+
+    def test_iter_prepare_does_not_persist(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        dogs = list(mommy.iter_prepare(Dog, 5, chunk_size=2))
+        self.assertEqual(len(dogs), 5)
+        self.assertTrue(all(isinstance(dog.owner, Person) for dog in dogs))
+        self.assertEqual(Person.objects.count(), 0)
+        self.assertEqual(Dog.objects.count(), 0)
+
+
+class TestPipelinedMake(TestCase):
+    def test_pipelined_make_many_writes_every_batch(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        reports = []
+        dogs = mommy.make_many(Dog, 25, batch_size=10, pipeline=True,
+            progress=lambda stats: reports.append((stats.rows, stats.batches)))
+        self.assertEqual(len(dogs), 25)
+        self.assertTrue(all(dog.owner_id for dog in dogs))
+        self.assertEqual(Dog.objects.filter(owner__in=Person.objects.all()).count(), 25)
+        self.assertEqual(reports, [(10, 1), (20, 2), (25, 3)])
+
+    def test_pipelined_make_many_is_reproducible(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog
+
+        pipelined = mommy.make_many(Dog, 12, batch_size=5, pipeline=3, seed=2)
+        plain = mommy.prepare_many(Dog, 12, seed=2)
+        self.assertEqual([(d.breed, d.owner.name) for d in pipelined],
+            [(d.breed, d.owner.name) for d in plain])
+
+    def test_pipelined_iter_make_can_stop_early(self):
+        from model_mommy import mommy
+        from model_mommy.models import Person
+
+        people = mommy.iter_make(Person, 100, chunk_size=10, pipeline=1)
+        people.next()
+        people.close()
+        self.assertEqual(Person.objects.count(), 10)
+
+    def test_generation_errors_reach_the_writer(self):
+        from model_mommy.pipeline import pipelined
+
+        def batches():
+            yield [1]
+            raise KeyError('boom')
+
+        written = []
+        self.assertRaises(KeyError, list, pipelined(batches(), written.append))
+        self.assertEqual(written, [[1]])
+
+    def test_throughput_names_the_bottleneck(self):
+        import time
+        from model_mommy.pipeline import pipelined
+
+        stats = []
+        slow_write = lambda batch: time.sleep(0.02)
+        list(pipelined(([i] for i in range(5)), slow_write, 1, stats.append))
+        self.assertEqual(stats[-1].rows, 5)
+        self.assertEqual(stats[-1].bottleneck, 'database')
+
+
+class TestMommyMakeRaw(TestCase):
+    def test_make_raw_writes_rows_with_one_query_per_batch(self):
+        from model_mommy import mommy
+        from model_mommy.models import Person
+
+        with self.assertNumQueries(3):
+            count = mommy.make_raw(Person, 50, batch_size=20)
+        self.assertEqual(count, 50)
+        self.assertEqual(Person.objects.count(), 50)
+
+        import datetime
+        for person in Person.objects.all():
+            self.assertTrue(isinstance(person.appointment, datetime.datetime))
+            self.assertTrue(person.gender in ('M', 'F'))
+
+    def test_make_raw_keeps_attrs_and_defaults(self):
+        from model_mommy import mommy
+        from model_mommy.models import Person
+
+        mommy.make_raw(Person, 3, name='Bob', bio=None, fill_null=False)
+        self.assertEqual(set(Person.objects.values_list('name', 'bio')), set([('Bob', None)]))
+
+    def test_make_raw_picks_parents_from_pools(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        mommy.make_raw(Dog, 20, parents={'owner': 2})
+        self.assertEqual(Person.objects.count(), 2)
+        self.assertEqual(Dog.objects.filter(owner__in=Person.objects.all()).count(), 20)
+
+        mommy.make_raw(Dog, 10)
+        self.assertEqual(Person.objects.count(), 2)
+        self.assertEqual(Dog.objects.filter(owner__in=Person.objects.all()).count(), 30)
+
+    def test_make_raw_needs_parents(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        self.assertRaises(ValueError, mommy.make_raw, Dog, 2)
+        owner = mommy.make_one(Person)
+        self.assertRaises(ValueError, mommy.make_raw, Dog, 2, reuse_existing=False)
+
+        mommy.make_raw(Dog, 2, owner=owner)
+        self.assertEqual(owner.dog_set.count(), 2)
+
+
+class TestPrepareColumns(TestCase):
+    def test_prepare_columns_holds_one_column_per_field(self):
+        from array import array
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        person = mommy.make_one(Person)
+        columns = mommy.prepare_columns(Dog, 30, batch_size=7)
+        self.assertEqual(len(columns), 30)
+        self.assertEqual(columns.names, ['owner_id', 'breed'])
+        self.assertTrue(isinstance(columns['owner_id'], array))
+        self.assertEqual(list(columns['owner_id']), [person.pk] * 30)
+        self.assertEqual(Dog.objects.count(), 0)
+
+    def test_blank_values_turn_array_columns_into_lists(self):
+        from model_mommy.columns import Columns
+        from model_mommy.models import DummyIntModel
+
+        fields = [DummyIntModel._meta.get_field(name) for name in ('int_field', 'small_int_field')]
+        columns = Columns(fields)
+        columns.extend([{'int_field': 1, 'small_int_field': 1}] * 3)
+        columns.extend([{'int_field': 2, 'small_int_field': 2}, {'int_field': '', 'small_int_field': 3}])
+        self.assertEqual(len(columns), 5)
+        self.assertEqual(columns['int_field'], [1, 1, 1, 2, ''])
+        self.assertEqual(list(columns['small_int_field']), [1, 1, 1, 2, 3])
+
+        columns.extend([{'int_field': 3, 'small_int_field': 1 << 70}])
+        self.assertEqual(len(columns), 6)
+        self.assertEqual(columns['small_int_field'], [1, 1, 1, 2, 3, 1 << 70])
+
+    def test_columns_are_written_as_csv(self):
+        import csv
+        from StringIO import StringIO
+        from model_mommy import mommy
+        from model_mommy.models import Person
+
+        columns = mommy.prepare_columns(Person, 10, name=u'Jos\xe9', bio=None)
+        out = StringIO()
+        columns.to_csv(out, delimiter='\t')
+
+        rows = list(csv.reader(StringIO(out.getvalue()), delimiter='\t'))
+        self.assertEqual(rows[0], columns.names)
+        self.assertEqual(len(rows), 11)
+        name, bio = columns.names.index('name'), columns.names.index('bio')
+        self.assertEqual(set((row[name], row[bio]) for row in rows[1:]),
+            set([('Jos\xc3\xa9', '')]))
+
+    def test_columns_match_seeded_raw_rows(self):
+        from model_mommy import mommy
+        from model_mommy.models import Person
+
+        columns = mommy.prepare_columns(Person, 5, seed=4)
+        mommy.make_raw(Person, 5, seed=4)
+        self.assertEqual(list(columns['name']),
+            list(Person.objects.order_by('pk').values_list('name', flat=True)))
+
+
+class TestSeededMommy(TestCase):
+    def values(self, instance):
+        return [getattr(instance, f.attname) for f in instance._meta.fields]
+
+    def test_same_seed_generates_same_data(self):
+        from model_mommy import mommy
+        from model_mommy.models import Person
+
+        people = mommy.prepare_many(Person, 10, seed=42)
+        same_people = mommy.prepare_many(Person, 10, seed=42)
+        other_people = mommy.prepare_many(Person, 10, seed=43)
+
+        self.assertEqual(map(self.values, people), map(self.values, same_people))
+        self.assertNotEqual(map(self.values, people), map(self.values, other_people))
+
+    def test_related_instances_use_the_same_seed(self):
+        from model_mommy.mommy import Mommy
+        from model_mommy.models import Dog
+
+        dog = Mommy(Dog, seed=7).prepare()
+        same_dog = Mommy(Dog, seed=7).prepare()
+        self.assertEqual(self.values(dog.owner), self.values(same_dog.owner))
+
+    def test_seeded_mommy_does_not_touch_global_random(self):
+        import random
+        from model_mommy import mommy
+        from model_mommy.models import Person
+
+        random.seed(1)
+        expected = random.random()
+
+        random.seed(1)
+        mommy.prepare_many(Person, 3, seed=42)
+        self.assertEqual(random.random(), expected)
+
+
+class TestParallelMommy(TestCase):
+    def values(self, instance):
+        return [getattr(instance, f.attname) for f in instance._meta.fields]
+
+    def test_parallel_prepare_many_is_reproducible_for_any_worker_count(self):
+        from model_mommy.mommy import Mommy
+        from model_mommy.models import Person
+        from model_mommy.parallel import parallel_prepare
+
+        people = Mommy(Person, seed=3).prepare_many(25, workers=2)
+        same_people = parallel_prepare(Mommy(Person, seed=3), 25, 3, chunk_size=4)
+        other_people = parallel_prepare(Mommy(Person, seed=3), 25, 2, chunk_size=4)
+        self.assertEqual(map(self.values, same_people), map(self.values, other_people))
+        same_people = Mommy(Person, seed=3).prepare_many(25, workers=3)
+
+        self.assertEqual(len(people), 25)
+        self.assertEqual(map(self.values, people), map(self.values, same_people))
+        self.assertEqual(Person.objects.count(), 0)
+
+    def test_unseeded_workers_keep_the_real_clock(self):
+        from model_mommy.constants import SEEDED_NOW
+        from model_mommy.mommy import Mommy
+        from model_mommy.models import Person
+
+        people = Mommy(Person).prepare_many(4, workers=2)
+        self.assertTrue(all(person.appointment != SEEDED_NOW for person in people))
+
+        people = Mommy(Person, seed=1).prepare_many(4, workers=2)
+        self.assertTrue(all(person.appointment == SEEDED_NOW for person in people))
+
+    def test_workers_report_to_the_observer(self):
+        from model_mommy.mommy import Mommy
+        from model_mommy.models import Person
+        from model_mommy.profiling import Profile
+
+        mom = Mommy(Person)
+        mom.observer = Profile()
+        mom.prepare_many(4, workers=2)
+        self.assertEqual(mom.observer.generators[('Person', 'name', 'value_for_charfield')][0], 4)
+
+        mom.observer = object()
+        self.assertRaises(ValueError, mom.prepare_many, 4, workers=2)
+
+    def test_workers_get_the_preloaded_unique_values(self):
+        from model_mommy import mommy
+        from model_mommy.mommy import Mommy
+        from model_mommy.models import DummyUniqueModel
+
+        existing = mommy.make_many(DummyUniqueModel, 5, seed=1)
+        rows = Mommy(DummyUniqueModel, seed=1, preload_unique=True).prepare_many(5, workers=2)
+        self.assertFalse(set(row.code for row in rows) & set(row.code for row in existing))
+        self.assertFalse(set(row.email for row in rows) & set(row.email for row in existing))
+
+    def test_parallel_make_many_commits_related_instances(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        dogs = mommy.make_many(Dog, 6, workers=2, breed='pug')
+        self.assertEqual(Dog.objects.filter(breed='pug').count(), 6)
+        self.assertEqual(Person.objects.count(), 6)
+        self.assertTrue(all(dog.owner_id for dog in dogs))
+
+    def test_parallel_make_many_commits_parents_with_generated_keys(self):
+        from model_mommy import mommy
+        from model_mommy.models import Code, Item
+
+        mommy.make_many(Item, 3, workers=2)
+        self.assertEqual(Code.objects.count(), 3)
+        self.assertEqual(Item.objects.filter(code__in=Code.objects.all()).count(), 3)
+
+        mommy.make_many(Item, 3, pipeline=True)
+        self.assertEqual(Code.objects.count(), 6)
+        self.assertEqual(Item.objects.filter(code__in=Code.objects.all()).count(), 6)
+
+    def test_parallel_make_many_with_parent_pools(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        dogs = mommy.make_many(Dog, 6, workers=2, parents={'owner': 2}, seed=1)
+        self.assertEqual(Dog.objects.count(), 6)
+        self.assertEqual(Person.objects.count(), 2)
+        self.assertTrue(all(dog.owner_id for dog in dogs))
+
+
+class TestThreadedMommy(TestCase):
+    def values(self, dog):
+        return (dog.breed, dog.owner.name, dog.owner.age)
+
+    def tearDown(self):
+        from model_mommy.pool import close_pool
+        close_pool()
+
+    def test_threaded_make_many_is_reproducible_for_any_thread_count(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        dogs = mommy.make_many(Dog, 25, threads=3, batch_size=4, seed=3)
+        self.assertEqual(Dog.objects.count(), 25)
+        self.assertEqual(Person.objects.count(), 25)
+        self.assertTrue(all(dog.pk and dog.owner_id for dog in dogs))
+
+        same_dogs = mommy.make_many(Dog, 25, threads=2, batch_size=4, seed=3)
+        self.assertEqual(map(self.values, dogs), map(self.values, same_dogs))
+
+    def test_threaded_bulk_make_many_shares_pools(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        mommy.make_many(Dog, 30, threads=4, batch_size=5, bulk=True,
+            parents={'owner': 3}, seed=1)
+        self.assertEqual(Person.objects.count(), 3)
+        self.assertEqual(Dog.objects.filter(owner__in=Person.objects.all()).count(), 30)
+
+    def test_chunks_draw_from_their_own_generator(self):
+        from model_mommy import mommy
+        from model_mommy.models import Person
+
+        people = mommy.make_many(Person, 8, threads=2, batch_size=4, seed=5)
+        names = [p.name for p in people]
+        self.assertNotEqual(names[:4], names[4:])
+        self.assertEqual(len(set(names)), 8)
+
+
 class TestMommyClassAPI(TestCase):
     def test_get_all_fields_method(self):
         from model_mommy.base import Mommy
@@ -377,6 +1123,155 @@ class TestFillNullables(TestCase):
         self.assertEqual(p.bio, None)
 
 
+class TestMinimalMommy(TestCase):
+    def test_minimal_generates_required_fields_only(self):
+        from model_mommy import mommy
+        from model_mommy.models import Car, Person
+
+        person = mommy.make_one(Person, minimal=True)
+        self.assertEqual(person.bio, None)
+        self.assertEqual(person.happy, True)
+        self.assertTrue(person.name and person.email and person.birthday)
+
+        car = mommy.make_one(Car, minimal=True)
+        self.assertEqual((car.color, car.accessories), (0, ''))
+
+    def test_minimal_makes_required_parents(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person
+
+        dogs = mommy.make_many(Dog, 3, minimal=True)
+        self.assertEqual(Person.objects.filter(bio=None).count(), 3)
+        self.assertTrue(all(dog.owner_id for dog in dogs))
+
+    def test_minimal_mommy_subclass(self):
+        from model_mommy.mommy import Mommy
+        from model_mommy.models import Person
+
+        class MinimalMommy(Mommy):
+            minimal = True
+
+        people = [MinimalMommy(Person).prepare() for i in range(10)]
+        self.assertEqual(set(p.bio for p in people), set([None]))
+
+        # plans are cached per mode
+        full = Mommy(Person, fill_null=True, minimal=True).prepare()
+        self.assertEqual(full.bio, None)
+        self.assertTrue(Mommy(Person, fill_null=True).prepare().bio)
+
+
+class TestUniqueValues(TestCase):
+    def constant_mommy(self):
+        from model_mommy.mommy import Mommy
+
+        class ConstantMommy(Mommy):
+            def value_for_codefield(self, field):
+                return 'a'
+
+            def value_for_rankfield(self, field):
+                return 7
+
+        return ConstantMommy
+
+    def test_unique_values_dont_collide(self):
+        from model_mommy import mommy
+        from model_mommy.models import DummyUniqueModel
+
+        mommy.make_many(DummyUniqueModel, 30, bulk=True)
+        rows = DummyUniqueModel.objects.values_list('letter', 'slot', 'rank')
+        self.assertEqual(len(rows), 30)
+        self.assertEqual(len(set(row[0] for row in rows)), 30)
+
+    def test_colliding_values_are_numbered(self):
+        from model_mommy.models import DummyUniqueModel
+
+        instances = self.constant_mommy()(DummyUniqueModel).prepare_many(12)
+        codes = [i.code for i in instances]
+        self.assertEqual(codes[:3], ['a', 'a1', 'a2'])
+        self.assertEqual(len(set(codes)), 12)
+        self.assertEqual(len(set((i.slot, i.rank) for i in instances)), 12)
+
+        for instance in instances:
+            instance.save()
+        self.assertEqual(DummyUniqueModel.objects.count(), 12)
+
+    def test_numbered_values_fit_the_field(self):
+        from model_mommy.unique import numbered
+        from model_mommy.models import DummyUniqueModel
+
+        field = DummyUniqueModel._meta.get_field
+        self.assertEqual(numbered(field('code'), 'abc', 12), 'a12')
+        self.assertEqual(numbered(field('email'), 'abcdefgh@example.com', 3), 'abcdefg3@example.com')
+        self.assertEqual(numbered(field('slot'), 1, 3), 2)
+        self.assertEqual(numbered(field('slot'), 1, 4), None)
+        self.assertEqual(numbered(field('letter'), 'x', 10), 'a')
+        self.assertEqual(numbered(field('letter'), 'x', 9 + 256), u'\xff')
+        self.assertEqual(numbered(field('letter'), 'x', 9 + 257), None)
+
+    def test_running_out_of_values(self):
+        from model_mommy.mommy import Mommy
+        from model_mommy.models import DummyUniqueModel
+
+        class LetterMommy(Mommy):
+            def value_for_letterfield(self, field):
+                return 'x'
+
+        # x, 9 digit suffixes, then the other single characters
+        self.assertEqual(len(LetterMommy(DummyUniqueModel).prepare_many(256)), 256)
+        self.assertRaises(ValueError, LetterMommy(DummyUniqueModel).prepare_many, 257)
+
+    def test_short_fields_get_every_value(self):
+        from model_mommy import mommy
+        from model_mommy.models import DummyUniqueModel
+
+        mommy.make_many(DummyUniqueModel, 256, bulk=True)
+        letters = DummyUniqueModel.objects.values_list('letter', flat=True)
+        self.assertEqual(len(set(letters)), 256)
+
+    def test_provided_values_are_kept(self):
+        from model_mommy.models import DummyUniqueModel
+
+        instances = self.constant_mommy()(DummyUniqueModel).prepare_many(3, code='zz')
+        self.assertEqual([i.code for i in instances], ['zz'] * 3)
+
+    def test_preload_unique(self):
+        from model_mommy import mommy
+        from model_mommy.models import DummyUniqueModel
+
+        mommy.make_one(DummyUniqueModel, code='a')
+        ConstantMommy = self.constant_mommy()
+        self.assertEqual(ConstantMommy(DummyUniqueModel).prepare().code, 'a')
+
+        preloaded = ConstantMommy(DummyUniqueModel, preload_unique=True)
+        self.assertEqual(preloaded.prepare().code, 'a1')
+        preloaded.make()
+        self.assertEqual(DummyUniqueModel.objects.count(), 2)
+
+    def test_preload_unique_with_pipeline(self):
+        from model_mommy import mommy
+        from model_mommy.models import DummyUniqueModel
+
+        mommy.make_one(DummyUniqueModel, code='a')
+        instances = self.constant_mommy()(DummyUniqueModel, preload_unique=True).make_many(
+            3, pipeline=True)
+        self.assertEqual([i.code for i in instances], ['a1', 'a2', 'a3'])
+
+        mommy.make_many(DummyUniqueModel, 10, pipeline=True, preload_unique=True)
+        self.assertEqual(DummyUniqueModel.objects.count(), 14)
+
+    def test_clones_and_lazy_instances_are_unique(self):
+        from model_mommy.models import DummyUniqueModel
+
+        mom = self.constant_mommy()(DummyUniqueModel)
+        clones = mom.prepare_many(5, clone=True)
+        self.assertEqual(len(set(i.code for i in clones)), 5)
+        self.assertEqual(len(set((i.slot, i.rank) for i in clones)), 5)
+
+        lazy = mom.prepare(lazy=True)
+        self.assertTrue('code' in lazy.__dict__)
+        self.assertEqual(lazy.code, 'a5')
+
+
 class TestFillingFromChoice(FieldFillingTestCase):
     def test_if_gender_is_populated_from_choices(self):
         from model_mommy.models import GENDER_CH
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+from django.test import TestCase
+
+
+class TestAsyncMommy(TestCase):
+    def tearDown(self):
+        from model_mommy.pool import close_pool
+        close_pool()
+
+    def test_amake_one_returns_right_away(self):
+        from model_mommy import mommy
+        from model_mommy.models import Person
+
+        result = mommy.amake_one(Person, name='Ann')
+        person = result.get(5)
+        self.assertEqual(person.name, 'Ann')
+        self.assertEqual(Person.objects.get().pk, person.pk)
+
+    def test_independent_models_are_made_concurrently(self):
+        from model_mommy import mommy
+        from model_mommy.models import Car, Dog, Person
+        from model_mommy.pool import gather
+
+        dogs, cars, people = gather([mommy.amake_many(Dog, 4), mommy.amake_many(Car, 3),
+            mommy.aprepare_many(Person, 5)], timeout=5)
+        self.assertEqual((len(dogs), len(cars), len(people)), (4, 3, 5))
+        self.assertEqual(Dog.objects.count(), 4)
+        self.assertEqual(Car.objects.count(), 3)
+        self.assertEqual(Person.objects.count(), 4)  # the dogs owners
+
+    def test_callback_runs_in_a_pool_thread(self):
+        from model_mommy import mommy
+        from model_mommy.models import Person
+
+        done = threading.Event()
+        seen = []
+
+        def callback(people):
+            seen.append((len(people), threading.current_thread().name))
+            done.set()
+
+        mommy.aprepare_many(Person, 3, callback=callback, seed=1)
+        done.wait(5)
+        self.assertEqual(seen[0][0], 3)
+        self.assertNotEqual(seen[0][1], threading.current_thread().name)
+
+    def test_errors_are_raised_by_get(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog
+
+        result = mommy.amake_many(Dog, 2, parents={'nope': 1})
+        self.assertRaises(ValueError, result.get, 5)
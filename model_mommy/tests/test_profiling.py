@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+from StringIO import StringIO
+
+from django.test import TestCase
+
+
+class TestProfiling(TestCase):
+    def test_records_generators_per_field(self):
+        from model_mommy import mommy
+        from model_mommy.models import Person
+        from model_mommy.profiling import profile
+
+        with profile() as report:
+            mommy.prepare_many(Person, 3, fill_null=True)
+
+        calls, seconds, size = report.generators[('Person', 'name', 'value_for_charfield')]
+        self.assertEqual(calls, 3)
+        self.assertTrue(size > 0)
+        self.assertEqual(report.generators[('Person', 'gender', 'choices')][0], 3)
+        self.assertEqual(report.generators[('Person', 'age', 'value_for_integerfield')][2], 0)
+        # blank fields may skip their generator
+        self.assertTrue(0 < report.models()['Person'][0] <= 3 * len(Person._meta.fields[1:]))
+
+    def test_records_related_generation_and_writes(self):
+        from model_mommy import mommy
+        from model_mommy.models import Dog, Person, Store
+        from model_mommy.profiling import profile
+
+        with profile() as report:
+            mommy.make_one(Dog)
+            people = mommy.make_many(Person, 2)
+            mommy.make_one(Store, customers=people)
+
+        self.assertEqual(report.generators[('Dog', 'owner', 'value_for_foreignkey')][0], 1)
+        self.assertEqual(report.writes[('Dog', 'save')][:1], [1])
+        self.assertEqual(report.writes[('Person', 'save')][0], 3)
+        calls, seconds, queries, query_seconds = report.writes[('Store', 'm2m add customers')]
+        self.assertEqual(calls, 1)
+        self.assertTrue(queries > 0)
+
+    def test_records_bulk_inserts(self):
+        from model_mommy import mommy
+        from model_mommy.models import Person
+        from model_mommy.profiling import profile
+
+        with profile() as report:
+            mommy.make_many(Person, 10, bulk=True)
+
+        self.assertEqual(report.writes[('Person', 'bulk insert')][0], 1)
+
+    def test_observer_is_removed_after_profiling(self):
+        from django.db import connection
+        from model_mommy.base import Mommy
+        from model_mommy.models import Person
+        from model_mommy.profiling import profile
+
+        class SubMommy(Mommy):
+            pass
+
+        use_debug_cursor = connection.use_debug_cursor
+        with profile(SubMommy) as report:
+            self.assertTrue(SubMommy(Person).observer is report)
+            self.assertTrue(Mommy(Person).observer is None)
+            SubMommy(Person).prepare()
+
+        self.assertTrue(SubMommy(Person).observer is None)
+        self.assertFalse('observer' in SubMommy.__dict__)
+        self.assertEqual(connection.use_debug_cursor, use_debug_cursor)
+
+        with profile():
+            pass
+        self.assertTrue(Mommy.observer is None)
+
+    def test_dump_sorts_slowest_first(self):
+        from model_mommy.profiling import Profile
+
+        report = Profile()
+        report.generators[('Person', 'name', 'value_for_charfield')] = [10, 0.001, 100]
+        report.generators[('Person', 'bio', 'value_for_textfield')] = [10, 0.5, 5000]
+        report.writes[('Person', 'save')] = [10, 0.2, 10, 0.1]
+
+        out = StringIO()
+        report.dump(out)
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[1].startswith('Person.bio'))
+        self.assertTrue(lines[2].startswith('Person.name'))
+        self.assertTrue(any(line.startswith('Person') and 'save' in line for line in lines))
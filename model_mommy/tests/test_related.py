@@ -112,3 +112,72 @@ class TestFillingSelfReferenceModels(TestCase):
 
         self.assertTrue(isinstance(m2m_field, ManyToManyField))
         self.assertEqual(m2m_value.count(), 0)
+
+
+class TestManyToManyFanOut(TestCase):
+    def test_fixed_fan_out_makes_missing_rows(self):
+        from model_mommy.models import Person, Store
+        from model_mommy import mommy
+
+        stores = mommy.make_many(Store, 4, m2m={'customers': 3})
+        self.assertEqual(Person.objects.count(), 3)
+        for store in stores:
+            self.assertEqual(store.customers.count(), 3)
+            self.assertEqual(store.employees.count(), 0)
+
+    def test_links_are_bulk_inserted_once_per_field(self):
+        from model_mommy.models import Person, Store
+        from model_mommy import mommy
+
+        mommy.make_many(Person, 30, bulk=True)
+
+        # existing people, stores key reservation, stores insert and one
+        # through table insert per field
+        with self.assertNumQueries(6):
+            stores = mommy.make_many(Store, 10, bulk=True, m2m={'customers': 20,
+                'employees': (1, 5)})
+
+        self.assertEqual(Person.objects.count(), 30)
+        Through = Store.customers.through
+        self.assertEqual(Through.objects.count(), 200)
+        for store in stores:
+            customers = store.customers.values_list('pk', flat=True)
+            self.assertEqual(len(set(customers)), 20)
+            self.assertTrue(1 <= store.employees.count() <= 5)
+
+    def test_fan_out_with_a_distribution(self):
+        from model_mommy.distributions import Normal
+        from model_mommy.models import Store
+        from model_mommy import mommy
+
+        stores = mommy.make_many(Store, 10, m2m={'customers': Normal(4, 1, low=2, high=6)})
+        self.assertTrue(all(2 <= store.customers.count() <= 6 for store in stores))
+
+    def test_symmetrical_links_are_mirrored(self):
+        from model_mommy.models import Penguin
+        from model_mommy import mommy
+
+        penguins = mommy.make_many(Penguin, 5, bulk=True, m2m={'parcel': 2})
+        for penguin in penguins:
+            fellows = penguin.parcel.all()
+            self.assertTrue(penguin not in fellows)
+            for fellow in fellows:
+                self.assertTrue(penguin in fellow.parcel.all())
+
+    def test_given_values_are_bulk_inserted(self):
+        from model_mommy.models import Person, Store
+        from model_mommy import mommy
+
+        customers = mommy.make_many(Person, 3)
+        # stores key reservation, stores insert, through table insert
+        with self.assertNumQueries(3):
+            stores = mommy.make_many(Store, 5, bulk=True, customers=customers)
+        for store in stores:
+            self.assertEqual(set(store.customers.all()), set(customers))
+
+    def test_unknown_fields_raise_value_error(self):
+        from model_mommy.models import Store
+        from model_mommy import mommy
+
+        self.assertRaises(ValueError, mommy.make_many, Store, 2, m2m={'owners': 2})
+        self.assertRaises(TypeError, mommy.make_many, Store, 2, m2m={'customers': '2'})
@@ -162,4 +162,72 @@ class TestUtilsRawHostnameMethods(TestCase):
 
         ext_list = ['com.br']
         value = raw_hostname(12, ext_list)
-        self.assertTrue(value.endswith('.com.br'))
\ No newline at end of file
+        self.assertTrue(value.endswith('.com.br'))
+
+class TestUtilsRawStrings(TestCase):
+    def test_raw_strings_output_lengths(self):
+        from model_mommy.utils import raw_strings
+        from model_mommy.constants import SLUG_TABLE
+
+        lengths = [0, 1, 7, 300]
+        values = raw_strings(lengths, SLUG_TABLE)
+        self.assertEqual(map(len, values), lengths)
+
+    def test_raw_strings_keep_table_alphabet(self):
+        from model_mommy.utils import raw_strings
+        from model_mommy.constants import ASCII_TABLE, SLUG_TABLE, LATIN1_TABLE, LATIN1_RANGE
+
+        for table in (ASCII_TABLE, SLUG_TABLE, LATIN1_TABLE):
+            text = u''.join(raw_strings([500, 500], table))
+            self.assertTrue(all(map(lambda c: c in table, text)))
+            self.assertEqual(type(text), unicode)
+
+        text = u''.join(raw_strings([500], LATIN1_RANGE))
+        self.assertTrue(all(map(lambda c: ord(c) <= LATIN1_RANGE[-1], text)))
+
+    def test_raw_string_uses_whole_table(self):
+        from model_mommy.utils import raw_string
+        from model_mommy.constants import SLUG_TABLE
+
+        self.assertEqual(set(raw_string(5000, SLUG_TABLE)), set(SLUG_TABLE))
+
+
+class TestNetworkGenerators(TestCase):
+    def test_raw_hostnames_are_valid(self):
+        import re
+        from model_mommy.network import raw_hostnames
+
+        label = re.compile(r'^[a-zA-Z0-9]([a-zA-Z0-9-]*[a-zA-Z0-9])?$')
+        lengths = [1, 2, 3, 63, 64, 200, 255]
+
+        for length, hostname in zip(lengths, raw_hostnames(lengths)):
+            self.assertLessEqual(len(hostname), length)
+            for part in hostname.split('.'):
+                self.assertTrue(label.match(part), hostname)
+                self.assertLessEqual(len(part), 63)
+
+    def test_raw_email_localparts_have_no_misplaced_dots(self):
+        from model_mommy.network import raw_email_localparts
+
+        lengths = [1, 2, 30, 250] * 25
+        for length, localpart in zip(lengths, raw_email_localparts(lengths)):
+            self.assertEqual(len(localpart), length)
+            self.assertFalse(localpart.startswith('.'))
+            self.assertFalse(localpart.endswith('.'))
+            self.assertNotIn('..', localpart)
+
+    def test_raw_emails_fit_max_length(self):
+        from model_mommy.network import raw_emails
+
+        emails = raw_emails(100, 254)
+        self.assertEqual(len(emails), 100)
+        for email in emails:
+            self.assertLessEqual(len(email), 254)
+            self.assertEqual(email.count('@'), 1)
+
+    def test_raw_urls_fit_max_length(self):
+        from model_mommy.network import raw_urls
+
+        for url in raw_urls(100, 200):
+            self.assertTrue(url.startswith('http://'))
+            self.assertLessEqual(len(url), 200)
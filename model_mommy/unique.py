@@ -0,0 +1,265 @@
+# -*- coding:utf-8 -*-
+
+__doc__ = '''
+Unique values: generated values are checked against the unique fields
+and unique_together constraints of their model, so big jobs don't stop
+on an IntegrityError halfway.
+
+Values taken by each constraint are kept as tuples in a set, so checks
+cost O(1) and compare values exactly. Colliding fields are generated
+again a few times, then numbered: integers count from 1, choices are
+taken in order and strings get a numeric suffix, then are spelled over
+an alphabet once suffixes don't fit anymore.
+Values set in attrs are never changed, nulls and new parents never
+collide. Values already in the database can be loaded first, with a
+single query.
+'''.strip()
+
+import string
+import threading
+from itertools import count
+
+from django.core.exceptions import ValidationError
+from django.db.models.fields.related import RelatedField
+
+from .constants import MAX_SMALL_INT, MAX_INT, MAX_BIG_INT, LATIN1_TABLE, SLUG_TABLE
+
+__all__ = ['UniqueValues', 'unique_constraints']
+
+MAX_TRIES = 10  # generations of a colliding value before numbering it
+
+MAX_NUMBERS = {
+    'BigIntegerField': MAX_BIG_INT,
+    'IntegerField': MAX_INT,
+    'PositiveIntegerField': MAX_INT,
+    'PositiveSmallIntegerField': MAX_SMALL_INT,
+    'SmallIntegerField': MAX_SMALL_INT,
+}
+
+SUFFIXED = ('CharField', 'SlugField', 'TextField', 'FileField', 'FilePathField',
+    'CommaSeparatedIntegerField')
+
+# strings are spelled with letters and digits first
+ALNUM = unicode(string.ascii_letters + string.digits)
+SPELLED = {
+    'CharField': ALNUM + u''.join(c for c in LATIN1_TABLE if c not in ALNUM),
+    'TextField': ALNUM + u''.join(c for c in LATIN1_TABLE if c not in ALNUM),
+    'SlugField': unicode(SLUG_TABLE),
+}
+
+_constraints = {}  # model -> unique constraints
+
+
+def unique_constraints(model):
+    """
+    Returns the unique constraints of model but its primary key, as a list
+    of field tuples. Unique related fields are left out, generated parents
+    are new rows anyway.
+
+    """
+    if model not in _constraints:
+        opts = model._meta
+        rt = [(field,) for field in opts.fields if field.unique and not
+            (field.primary_key or isinstance(field, RelatedField))]
+        rt.extend(tuple(opts.get_field(name) for name in names)
+            for names in opts.unique_together)
+        _constraints[model] = rt
+    return _constraints[model]
+
+
+def comparable(field, value):
+    """
+    Returns value as the database would compare it, or None if it can't
+    collide: nulls, and parents without a key yet.
+
+    """
+    if value is None:
+        return None
+    elif isinstance(field, RelatedField):
+        return getattr(value, 'pk', value)
+
+    try:
+        return field.to_python(value)
+    except (TypeError, ValueError, ValidationError):
+        return value
+
+
+def spelled(index, alphabet, size):
+    """
+    Returns the `index`th string of 1 to `size` characters of alphabet,
+    shortest first, or None past the last one.
+
+    """
+    base = len(alphabet)
+    for length in xrange(1, size + 1):
+        if index < base ** length:
+            chars = []
+            for i in xrange(length):
+                index, digit = divmod(index, base)
+                chars.append(alphabet[digit])
+            return u''.join(chars)
+        index -= base ** length
+    return None
+
+
+def numbered(field, value, number):
+    """
+    Returns the `number`th sequence value of field, based on the colliding
+    value, or None if there's none left. Strings too short for more
+    numeric suffixes are spelled over an alphabet instead.
+
+    """
+    if field.choices:
+        choices = [c[0] for c in field.choices]
+        if number > len(choices):
+            return None
+        return choices[number - 1]
+
+    kind = field.get_internal_type()
+    if kind in MAX_NUMBERS:
+        if number > MAX_NUMBERS[kind]:
+            return None
+        return number
+
+    elif kind in SUFFIXED:
+        # emails are numbered before the @
+        local, at, domain = unicode(value or '').rpartition('@')
+        if not at:
+            local, domain = domain, ''
+
+        suffix = str(number)
+        if field.max_length is None:
+            return local + suffix + at + domain
+
+        room = field.max_length - len(at + domain)
+        if len(suffix) <= room:
+            return local[:room - len(suffix)] + suffix + at + domain
+
+        alphabet = at and ALNUM or SPELLED.get(kind)
+        if alphabet is None:
+            return None
+        suffixes = 10 ** max(room, 0) - 1
+        local = spelled(number - suffixes - 1, alphabet, room)
+        return local and local + at + domain
+
+    return None
+
+
+class UniqueValues(object):
+    """
+    Values taken by the unique constraints of a model. Safe to share
+    between threads, and pickled with the values taken for worker processes.
+
+    """
+    def __init__(self, model):
+        self.model = model
+        self.constraints = unique_constraints(model)
+        self.names = set(field.name for fields in self.constraints for field in fields)
+        self.taken = [set() for fields in self.constraints]  # value tuples
+        self.numbers = [count(1) for fields in self.constraints]
+        self.loaded = False
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        # locks and fields don't pickle, they are rebuilt from the model
+        return self.model, self.taken, self.loaded
+
+    def __setstate__(self, state):
+        model, taken, loaded = state
+        self.__init__(model)
+        self.taken, self.loaded = taken, loaded
+
+    def __len__(self):
+        return len(self.constraints)
+
+    def load(self):
+        """
+        Adds the values already in the database, with a single query.
+
+        """
+        with self.lock:
+            if self.loaded:
+                return
+            self.loaded = True
+
+        fields = []
+        for field in (field for fields in self.constraints for field in fields):
+            if field not in fields:
+                fields.append(field)
+        positions = [[fields.index(field) for field in constraint]
+            for constraint in self.constraints]
+
+        rows = self.model._default_manager.values_list(*[f.attname for f in fields])
+        for row in rows.iterator():
+            for constraint, indexes, taken in zip(self.constraints, positions, self.taken):
+                key = self.__key([(field, row[i]) for field, i in zip(constraint, indexes)])
+                if key is not None:
+                    with self.lock:
+                        taken.add(key)
+
+    def check(self, mommy, values, generators):
+        """
+        Makes `values`, a dict of field name (or attname) -> value, unique
+        for every constraint. Colliding fields found in `generators`, a dict
+        of field name -> generate(mommy, field), are generated again, then
+        numbered. Changes values in place.
+
+        """
+        for index, fields in enumerate(self.constraints):
+            free = [field for field in fields if field.name in generators]
+
+            for i in xrange(MAX_TRIES):
+                if self.__claim(index, fields, values) or not free:
+                    break
+                for field in free:
+                    values[field.name] = generators[field.name](mommy, field)
+            else:
+                self.__number(index, fields, free[-1], values)
+
+    def __number(self, index, fields, field, values):
+        value = values[field.name]
+        numbers = self.numbers[index]
+
+        while True:
+            candidate = numbered(field, value, numbers.next())
+            if candidate is None:
+                raise ValueError('%s.%s ran out of unique values' % (
+                    self.model.__name__, field.name))
+
+            values[field.name] = candidate
+            if self.__claim(index, fields, values):
+                return
+
+    def __claim(self, index, fields, values):
+        """
+        Takes the values of a constraint. Returns False if they are taken.
+
+        """
+        pairs = []
+        for field in fields:
+            if field.name in values:
+                pairs.append((field, values[field.name]))
+            elif field.attname in values:
+                pairs.append((field, values[field.attname]))
+            else:
+                pairs.append((field, field.get_default()))
+
+        key = self.__key(pairs)
+        if key is None:
+            return True
+
+        taken = self.taken[index]
+        with self.lock:
+            if key in taken:
+                return False
+            taken.add(key)
+        return True
+
+    def __key(self, pairs):
+        values = []
+        for field, value in pairs:
+            value = comparable(field, value)
+            if value is None:
+                return None
+            values.append(value)
+        return tuple(values)
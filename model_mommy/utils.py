@@ -4,14 +4,14 @@ __doc__ = '''
 Some useful functions if you plan on overwriting mommy methods.
 '''.strip()
 
-import re
-import string
-from random import randint, choice
+import random
 
-from .constants import ASCII_TABLE
+from .constants import FILENAME_TABLE
+from .strings import random_text, random_texts
+from .network import raw_hostname_label, raw_hostname, raw_email_localpart
 
 
-def raw_string(length, table):
+def raw_string(length, table, rng=random):
     """
     Creates a random string with length equal to `length` using
     only characters from `table`
@@ -19,117 +19,60 @@ def raw_string(length, table):
     Keyword arguments:
     length -- length for the new string
     table -- string with usable characters or tuple with usable char code range
+    rng -- random generator to draw from
 
     """
-    if isinstance(table, basestring):
-        return u''.join([choice(table) for i in range(length)])
-    elif isinstance(table, tuple):
-        return u''.join([unichr(randint(*table)) for i in range(length)])
-    else:
-        raise TypeError("Unsupported table type provided.")
+    return random_text(length, table, rng)
 
 
-def raw_filename(length, ext_list=None):
+def raw_strings(lengths, table, rng=random):
     """
-    Creates a random filename with length up to `max_length`
-    and one of the given extensions. Make sure the biggest extension
-    length is smaller than `length`.
+    Creates one random string for each length in `lengths` using
+    only characters from `table`. Faster than calling raw_string
+    for each length.
 
     Keyword arguments:
-    length -- length for the new filename
-    ext_list -- list of valid extensions.
-
-    ref: http://en.wikipedia.org/wiki/Filename
-
-    """
-    char_table = re.sub(r'[/\?%*:|"<>]', '', ASCII_TABLE)
-
-    if ext_list is not None:
-        ext = choice(ext_list)
-    else:
-        ext = ''
-
-    name = raw_string(length - len(ext), char_table)
-    return name + ext
-
-
-def raw_email_localpart(length):
-    """
-    Creates the localpart for an e-mail.
-
-    ref: http://en.wikipedia.org/wiki/Email_address
+    lengths -- lengths for the new strings
+    table -- string with usable characters or tuple with usable char code range
+    rng -- random generator to draw from
 
     """
-    char_table = string.ascii_letters + string.digits + "!#$%&'*+-/=?^_`{|}~"
-    char_table_ = char_table + "."
-
-    email = ""
-    while len(email) < length:
-        if len(email) in (0, length - 1) or email[-1] == '.':
-            email += choice(char_table)
-        else:
-            email += choice(char_table_)
-    return email
+    return random_texts(lengths, table, rng)
 
 
-def raw_hostname_label(length):
+def chunks(qty, chunk_size):
     """
-    Creates a hostname label.
+    Splits `qty` in chunks no bigger than `chunk_size`, yielding the size
+    of each chunk.
 
-    Keyword arguments:
-    length -- length for the new hostname label
+    >>> list(chunks(5, 2))
+    [2, 2, 1]
 
     """
-    assert length > 0, 'provided length for hostname is too small. min is 1'
-    assert length < 64, 'provided length for hostname is too big. max is 63'
-
-    char_table = string.ascii_letters + string.digits
-    char_table_ = string.ascii_letters + string.digits + '-'
-    hostname = ''
-
-    while len(hostname) < length:
-        # hostname can't start nor end in dot
-        if len(hostname) == 0 or len(hostname) == length - 1:
-            hostname += choice(char_table)
-        else:
-            hostname += choice(char_table_)
+    assert chunk_size > 0, 'chunk_size must be positive'
 
-    return hostname
+    for start in xrange(0, qty, chunk_size):
+        yield min(chunk_size, qty - start)
 
 
-def raw_hostname(apr_length, ext_list=None):
+def raw_filename(length, ext_list=None, rng=random):
     """
-    Creates a random valid hostname.
-    (a domain name is a hostname with an associated ip address)
+    Creates a random filename with length up to `max_length`
+    and one of the given extensions. Make sure the biggest extension
+    length is smaller than `length`.
 
     Keyword arguments:
-    apr_length -- approximate length for new hostname (length is never bigger than apr_length)
-    ext_list -- if provided, domain ext will belong to this list.
+    length -- length for the new filename
+    ext_list -- list of valid extensions.
+    rng -- random generator to draw from
 
-    ref: http://en.wikipedia.org/wiki/Hostname
-    ref: http://en.wikipedia.org/wiki/Domain_Name
+    ref: http://en.wikipedia.org/wiki/Filename
 
     """
-    assert apr_length > 0, 'length is too short'
-    assert apr_length < 256, 'length is too big'
-
     if ext_list is not None:
-        assert max(map(lambda i: len(i), ext_list)) < apr_length,\
-        'length must be bigger than any provided extension'
-
-    labels = []
-
-    if ext_list:
-        ext = choice(ext_list)
-        labels.append(ext.startswith(".") and ext[1:] or ext)
-
-    sum_labels = sum(map(lambda i: len(i), labels))
-    while sum_labels + len(labels) < apr_length:
-        max_length = min(63, apr_length - sum_labels - len(labels))
-        label_length = randint(1, max_length)
-
-        label = raw_hostname_label(label_length)
-        labels.insert(0, label)
-        sum_labels = sum(map(lambda i: len(i), labels))
+        ext = rng.choice(ext_list)
+    else:
+        ext = ''
 
-    return '.'.join(labels)
+    name = raw_string(length - len(ext), FILENAME_TABLE, rng)
+    return name + ext
@@ -0,0 +1,24 @@
+#!/usr/bin/env python
+"""
+Runs mommy benchmarks.
+
+    python runbenchmarks.py [--json results.json] [--compare baseline.json] [name ...]
+
+Only benchmarks whose name contains one of the given names are run.
+With --compare, exits with 1 if any benchmark regressed.
+
+"""
+
+import os
+import sys
+
+parent = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, parent)
+
+os.environ['DJANGO_SETTINGS_MODULE'] = 'test_settings'
+
+
+if __name__ == '__main__':
+    from model_mommy.benchmarks import main
+
+    sys.exit(main(sys.argv[1:]))
@@ -4,7 +4,7 @@ import setuptools
 setuptools.setup(
     name="model_mommy",
     version="0.8",
-    packages=["model_mommy"],
+    packages=["model_mommy", "model_mommy.benchmarks"],
     install_requires=["django"],
     author="vandersonmota",
     author_email="vandersonmota@gmail.com",